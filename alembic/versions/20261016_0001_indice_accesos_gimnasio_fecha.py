@@ -0,0 +1,38 @@
+"""indice compuesto accesos (gimnasio_id, fecha_hora_entrada)
+
+Revision ID: 20261016_0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_accesos_gimnasio_fecha_entrada"
+
+
+def _index_exists() -> bool:
+    """Las bases creadas con create_all ya tienen el índice"""
+    if op.get_context().as_sql:
+        return False
+    inspector = sa.inspect(op.get_bind())
+    return any(index["name"] == INDEX_NAME for index in inspector.get_indexes("accesos"))
+
+
+def upgrade() -> None:
+    if not _index_exists():
+        op.create_index(INDEX_NAME, "accesos", ["gimnasio_id", "fecha_hora_entrada"])
+
+
+def downgrade() -> None:
+    if _index_exists():
+        op.drop_index(INDEX_NAME, table_name="accesos")
@@ -0,0 +1,133 @@
+"""tablas resumen_diario_accesos y resumen_diario_ingresos
+
+Revision ID: 20261016_0002
+Revises: 20261016_0001
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0002"
+down_revision: Union[str, None] = "20261016_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _table_exists(name: str) -> bool:
+    """Las bases creadas con create_all ya tienen las tablas"""
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _hora(columna: str, dialecto: str) -> str:
+    if dialecto == "sqlite":
+        return f"CAST(strftime('%H', {columna}) AS INTEGER)"
+    return f"HOUR({columna})"
+
+
+def _minutos(entrada: str, salida: str, dialecto: str) -> str:
+    """Minutos completos de la visita (como Acceso.duracion_minutos)"""
+    if dialecto == "sqlite":
+        return f"CAST((strftime('%s', {salida}) - strftime('%s', {entrada})) / 60 AS INTEGER)"
+    return f"TIMESTAMPDIFF(MINUTE, {entrada}, {salida})"
+
+
+def _vacia(tabla: str) -> bool:
+    if op.get_context().as_sql:
+        return True
+    return op.get_bind().execute(sa.text(f"SELECT 1 FROM {tabla} LIMIT 1")).first() is None
+
+
+def _backfill() -> None:
+    """
+    Carga los resúmenes con el histórico de accesos y facturas (mismo cálculo
+    que ResumenDiarioService.reconstruir): los reportes leen de estas tablas
+    todos los días anteriores a hoy, así que no pueden quedar vacías.
+    
+    Solo si la tabla está vacía; para recalcular un rango usar
+    scripts/rebuild_resumenes.py.
+    """
+    dialecto = op.get_context().dialect.name
+    
+    if _vacia("resumen_diario_accesos"):
+        # usuarios_unicos: usuarios cuya primera entrada del día cae en esa hora
+        op.execute(f"""
+            INSERT INTO resumen_diario_accesos
+                (gimnasio_id, fecha, hora, entradas, usuarios_unicos, visitas_cerradas, minutos_estancia)
+            SELECT a.gimnasio_id, a.fecha, a.hora, a.entradas, COALESCE(p.unicos, 0), a.cerradas, a.minutos
+            FROM (
+                SELECT gimnasio_id,
+                       DATE(fecha_hora_entrada) AS fecha,
+                       {_hora("fecha_hora_entrada", dialecto)} AS hora,
+                       COUNT(*) AS entradas,
+                       SUM(CASE WHEN fecha_hora_salida IS NOT NULL THEN 1 ELSE 0 END) AS cerradas,
+                       COALESCE(SUM({_minutos("fecha_hora_entrada", "fecha_hora_salida", dialecto)}), 0) AS minutos
+                FROM accesos
+                GROUP BY gimnasio_id, DATE(fecha_hora_entrada), {_hora("fecha_hora_entrada", dialecto)}
+            ) a
+            LEFT JOIN (
+                SELECT gimnasio_id, DATE(primera) AS fecha, {_hora("primera", dialecto)} AS hora, COUNT(*) AS unicos
+                FROM (
+                    SELECT gimnasio_id, usuario_id, MIN(fecha_hora_entrada) AS primera
+                    FROM accesos
+                    GROUP BY gimnasio_id, usuario_id, DATE(fecha_hora_entrada)
+                ) x
+                GROUP BY gimnasio_id, DATE(primera), {_hora("primera", dialecto)}
+            ) p ON p.gimnasio_id = a.gimnasio_id AND p.fecha = a.fecha AND p.hora = a.hora
+        """)
+    
+    if _vacia("resumen_diario_ingresos"):
+        op.execute("""
+            INSERT INTO resumen_diario_ingresos (gimnasio_id, fecha, tipo, estado, cantidad, total)
+            SELECT gimnasio_id, DATE(fecha_emision), tipo, estado, COUNT(*), COALESCE(SUM(total), 0)
+            FROM facturas
+            GROUP BY gimnasio_id, DATE(fecha_emision), tipo, estado
+        """)
+
+
+def upgrade() -> None:
+    if not _table_exists("resumen_diario_accesos"):
+        op.create_table(
+            "resumen_diario_accesos",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("gimnasio_id", sa.Integer(), sa.ForeignKey("gimnasios.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("fecha", sa.Date(), nullable=False),
+            sa.Column("hora", sa.Integer(), nullable=False, comment="Hora de entrada (0-23)"),
+            sa.Column("entradas", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("usuarios_unicos", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("visitas_cerradas", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("minutos_estancia", sa.Integer(), nullable=False, server_default="0"),
+            sa.UniqueConstraint("gimnasio_id", "fecha", "hora", name="resumen_acceso_unico"),
+        )
+        op.create_index("ix_resumen_diario_accesos_id", "resumen_diario_accesos", ["id"])
+    
+    if not _table_exists("resumen_diario_ingresos"):
+        op.create_table(
+            "resumen_diario_ingresos",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("gimnasio_id", sa.Integer(), sa.ForeignKey("gimnasios.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("fecha", sa.Date(), nullable=False),
+            sa.Column("tipo", sa.Enum("MEMBRESIA", "PRODUCTO", "MIXTA", name="tipofacturaenum"), nullable=False),
+            sa.Column(
+                "estado",
+                sa.Enum("PENDIENTE", "PAGADA", "CANCELADA", "ANULADA", name="estadofacturaenum"),
+                nullable=False
+            ),
+            sa.Column("cantidad", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("total", sa.Numeric(12, 2), nullable=False, server_default="0"),
+            sa.UniqueConstraint("gimnasio_id", "fecha", "tipo", "estado", name="resumen_ingreso_unico"),
+        )
+        op.create_index("ix_resumen_diario_ingresos_id", "resumen_diario_ingresos", ["id"])
+    
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_table("resumen_diario_ingresos")
+    op.drop_table("resumen_diario_accesos")
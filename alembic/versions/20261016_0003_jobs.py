@@ -0,0 +1,61 @@
+"""tabla jobs (reportes en segundo plano)
+
+Revision ID: 20261016_0003
+Revises: 20261016_0002
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0003"
+down_revision: Union[str, None] = "20261016_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _table_exists(name: str) -> bool:
+    """Las bases creadas con create_all ya tienen la tabla"""
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if _table_exists("jobs"):
+        return
+    
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("gimnasio_id", sa.Integer(), sa.ForeignKey("gimnasios.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("usuario_id", sa.Integer(), sa.ForeignKey("usuarios.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("tipo", sa.String(50), nullable=False, comment="Reporte a generar"),
+        sa.Column("formato", sa.String(10), nullable=False, comment="json, pdf, csv o xlsx"),
+        sa.Column("parametros", sa.JSON(), nullable=True, comment="Argumentos del reporte (fechas, granularidad)"),
+        sa.Column(
+            "estado",
+            sa.Enum("PENDIENTE", "EN_PROCESO", "COMPLETADO", "FALLIDO", "EXPIRADO", name="estadojobenum"),
+            nullable=False
+        ),
+        sa.Column("intentos", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("worker_id", sa.String(100), nullable=True, comment="Worker que tomó el job"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("archivo", sa.String(500), nullable=True, comment="Ruta relativa al directorio de FileHandler"),
+        sa.Column("tamano_bytes", sa.Integer(), nullable=True),
+        sa.Column("fecha_creacion", sa.DateTime(), nullable=False),
+        sa.Column("fecha_inicio", sa.DateTime(), nullable=True),
+        sa.Column("fecha_fin", sa.DateTime(), nullable=True),
+        sa.Column("fecha_expiracion", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+    op.create_index("ix_jobs_gimnasio_id", "jobs", ["gimnasio_id"])
+    op.create_index("ix_jobs_estado_fecha_creacion", "jobs", ["estado", "fecha_creacion"])
+
+
+def downgrade() -> None:
+    op.drop_table("jobs")
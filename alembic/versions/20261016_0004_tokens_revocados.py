@@ -0,0 +1,48 @@
+"""tabla tokens_revocados (logout y cierre forzado de sesiones)
+
+Revision ID: 20261016_0004
+Revises: 20261016_0003
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0004"
+down_revision: Union[str, None] = "20261016_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _table_exists(name: str) -> bool:
+    """Las bases creadas con create_all ya tienen la tabla"""
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if _table_exists("tokens_revocados"):
+        return
+    
+    op.create_table(
+        "tokens_revocados",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("jti", sa.String(64), nullable=True, comment="NULL = todos los tokens del usuario"),
+        sa.Column("usuario_id", sa.Integer(), sa.ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("motivo", sa.String(50), nullable=True, comment="logout o cierre_forzado"),
+        sa.Column("revocado_desde", sa.DateTime(), nullable=False),
+        sa.Column("fecha_expiracion", sa.DateTime(), nullable=False, comment="Expiración del último token afectado"),
+    )
+    op.create_index("ix_tokens_revocados_id", "tokens_revocados", ["id"])
+    op.create_index("ix_tokens_revocados_jti", "tokens_revocados", ["jti"])
+    op.create_index("ix_tokens_revocados_usuario_id", "tokens_revocados", ["usuario_id"])
+    op.create_index("ix_tokens_revocados_fecha_expiracion", "tokens_revocados", ["fecha_expiracion"])
+
+
+def downgrade() -> None:
+    op.drop_table("tokens_revocados")
@@ -1,50 +1,86 @@
 """Dependencias compartidas para los endpoints"""
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import SessionLocal
+from app.core.auth_context import AuthContext, EstadoUsuario, user_status_cache
+from app.core.cache import MISSING
+from app.core.database import SessionLocal, get_async_db, get_readonly_db, get_sticky_key
 from app.core.security import verify_token
-from app.repositories.usuario import UsuarioRepository
+from app.repositories.usuario import UsuarioRepository, AsyncUsuarioRepository
 from app.models.usuario import Usuario
 
 security = HTTPBearer()
 
-def get_db() -> Generator:
+def get_db(request: Request) -> Generator:
     """
     Dependencia para obtener la sesión de base de datos.
     
+    Los requests GET obtienen una sesión de solo lectura que se enruta a
+    una réplica (si hay réplicas configuradas); el resto usa el primario.
+    
     Yields:
         Session: Sesión de SQLAlchemy
     """
-    db = SessionLocal()
+    db = SessionLocal(info={
+        "readonly": request.method == "GET",
+        "sticky_key": get_sticky_key(request)
+    })
     try:
         yield db
     finally:
         db.close()
 
-def get_current_user(
+def get_auth_context(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> Usuario:
+) -> AuthContext:
     """
-    Dependencia para obtener el usuario actual autenticado.
+    Dependencia para obtener el usuario actual autenticado, sin cargarlo.
+    
+    La identidad sale del token; de la base solo se lee el estado del
+    usuario (activo, rol), cacheado USER_STATUS_CACHE_TTL segundos.
     
     Args:
         credentials: Credenciales del token Bearer
-        db: Sesión de base de datos
+        db: Sesión de base de datos (solo si el estado no está en caché)
         
     Returns:
-        Usuario autenticado
+        AuthContext del usuario autenticado
         
     Raises:
-        HTTPException: Si el token es inválido o el usuario no existe
+        HTTPException: Si el token es inválido, el usuario no existe o está inactivo
+    """
+    payload = _verificar_credenciales(credentials)
+    user_id = int(payload.get("sub"))
+    estado = user_status_cache.get(user_id)
+    if estado is MISSING:
+        estado = _cachear_estado(user_id, UsuarioRepository(db).get_estado(user_id))
+    
+    return _auth_context(payload, estado)
+
+async def get_async_auth_context(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthContext:
+    """
+    Versión de get_auth_context para endpoints `async def`: no ocupa un hilo
+    del threadpool ni abre una sesión síncrona, y si el estado no está en
+    caché lo lee con la sesión asíncrona del request.
     """
-    token = credentials.credentials
+    payload = _verificar_credenciales(credentials)
+    user_id = int(payload.get("sub"))
+    estado = user_status_cache.get(user_id)
+    if estado is MISSING:
+        estado = _cachear_estado(user_id, await AsyncUsuarioRepository(db).get_estado(user_id))
     
-    # Verificar token
-    payload = verify_token(token)
+    return _auth_context(payload, estado)
+
+def _verificar_credenciales(credentials: HTTPAuthorizationCredentials) -> dict:
+    """Claims del token Bearer; 401 si es inválido, expiró o fue revocado"""
+    payload = verify_token(credentials.credentials)
     
     if not payload:
         raise HTTPException(
@@ -52,25 +88,61 @@ def get_current_user(
             detail="Token inválido o expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Obtener usuario
-    user_id = int(payload.get("sub"))
-    usuario_repo = UsuarioRepository(db)
-    usuario = usuario_repo.get_by_id(user_id)
-    
-    if not usuario:
+    return payload
+
+def _cachear_estado(user_id: int, fila) -> EstadoUsuario:
+    """Guarda en caché el estado leído de la base; 401 si el usuario no existe"""
+    if fila is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    if not usuario.activo:
+    estado = EstadoUsuario(activo=bool(fila.activo), rol=fila.rol, gimnasio_id=fila.gimnasio_id)
+    user_status_cache.set(user_id, estado)
+    return estado
+
+def _auth_context(payload: dict, estado: EstadoUsuario) -> AuthContext:
+    """AuthContext a partir de los claims y el estado; 403 si el usuario está inactivo"""
+    if not estado.activo:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Usuario inactivo"
         )
     
+    # Rol y gimnasio vienen del estado: un cambio de rol o de gimnasio se aplica
+    # sin esperar a que caduque el token
+    return AuthContext(
+        id=int(payload.get("sub")),
+        gimnasio_id=estado.gimnasio_id,
+        rol=estado.rol,
+        activo=estado.activo,
+        jti=payload.get("jti"),
+        exp=payload.get("exp")
+    )
+
+def get_current_user(
+    auth: AuthContext = Depends(get_auth_context),
+    db: Session = Depends(get_db)
+) -> Usuario:
+    """
+    Dependencia para obtener el Usuario del ORM (una query más por request).
+    
+    Solo para endpoints que necesitan el modelo completo (p. ej. /auth/me);
+    el resto usa get_auth_context.
+    
+    Raises:
+        HTTPException: Si el token es inválido o el usuario no existe
+    """
+    usuario = UsuarioRepository(db).get_by_id(auth.id)
+    
+    if not usuario:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no encontrado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     return usuario
 
 def get_current_active_user(
@@ -87,8 +159,8 @@ def get_current_active_user(
     return current_user
 
 def require_admin(
-    current_user: Usuario = Depends(get_current_user)
-) -> Usuario:
+    current_user: AuthContext = Depends(get_auth_context)
+) -> AuthContext:
     """
     Dependencia que requiere que el usuario sea administrador.
     """
@@ -99,9 +171,22 @@ def require_admin(
         )
     return current_user
 
+def require_super_admin(
+    current_user: AuthContext = Depends(get_auth_context)
+) -> AuthContext:
+    """
+    Dependencia que requiere que el usuario sea super_admin (acceso a toda la cadena).
+    """
+    if not current_user.es_super_admin():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Se requieren permisos de super administrador"
+        )
+    return current_user
+
 def require_entrenador(
-    current_user: Usuario = Depends(get_current_user)
-) -> Usuario:
+    current_user: AuthContext = Depends(get_auth_context)
+) -> AuthContext:
     """
     Dependencia que requiere que el usuario sea entrenador.
     """
@@ -113,9 +198,17 @@ def require_entrenador(
     return current_user
 
 def get_gimnasio_id(
-    current_user: Usuario = Depends(get_current_user)
+    current_user: AuthContext = Depends(get_auth_context)
 ) -> int:
     """
     Obtiene el ID del gimnasio del usuario actual.
     """
+    return current_user.gimnasio_id
+
+async def get_async_gimnasio_id(
+    current_user: AuthContext = Depends(get_async_auth_context)
+) -> int:
+    """
+    Obtiene el ID del gimnasio del usuario actual (endpoints `async def`).
+    """
     return current_user.gimnasio_id
\ No newline at end of file
@@ -1,41 +1,53 @@
 """Endpoints de Accesos"""
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.api.dependencies import get_db, get_gimnasio_id
-from app.services.acceso_service import AccesoService
+from app.api.dependencies import get_async_db, get_async_gimnasio_id
+from app.services.acceso_service import AsyncAccesoService
 from app.schemas.acceso import AccesoResponse, RegistrarEntrada, RegistrarSalida
+from app.utils.pagination import CursorParams, PaginatedResponse, paginar_cursor
 
 router = APIRouter()
 
 @router.post("/entrada", response_model=AccesoResponse, status_code=status.HTTP_201_CREATED)
-def registrar_entrada(
+async def registrar_entrada(
     entrada: RegistrarEntrada,
-    gimnasio_id: int = Depends(get_gimnasio_id),
-    db: Session = Depends(get_db)
+    gimnasio_id: int = Depends(get_async_gimnasio_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Registrar entrada al gimnasio"""
-    service = AccesoService(db)
-    return service.registrar_entrada(entrada, gimnasio_id)
+    service = AsyncAccesoService(db)
+    return await service.registrar_entrada(entrada, gimnasio_id)
 
 @router.post("/salida")
-def registrar_salida(salida: RegistrarSalida, db: Session = Depends(get_db)):
+async def registrar_salida(salida: RegistrarSalida, db: AsyncSession = Depends(get_async_db)):
     """Registrar salida del gimnasio"""
-    service = AccesoService(db)
-    return service.registrar_salida(salida)
+    service = AsyncAccesoService(db)
+    return await service.registrar_salida(salida)
 
 @router.get("/presentes", response_model=List[AccesoResponse])
-def get_usuarios_presentes(
-    gimnasio_id: int = Depends(get_gimnasio_id),
-    db: Session = Depends(get_db)
+async def get_usuarios_presentes(
+    gimnasio_id: int = Depends(get_async_gimnasio_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obtener usuarios presentes en el gimnasio"""
-    service = AccesoService(db)
-    return service.get_usuarios_en_gimnasio(gimnasio_id)
+    service = AsyncAccesoService(db)
+    return await service.get_usuarios_en_gimnasio(gimnasio_id)
+
+@router.get("/pagina", response_model=PaginatedResponse[AccesoResponse])
+async def get_accesos_pagina(
+    params: CursorParams = Depends(),
+    gimnasio_id: int = Depends(get_async_gimnasio_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Historial de accesos del gimnasio paginado por cursor"""
+    service = AsyncAccesoService(db)
+    items, next_cursor = await service.get_page_by_gimnasio(gimnasio_id, params.after, params.page_size)
+    return paginar_cursor(items, params.page_size, next_cursor, params.after)
 
 @router.get("/usuario/{usuario_id}", response_model=List[AccesoResponse])
-def get_accesos_usuario(usuario_id: int, db: Session = Depends(get_db)):
+async def get_accesos_usuario(usuario_id: int, db: AsyncSession = Depends(get_async_db)):
     """Obtener historial de accesos de un usuario"""
-    service = AccesoService(db)
-    return service.get_by_usuario(usuario_id)
\ No newline at end of file
+    service = AsyncAccesoService(db)
+    return await service.get_by_usuario(usuario_id)
\ No newline at end of file
@@ -1,25 +1,31 @@
 """Endpoints de Autenticación"""
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_db, get_current_user
-from app.services.auth_service import AuthService
+from app.api.dependencies import get_db, get_async_db, get_auth_context, get_async_auth_context, get_current_user
+from app.services.auth_service import AuthService, AsyncAuthService
 from app.schemas.auth import Login, Register, Token, PasswordChange
 from app.schemas.usuario import UsuarioResponse
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login(login_data: Login, db: Session = Depends(get_db)):
-    """Login de usuario"""
-    auth_service = AuthService(db)
-    return auth_service.login(login_data)
+async def login(
+    login_data: Login,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Login de usuario (bcrypt en el pool de procesos; 503 si está saturado)"""
+    auth_service = AsyncAuthService(db)
+    return await auth_service.login(login_data, background_tasks)
 
 @router.post("/register", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
-def register(register_data: Register, db: Session = Depends(get_db)):
-    """Registro de nuevo usuario"""
-    auth_service = AuthService(db)
-    return auth_service.register(register_data)
+async def register(register_data: Register, db: AsyncSession = Depends(get_async_db)):
+    """Registro de nuevo usuario (bcrypt en el pool de procesos; 503 si está saturado)"""
+    auth_service = AsyncAuthService(db)
+    return await auth_service.register(register_data)
 
 @router.post("/refresh", response_model=Token)
 def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
@@ -28,21 +34,31 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
     return auth_service.refresh_access_token(refresh_token)
 
 @router.post("/change-password")
-def change_password(
+async def change_password(
     password_data: PasswordChange,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_async_auth_context),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Cambia la contraseña"""
-    auth_service = AuthService(db)
-    auth_service.change_password(
+    """Cambia la contraseña (bcrypt en el pool de procesos; 503 si está saturado)"""
+    auth_service = AsyncAuthService(db)
+    await auth_service.change_password(
         current_user.id,
         password_data.current_password,
         password_data.new_password
     )
     return {"message": "Contraseña actualizada exitosamente"}
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    refresh_token: Optional[str] = None,
+    current_user = Depends(get_auth_context),
+    db: Session = Depends(get_db)
+):
+    """Cierra la sesión: revoca el access token y, si se envía, el refresh token"""
+    auth_service = AuthService(db)
+    auth_service.logout(current_user, refresh_token)
+
 @router.get("/me", response_model=UsuarioResponse)
 def get_current_user_info(current_user = Depends(get_current_user)):
-    """Info del usuario autenticado"""
+    """Info del usuario autenticado (carga el Usuario completo)"""
     return current_user
\ No newline at end of file
@@ -1,10 +1,12 @@
 """Endpoints de Clases"""
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.api.dependencies import get_db, get_gimnasio_id
 from app.services.clase_service import ClaseService
+from app.services.export_service import ExportService
+from app.utils.export import ExportFormat, export_response
 from app.schemas.clase import ClaseCreate, ClaseUpdate, ClaseResponse
 
 router = APIRouter()
@@ -18,9 +20,13 @@ def create_clase(clase: ClaseCreate, db: Session = Depends(get_db)):
 @router.get("/", response_model=List[ClaseResponse])
 def get_clases(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    format: Optional[ExportFormat] = None,
     db: Session = Depends(get_db)
 ):
-    """Listar clases del gimnasio"""
+    """Listar clases del gimnasio (`?format=csv|xlsx` descarga el listado)"""
+    if format:
+        columnas, filas = ExportService(db).clases(gimnasio_id)
+        return export_response(columnas, filas, format, f"clases_{gimnasio_id}")
     service = ClaseService(db)
     return service.get_by_gimnasio(gimnasio_id)
 
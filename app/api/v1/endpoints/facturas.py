@@ -1,11 +1,14 @@
 """Endpoints de Facturas"""
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.api.dependencies import get_db, get_gimnasio_id
 from app.services.factura_service import FacturaService
+from app.services.export_service import ExportService
+from app.utils.export import ExportFormat, export_response
 from app.schemas.factura import FacturaCreate, FacturaResponse
+from app.utils.pagination import CursorParams, PaginatedResponse, paginar_cursor
 
 router = APIRouter()
 
@@ -18,12 +21,27 @@ def create_factura(factura: FacturaCreate, db: Session = Depends(get_db)):
 @router.get("/", response_model=List[FacturaResponse])
 def get_facturas(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    format: Optional[ExportFormat] = None,
     db: Session = Depends(get_db)
 ):
-    """Listar facturas del gimnasio"""
+    """Listar facturas del gimnasio (`?format=csv|xlsx` descarga el listado)"""
+    if format:
+        columnas, filas = ExportService(db).facturas(gimnasio_id)
+        return export_response(columnas, filas, format, f"facturas_{gimnasio_id}")
     service = FacturaService(db)
     return service.get_by_gimnasio(gimnasio_id)
 
+@router.get("/pagina", response_model=PaginatedResponse[FacturaResponse])
+def get_facturas_pagina(
+    params: CursorParams = Depends(),
+    gimnasio_id: int = Depends(get_gimnasio_id),
+    db: Session = Depends(get_db)
+):
+    """Listar facturas del gimnasio paginando por cursor"""
+    service = FacturaService(db)
+    items, next_cursor = service.get_page_by_gimnasio(gimnasio_id, params.after, params.page_size)
+    return paginar_cursor(items, params.page_size, next_cursor, params.after)
+
 @router.get("/usuario/{usuario_id}", response_model=List[FacturaResponse])
 def get_facturas_usuario(usuario_id: int, db: Session = Depends(get_db)):
     """Obtener facturas de un usuario"""
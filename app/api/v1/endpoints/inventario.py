@@ -1,10 +1,12 @@
 """Endpoints de Inventario"""
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.api.dependencies import get_db, get_gimnasio_id
 from app.services.inventario_service import InventarioService
+from app.services.export_service import ExportService
+from app.utils.export import ExportFormat, export_response
 from app.schemas.inventario import InventarioCreate, InventarioUpdate, InventarioResponse
 
 router = APIRouter()
@@ -18,9 +20,13 @@ def create_inventario(inventario: InventarioCreate, db: Session = Depends(get_db
 @router.get("/", response_model=List[InventarioResponse])
 def get_inventario(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    format: Optional[ExportFormat] = None,
     db: Session = Depends(get_db)
 ):
-    """Listar inventario del gimnasio"""
+    """Listar inventario del gimnasio (`?format=csv|xlsx` descarga el listado)"""
+    if format:
+        columnas, filas = ExportService(db).inventario(gimnasio_id)
+        return export_response(columnas, filas, format, f"inventario_{gimnasio_id}")
     service = InventarioService(db)
     return service.get_by_gimnasio(gimnasio_id)
 
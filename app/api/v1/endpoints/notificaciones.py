@@ -1,54 +1,66 @@
 """Endpoints de Notificaciones"""
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.api.dependencies import get_db, get_current_user
-from app.services.notificacion_service import NotificacionService
+from app.api.dependencies import get_async_db, get_async_auth_context
+from app.services.notificacion_service import AsyncNotificacionService
 from app.schemas.notificacion import NotificacionCreate, NotificacionResponse
+from app.utils.pagination import CursorParams, PaginatedResponse, paginar_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=NotificacionResponse, status_code=status.HTTP_201_CREATED)
-def create_notificacion(notificacion: NotificacionCreate, db: Session = Depends(get_db)):
+async def create_notificacion(notificacion: NotificacionCreate, db: AsyncSession = Depends(get_async_db)):
     """Crear nueva notificación"""
-    service = NotificacionService(db)
-    return service.create(notificacion)
+    service = AsyncNotificacionService(db)
+    return await service.create(notificacion)
 
 @router.get("/mis-notificaciones", response_model=List[NotificacionResponse])
-def get_mis_notificaciones(
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_mis_notificaciones(
+    current_user = Depends(get_async_auth_context),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obtener notificaciones del usuario actual"""
-    service = NotificacionService(db)
-    return service.get_by_usuario(current_user.id)
+    service = AsyncNotificacionService(db)
+    return await service.get_by_usuario(current_user.id)
+
+@router.get("/pagina", response_model=PaginatedResponse[NotificacionResponse])
+async def get_notificaciones_pagina(
+    params: CursorParams = Depends(),
+    current_user = Depends(get_async_auth_context),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Notificaciones del usuario actual paginadas por cursor"""
+    service = AsyncNotificacionService(db)
+    items, next_cursor = await service.get_page_by_usuario(current_user.id, params.after, params.page_size)
+    return paginar_cursor(items, params.page_size, next_cursor, params.after)
 
 @router.get("/no-leidas", response_model=List[NotificacionResponse])
-def get_notificaciones_no_leidas(
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_notificaciones_no_leidas(
+    current_user = Depends(get_async_auth_context),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obtener notificaciones no leídas"""
-    service = NotificacionService(db)
-    return service.get_no_leidas(current_user.id)
+    service = AsyncNotificacionService(db)
+    return await service.get_no_leidas(current_user.id)
 
 @router.post("/{notificacion_id}/marcar-leida")
-def marcar_como_leida(
+async def marcar_como_leida(
     notificacion_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Marcar notificación como leída"""
-    service = NotificacionService(db)
-    service.marcar_leida(notificacion_id)
+    service = AsyncNotificacionService(db)
+    await service.marcar_leida(notificacion_id)
     return {"message": "Notificación marcada como leída"}
 
 @router.post("/marcar-todas-leidas")
-def marcar_todas_leidas(
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def marcar_todas_leidas(
+    current_user = Depends(get_async_auth_context),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Marcar todas las notificaciones como leídas"""
-    service = NotificacionService(db)
-    service.marcar_todas_leidas(current_user.id)
+    service = AsyncNotificacionService(db)
+    await service.marcar_todas_leidas(current_user.id)
     return {"message": "Todas las notificaciones marcadas como leídas"}
\ No newline at end of file
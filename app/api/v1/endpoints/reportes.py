@@ -1,83 +1,163 @@
 """Endpoints de Reportes y Análisis"""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import List, Literal, Optional
 
-from app.api.dependencies import get_db, get_gimnasio_id, require_admin
+from app.api.dependencies import get_db, get_readonly_db, get_gimnasio_id, require_admin, require_super_admin
 from app.services.reporte_service import ReporteService
+from app.services.export_service import ExportService
+from app.services.job_service import JobService
+from app.schemas.job import JobCreate, JobResponse
+from app.utils.export import ExportFormat, export_response
 
 router = APIRouter()
 
+# Todos los reportes se sirven desde la caché (ver `cached_at`); `?fresh=1` los recalcula
+
 @router.get("/usuarios")
 def reporte_usuarios(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    fresh: bool = False,
     admin = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """Reporte de usuarios del gimnasio"""
     service = ReporteService(db)
-    return service.reporte_usuarios(gimnasio_id)
+    return service.reporte_usuarios(gimnasio_id, fresh=fresh)
 
 @router.get("/membresias")
 def reporte_membresias(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    fresh: bool = False,
     admin = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """Reporte de membresías"""
     service = ReporteService(db)
-    return service.reporte_membresias(gimnasio_id)
+    return service.reporte_membresias(gimnasio_id, fresh=fresh)
 
 @router.get("/asistencia")
 def reporte_asistencia(
     gimnasio_id: int = Depends(get_gimnasio_id),
     fecha_inicio: date = None,
     fecha_fin: date = None,
+    fresh: bool = False,
     admin = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """Reporte de asistencia"""
     service = ReporteService(db)
-    return service.reporte_asistencia(gimnasio_id, fecha_inicio, fecha_fin)
+    return service.reporte_asistencia(gimnasio_id, fecha_inicio, fecha_fin, fresh=fresh)
 
 @router.get("/financiero")
 def reporte_financiero(
     gimnasio_id: int = Depends(get_gimnasio_id),
     fecha_inicio: date = None,
     fecha_fin: date = None,
+    granularity: Optional[Literal["day", "week", "month"]] = None,
+    fresh: bool = False,
     admin = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
-    """Reporte financiero"""
+    """Reporte financiero (con serie temporal opcional por día, semana o mes)"""
     service = ReporteService(db)
-    return service.reporte_financiero(gimnasio_id, fecha_inicio, fecha_fin)
+    return service.reporte_financiero(gimnasio_id, fecha_inicio, fecha_fin, granularity, fresh=fresh)
 
 @router.get("/clases")
 def reporte_clases(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    fresh: bool = False,
     admin = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """Reporte de clases grupales"""
     service = ReporteService(db)
-    return service.reporte_clases(gimnasio_id)
+    return service.reporte_clases(gimnasio_id, fresh=fresh)
 
 @router.get("/inventario")
 def reporte_inventario(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    fresh: bool = False,
     admin = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """Reporte de inventario"""
     service = ReporteService(db)
-    return service.reporte_inventario(gimnasio_id)
+    return service.reporte_inventario(gimnasio_id, fresh=fresh)
 
 @router.get("/dashboard")
 def dashboard_general(
     gimnasio_id: int = Depends(get_gimnasio_id),
+    fresh: bool = False,
     admin = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """Dashboard general con métricas principales"""
     service = ReporteService(db)
-    return service.dashboard_general(gimnasio_id)
\ No newline at end of file
+    return service.dashboard_general(gimnasio_id, fresh=fresh)
+
+@router.get("/cadena")
+def reporte_cadena(
+    gimnasio_ids: Optional[List[int]] = Query(None),
+    fecha_inicio: date = None,
+    fecha_fin: date = None,
+    fresh: bool = False,
+    super_admin = Depends(require_super_admin),
+    db: Session = Depends(get_readonly_db)
+):
+    """Reporte consolidado de la cadena: una fila por gimnasio y totales (por defecto: gimnasios activos)"""
+    service = ReporteService(db)
+    return service.reporte_cadena(gimnasio_ids, fecha_inicio, fecha_fin, fresh=fresh)
+
+# Reportes pesados (años de datos, PDF): se encolan y los genera un worker
+
+@router.post("/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def crear_job_reporte(
+    data: JobCreate,
+    gimnasio_id: int = Depends(get_gimnasio_id),
+    admin = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Encola la generación de un reporte (json, pdf, csv o xlsx); consultar con GET /jobs/{id}"""
+    service = JobService(db)
+    return service.crear(gimnasio_id, admin.id, data)
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job_reporte(
+    job_id: int,
+    gimnasio_id: int = Depends(get_gimnasio_id),
+    admin = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Estado de un job de reporte (incluye download_url al completarse)"""
+    service = JobService(db)
+    return service.get(job_id, gimnasio_id)
+
+@router.get("/jobs/{job_id}/download")
+def descargar_job_reporte(
+    job_id: int,
+    gimnasio_id: int = Depends(get_gimnasio_id),
+    admin = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Descarga el archivo generado por un job completado"""
+    service = JobService(db)
+    ruta, nombre, media_type = service.get_archivo(job_id, gimnasio_id)
+    return FileResponse(ruta, media_type=media_type, filename=nombre)
+
+@router.get("/{tipo}/export")
+def exportar_reporte(
+    tipo: Literal["usuarios", "membresias", "asistencia", "financiero", "clases", "inventario"],
+    format: ExportFormat = "csv",
+    gimnasio_id: int = Depends(get_gimnasio_id),
+    fecha_inicio: date = None,
+    fecha_fin: date = None,
+    admin = Depends(require_admin),
+    db: Session = Depends(get_readonly_db)
+):
+    """Descarga el detalle de un reporte como CSV o XLSX (en streaming)"""
+    service = ExportService(db)
+    columnas, filas = service.exportar(tipo, gimnasio_id, fecha_inicio, fecha_fin)
+    return export_response(columnas, filas, format, f"{tipo}_{gimnasio_id}")
\ No newline at end of file
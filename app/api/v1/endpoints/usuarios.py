@@ -1,10 +1,12 @@
 """Endpoints de Usuarios"""
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.api.dependencies import get_db, get_current_user, get_gimnasio_id
+from app.api.dependencies import get_db, get_auth_context, get_gimnasio_id, require_admin
 from app.services.usuario_service import UsuarioService
+from app.services.export_service import ExportService
+from app.utils.export import ExportFormat, export_response
 from app.schemas.usuario import UsuarioCreate, UsuarioUpdate, UsuarioResponse
 from app.utils.pagination import paginar, PaginationParams
 
@@ -14,7 +16,7 @@ router = APIRouter()
 def create_usuario(
     usuario: UsuarioCreate,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_auth_context)
 ):
     """Crear nuevo usuario"""
     service = UsuarioService(db)
@@ -24,9 +26,13 @@ def create_usuario(
 def get_usuarios(
     params: PaginationParams = Depends(),
     gimnasio_id: int = Depends(get_gimnasio_id),
+    format: Optional[ExportFormat] = None,
     db: Session = Depends(get_db)
 ):
-    """Listar usuarios del gimnasio"""
+    """Listar usuarios del gimnasio (`?format=csv|xlsx` descarga todos sin paginar)"""
+    if format:
+        columnas, filas = ExportService(db).usuarios(gimnasio_id)
+        return export_response(columnas, filas, format, f"usuarios_{gimnasio_id}")
     service = UsuarioService(db)
     return service.get_all(gimnasio_id, skip=params.skip, limit=params.limit)
 
@@ -60,4 +66,15 @@ def update_usuario(
 def delete_usuario(usuario_id: int, db: Session = Depends(get_db)):
     """Eliminar usuario"""
     service = UsuarioService(db)
-    service.delete(usuario_id)
\ No newline at end of file
+    service.delete(usuario_id)
+
+@router.post("/{usuario_id}/cerrar-sesiones", status_code=status.HTTP_204_NO_CONTENT)
+def cerrar_sesiones_usuario(
+    usuario_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """Cierre forzado: revoca todos los tokens emitidos para el usuario (admin de su gimnasio)"""
+    service = UsuarioService(db)
+    gimnasio_id = None if current_user.es_super_admin() else current_user.gimnasio_id
+    service.cerrar_sesiones(usuario_id, gimnasio_id)
\ No newline at end of file
@@ -3,7 +3,7 @@ Core module - Configuración central de la aplicación SGG-API
 """
 
 from app.core.config import settings
-from app.core.database import Base, get_db, engine
+from app.core.database import Base, get_db, get_async_db, engine, async_engine, UnitOfWork, AsyncUnitOfWork
 from app.core.security import (
     create_access_token,
     create_refresh_token,
@@ -16,7 +16,11 @@ __all__ = [
     "settings",
     "Base",
     "get_db",
+    "get_async_db",
     "engine",
+    "async_engine",
+    "UnitOfWork",
+    "AsyncUnitOfWork",
     "create_access_token",
     "create_refresh_token",
     "verify_password",
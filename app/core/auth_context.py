@@ -0,0 +1,70 @@
+"""
+Contexto de autenticación del request
+Identidad tomada del JWT más el estado del usuario (activo, rol) en una
+caché por proceso, sin cargar el Usuario del ORM en cada request
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+# Estado (activo, rol, gimnasio_id) por usuario_id. Por proceso: la
+# invalidación es local y el TTL acota cuánto tarda en verse un cambio
+# hecho en otro worker
+user_status_cache = TTLCache(
+    ttl=settings.USER_STATUS_CACHE_TTL,
+    max_entries=settings.USER_STATUS_CACHE_MAX_ENTRIES
+)
+
+
+@dataclass(frozen=True)
+class EstadoUsuario:
+    """Lo que se consulta del usuario en cada request (cacheado)"""
+    activo: bool
+    rol: Optional[str]
+    gimnasio_id: int
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """
+    Usuario autenticado sin cargar el modelo.
+
+    Expone `id`, `gimnasio_id` y los mismos chequeos de rol que Usuario, así
+    que sirve donde los endpoints solo usaban esos campos del usuario actual.
+    `jti` y `exp` identifican el token del request (logout).
+    """
+    id: int
+    gimnasio_id: int
+    rol: Optional[str]
+    activo: bool
+    jti: Optional[str] = None
+    exp: Optional[int] = None
+
+    def es_admin(self) -> bool:
+        """Verifica si el usuario es admin o super_admin"""
+        return self.rol in ["super_admin", "admin"]
+
+    def es_super_admin(self) -> bool:
+        """Verifica si el usuario es super_admin"""
+        return self.rol == "super_admin"
+
+    def es_entrenador(self) -> bool:
+        """Verifica si el usuario es entrenador"""
+        return self.rol == "entrenador"
+
+    def es_cliente(self) -> bool:
+        """Verifica si el usuario es cliente"""
+        return self.rol == "cliente"
+
+    def es_staff(self) -> bool:
+        """Verifica si el usuario es parte del staff (super_admin, admin o entrenador)"""
+        return self.rol in ["super_admin", "admin", "entrenador"]
+
+
+def invalidar_usuario(usuario_id: int) -> None:
+    """Descarta el estado cacheado de un usuario (al editarlo, desactivarlo o borrarlo)"""
+    user_status_cache.delete(usuario_id)
@@ -0,0 +1,95 @@
+"""
+Caché en memoria con expiración (TTL) y tamaño acotado (LRU)
+Por proceso: cada worker mantiene la suya y las invalidaciones son locales
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+# Marcador de "no está en caché" (None puede ser un valor válido)
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Caché thread-safe con expiración por entrada y desalojo LRU.
+
+    Uso:
+    ```python
+    cache = TTLCache(ttl=60, max_entries=1000)
+    valor = cache.get(clave)
+    if valor is MISSING:
+        valor = calcular()
+        cache.set(clave, valor)
+    ```
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        """
+        Args:
+            ttl: Segundos que vive cada entrada
+            max_entries: Máximo de entradas (se desaloja la usada hace más tiempo)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Valor de la clave, o MISSING si no está o expiró"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Guarda un valor (desaloja la entrada menos usada si se supera el máximo).
+
+        Args:
+            ttl: Segundos que vive esta entrada (por defecto, el de la caché)
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> bool:
+        """Elimina una entrada; True si existía"""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def invalidate(self, match: Callable[[Hashable], bool]) -> int:
+        """
+        Elimina las entradas cuya clave cumple `match`.
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        with self._lock:
+            keys = [key for key in self._data if match(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Vacía la caché"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -6,6 +6,7 @@ Maneja todas las variables de entorno y configuraciones globales
 from typing import List, Optional, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator, model_validator
+import os
 import secrets
 
 
@@ -50,6 +51,28 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 3600
     
+    # Fan-out de reportes: fragmentos en paralelo por request y hilos (conexiones) en total
+    REPORT_FANOUT_CONCURRENCY: int = 4
+    REPORT_FANOUT_MAX_WORKERS: int = 8
+    # Reportes de cadena: gimnasios por query agrupada (cada partición va en paralelo)
+    REPORT_CHAIN_PARTITION_SIZE: int = 200
+    
+    # Lanza error en cualquier lazy load no previsto por el perfil de carga (tests)
+    DB_RAISE_ON_LAZY_LOAD: bool = False
+
+    # Read Replicas (opcional, separadas por coma)
+    DATABASE_REPLICA_URLS: Union[str, List[str]] = Field(default="")
+    # Segundos que un cliente lee del primario después de escribir (read-your-writes)
+    DB_REPLICA_STICKY_SECONDS: int = 5
+
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def parse_replica_urls(cls, v):
+        """Parsea las URLs de réplicas si vienen como string"""
+        if isinstance(v, str):
+            return [url.strip() for url in v.split(",") if url.strip()]
+        return v
+
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
     def build_database_url(cls, v, info):
@@ -64,7 +87,27 @@ class Settings(BaseSettings):
         port = values.get("DB_PORT", 3306)
         db_name = values.get("DB_NAME", "sgg")
         return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db_name}?charset=utf8mb4"
-    
+
+    # Engine asíncrono (aiomysql en MySQL, aiosqlite en local)
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    @field_validator("ASYNC_DATABASE_URL", mode="before")
+    @classmethod
+    def build_async_database_url(cls, v, info):
+        """Deriva la URL asíncrona a partir de DATABASE_URL si no se proporciona"""
+        if v:
+            return v
+        url = info.data.get("DATABASE_URL") or ""
+        for sync_driver, async_driver in (
+            ("mysql+pymysql://", "mysql+aiomysql://"),
+            ("mysql://", "mysql+aiomysql://"),
+            ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(sync_driver):
+                return async_driver + url[len(sync_driver):]
+        return url
+
     # ============================================
     # SECURITY
     # ============================================
@@ -73,8 +116,33 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Claims de tokens ya verificados (por proceso): la firma se comprueba una vez por token
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Estado del usuario autenticado (activo, rol) por proceso; se invalida al editarlo
+    USER_STATUS_CACHE_TTL: int = 30  # segundos (lo que tarda en verse un cambio hecho en otro worker)
+    USER_STATUS_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Tokens revocados (logout, cierre forzado): copia por proceso de la tabla tokens_revocados
+    TOKEN_REVOCATION_ENABLED: bool = True
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 5.0  # segundos hasta ver una revocación hecha en otro worker
+    TOKEN_REVOCATION_FULL_SYNC_INTERVAL: int = 300  # recarga completa (descarta vencidas y purga la tabla)
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    
     # Password Hashing
-    BCRYPT_ROUNDS: int = 12
+    BCRYPT_ROUNDS: int = 12  # costo si no se calibra (BCRYPT_CALIBRATE=false)
+    # Al arrancar se elige el costo cuya verificación tarda ~BCRYPT_TARGET_MS en este host;
+    # los hashes de costo menor se rehacen en el siguiente login
+    BCRYPT_CALIBRATE: bool = True
+    BCRYPT_TARGET_MS: int = 250
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+    # bcrypt corre en un pool de procesos por worker de la API (0 = en el propio proceso)
+    PASSWORD_HASH_WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING: int = 64  # operaciones en curso o en cola; por encima se responde 503
+    PASSWORD_HASH_RETRY_AFTER: int = 1  # segundos (cabecera Retry-After del 503)
     
     @field_validator("SECRET_KEY", mode="after")
     @classmethod
@@ -142,6 +210,11 @@ class Settings(BaseSettings):
     LOG_MAX_SIZE: int = 10485760  # 10MB
     LOG_BACKUP_COUNT: int = 5
     
+    # Conteo de queries SQL por request (headers X-DB-Queries / X-DB-Time)
+    SQL_STATS_ENABLED: bool = True
+    # Repeticiones de una misma sentencia en un request a partir de las cuales se reporta N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    
     # ============================================
     # PAGINATION
     # ============================================
@@ -190,6 +263,19 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     CACHE_TTL: int = 300  # 5 minutos
     
+    # Caché en memoria de reportes (por gimnasio, se invalida al escribir)
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_TTL: int = 60  # segundos
+    REPORT_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Jobs de reportes en segundo plano (POST /reportes/jobs)
+    JOB_WORKERS: int = 2  # hilos del worker dentro de la API (0 = solo scripts/worker.py)
+    JOB_POLL_INTERVAL: float = 1.0  # segundos entre consultas cuando no hay jobs pendientes
+    JOB_RESULT_TTL_HOURS: int = 24  # retención de los archivos generados
+    JOB_STALE_MINUTES: int = 30  # un job en proceso más tiempo se considera abandonado
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_CLEANUP_INTERVAL: int = 300  # segundos entre limpiezas de archivos vencidos
+    
     @property
     def REDIS_URL(self) -> str:
         """Construye la URL de conexión a Redis"""
@@ -204,6 +290,24 @@ class Settings(BaseSettings):
     AUTO_BACKUP_ENABLED: bool = True
     BACKUP_HOUR: int = 2  # 2 AM
     
+    @model_validator(mode="after")
+    def validate_fanout_workers(self):
+        """El fan-out de reportes y los jobs deben dejar conexiones libres en el pool para el resto de requests"""
+        if self.REPORT_FANOUT_MAX_WORKERS + self.JOB_WORKERS >= self.DB_POOL_SIZE:
+            raise ValueError(
+                f"REPORT_FANOUT_MAX_WORKERS + JOB_WORKERS debe ser menor que DB_POOL_SIZE ({self.DB_POOL_SIZE})"
+            )
+        return self
+    
+    @model_validator(mode="after")
+    def validate_bcrypt_rounds(self):
+        """bcrypt acepta costos de 4 a 31"""
+        if not 4 <= self.BCRYPT_MIN_ROUNDS <= self.BCRYPT_MAX_ROUNDS <= 31:
+            raise ValueError("Se requiere 4 <= BCRYPT_MIN_ROUNDS <= BCRYPT_MAX_ROUNDS <= 31")
+        if not 4 <= self.BCRYPT_ROUNDS <= 31:
+            raise ValueError("BCRYPT_ROUNDS debe estar entre 4 y 31")
+        return self
+    
     @field_validator("BACKUP_HOUR", mode="after")
     @classmethod
     def validate_backup_hour(cls, v):
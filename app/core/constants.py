@@ -201,6 +201,19 @@ class TipoNotificacionEnum(str, Enum):
     PROMOCION = "promocion"
 
 
+# ============================================
+# ESTADOS DE JOB EN SEGUNDO PLANO
+# ============================================
+
+class EstadoJobEnum(str, Enum):
+    """Estados de un job de generación de reportes"""
+    PENDIENTE = "pendiente"
+    EN_PROCESO = "en_proceso"
+    COMPLETADO = "completado"
+    FALLIDO = "fallido"
+    EXPIRADO = "expirado"
+
+
 # ============================================
 # MENSAJES DE ERROR COMUNES
 # ============================================
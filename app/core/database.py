@@ -3,8 +3,14 @@ Configuración de la base de datos
 Maneja la conexión a MySQL usando SQLAlchemy
 """
 
-from typing import Generator
-from sqlalchemy import create_engine, MetaData
+import random
+import threading
+import time
+from typing import AsyncGenerator, Generator, Optional, Union
+from fastapi import Request
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
@@ -15,33 +21,163 @@ from app.core.config import settings
 # CONFIGURACIÓN DEL ENGINE
 # ============================================
 
-# Crear engine de SQLAlchemy con pool de conexiones
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DB_ECHO,  # Mostrar queries SQL en logs (solo en desarrollo)
-    poolclass=QueuePool,
-    pool_size=settings.DB_POOL_SIZE,  # Número de conexiones en el pool
-    max_overflow=settings.DB_MAX_OVERFLOW,  # Conexiones adicionales si el pool está lleno
-    pool_timeout=settings.DB_POOL_TIMEOUT,  # Timeout en segundos para obtener conexión
-    pool_recycle=settings.DB_POOL_RECYCLE,  # Reciclar conexiones después de X segundos
-    pool_pre_ping=True,  # Verificar conexión antes de usarla
-    connect_args={
-        "charset": "utf8mb4",
-        "use_unicode": True,
+def _create_sync_engine(url: str) -> Engine:
+    """
+    Crea un engine síncrono con pool de conexiones.
+    
+    Para SQLite (desarrollo/tests) se omiten las opciones de pool y charset
+    propias de MySQL.
+    """
+    if url.startswith("sqlite"):
+        return create_engine(url, echo=settings.DB_ECHO)
+    
+    return create_engine(
+        url,
+        echo=settings.DB_ECHO,  # Mostrar queries SQL en logs (solo en desarrollo)
+        poolclass=QueuePool,
+        pool_size=settings.DB_POOL_SIZE,  # Número de conexiones en el pool
+        max_overflow=settings.DB_MAX_OVERFLOW,  # Conexiones adicionales si el pool está lleno
+        pool_timeout=settings.DB_POOL_TIMEOUT,  # Timeout en segundos para obtener conexión
+        pool_recycle=settings.DB_POOL_RECYCLE,  # Reciclar conexiones después de X segundos
+        pool_pre_ping=True,  # Verificar conexión antes de usarla
+        connect_args={
+            "charset": "utf8mb4",
+            "use_unicode": True,
+        }
+    )
+
+
+# Engine primario (lecturas y escrituras)
+engine = _create_sync_engine(settings.DATABASE_URL)
+
+# Engines de réplicas de solo lectura (vacío si no hay réplicas configuradas)
+replica_engines = [_create_sync_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+
+# ============================================
+# ENGINE ASÍNCRONO
+# ============================================
+
+def _async_engine_options(url: str) -> dict:
+    """
+    Opciones del engine asíncrono según el driver.
+    
+    SQLite (aiosqlite) no admite pool por tamaño ni charset, así que
+    solo se configuran para MySQL (aiomysql/asyncmy).
+    """
+    if url.startswith("sqlite"):
+        return {"echo": settings.DB_ECHO}
+    return {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": {"charset": "utf8mb4"},
     }
+
+
+# Engine asíncrono: un solo worker puede mantener cientos de queries en vuelo
+# sin ocupar un hilo del threadpool por cada una
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    **_async_engine_options(settings.ASYNC_DATABASE_URL)
 )
 
+# ============================================
+# ROUTING PRIMARIO / RÉPLICAS
+# ============================================
+
+# Última escritura confirmada por cliente (sticky key -> time.monotonic())
+_recent_writes: dict = {}
+_recent_writes_lock = threading.Lock()
+
+
+def _mark_recent_write(sticky_key: str) -> None:
+    """Registra que el cliente acaba de escribir en el primario"""
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[sticky_key] = now
+        # Purga ocasional de entradas fuera de la ventana
+        if len(_recent_writes) > 10000:
+            limite = now - settings.DB_REPLICA_STICKY_SECONDS
+            for key in [k for k, t in _recent_writes.items() if t < limite]:
+                del _recent_writes[key]
+
+
+def _wrote_recently(sticky_key: Optional[str]) -> bool:
+    """Verifica si el cliente escribió dentro de la ventana de stickiness"""
+    if not sticky_key:
+        return False
+    last = _recent_writes.get(sticky_key)
+    return last is not None and time.monotonic() - last < settings.DB_REPLICA_STICKY_SECONDS
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas de sesiones de solo lectura a una réplica.
+    
+    Reglas:
+    - Sesiones normales: siempre el primario.
+    - Sesiones readonly (info["readonly"]): una réplica al azar, salvo que
+      la sesión ya haya escrito o el cliente (info["sticky_key"]) haya
+      confirmado una escritura hace menos de DB_REPLICA_STICKY_SECONDS
+      (read-your-writes).
+    - Flush y sentencias DML: siempre el primario.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._use_replica(clause):
+            return random.choice(replica_engines)
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+    
+    def _use_replica(self, clause) -> bool:
+        if not replica_engines or not self.info.get("readonly"):
+            return False
+        if self._flushing or self.info.get("wrote"):
+            return False
+        if clause is not None and getattr(clause, "is_dml", False):
+            return False
+        return not _wrote_recently(self.info.get("sticky_key"))
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _on_after_flush(session, flush_context):
+    """Fija la sesión al primario en cuanto escribe algo"""
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _on_after_commit(session):
+    """Activa la ventana read-your-writes del cliente tras un commit con escrituras"""
+    sticky_key = session.info.get("sticky_key")
+    if session.info.get("wrote") and sticky_key:
+        _mark_recent_write(sticky_key)
+
+
 # ============================================
 # SESIÓN DE BASE DE DATOS
 # ============================================
 
-# Crear SessionLocal class
+# Crear SessionLocal class. expire_on_commit=False: los objetos conservan sus
+# valores tras el commit y serializar la respuesta no dispara recargas.
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine
 )
 
+# Sesión asíncrona. expire_on_commit=False evita recargas implícitas
+# (lazy IO) al serializar la respuesta después del commit.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # ============================================
 # BASE DECLARATIVA
 # ============================================
@@ -86,6 +222,55 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_sticky_key(request: Request) -> Optional[str]:
+    """
+    Identifica al cliente para la stickiness read-your-writes.
+    
+    Usa el token (o la IP si no hay token) para que un cliente que acaba de
+    escribir lea desde el primario en sus siguientes requests.
+    """
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return authorization
+    return request.client.host if request.client else None
+
+
+def get_readonly_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency para obtener una sesión de solo lectura.
+    
+    Las queries se envían a una réplica si hay réplicas configuradas
+    (DATABASE_REPLICA_URLS); si no, se comporta igual que get_db.
+    
+    Yields:
+        Session: Sesión de SQLAlchemy enrutada a réplica
+    """
+    db = SessionLocal(info={"readonly": True, "sticky_key": get_sticky_key(request)})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para obtener una sesión asíncrona de base de datos.
+    
+    Uso en FastAPI:
+    ```python
+    @router.get("/accesos/presentes")
+    async def get_presentes(db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(select(Acceso))
+        return result.scalars().all()
+    ```
+    
+    Yields:
+        AsyncSession: Sesión asíncrona de SQLAlchemy
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # ============================================
 # FUNCIONES DE UTILIDAD
 # ============================================
@@ -147,10 +332,14 @@ class DatabaseSession:
         usuario = db.query(Usuario).first()
         # La transacción se commitea automáticamente al salir del context
     ```
+    
+    Si se le pasa una sesión existente (p. ej. la del request) la reutiliza
+    y no la cierra al salir.
     """
     
-    def __init__(self):
-        self.db: Session = SessionLocal()
+    def __init__(self, db: Optional[Session] = None):
+        self._owns_session = db is None
+        self.db: Session = db if db is not None else SessionLocal()
     
     def __enter__(self) -> Session:
         return self.db
@@ -163,8 +352,78 @@ class DatabaseSession:
             # Si todo salió bien, hacer commit
             self.db.commit()
         
-        self.db.close()
+        if self._owns_session:
+            self.db.close()
+
 
+# Profundidad de UnitOfWork activos por sesión (en session.info)
+_UOW_DEPTH_KEY = "uow_depth"
+
+
+def in_unit_of_work(db: Union[Session, AsyncSession]) -> bool:
+    """Indica si la sesión está dentro de un UnitOfWork"""
+    return db.info.get(_UOW_DEPTH_KEY, 0) > 0
+
+
+class UnitOfWork(DatabaseSession):
+    """
+    Agrupa las escrituras de varios repositorios en una sola transacción.
+    
+    Dentro del bloque los repositorios solo registran los cambios en la sesión
+    (no hacen commit ni refresh); al salir se envían en un único flush y se
+    confirman con un único commit, o se descartan todos si hubo una excepción.
+    Los UnitOfWork anidados sobre la misma sesión se unen al exterior.
+    
+    Uso:
+    ```python
+    with UnitOfWork(db):
+        factura = factura_repo.create(factura_data)
+        pago_repo.create(pago_data)
+    ```
+    """
+    
+    def __enter__(self) -> Session:
+        self.db.info[_UOW_DEPTH_KEY] = self.db.info.get(_UOW_DEPTH_KEY, 0) + 1
+        return self.db
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        depth = self.db.info[_UOW_DEPTH_KEY] - 1
+        self.db.info[_UOW_DEPTH_KEY] = depth
+        if depth > 0:
+            # La transacción la confirma (o descarta) el UnitOfWork exterior
+            return
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+
+
+class AsyncUnitOfWork:
+    """
+    Versión asíncrona de UnitOfWork sobre una AsyncSession.
+    
+    Uso:
+    ```python
+    async with AsyncUnitOfWork(db):
+        acceso = await acceso_repo.create(acceso_data)
+        await resumen_repo.increment(claves, {"entradas": 1})
+    ```
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def __aenter__(self) -> AsyncSession:
+        self.db.info[_UOW_DEPTH_KEY] = self.db.info.get(_UOW_DEPTH_KEY, 0) + 1
+        return self.db
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        depth = self.db.info[_UOW_DEPTH_KEY] - 1
+        self.db.info[_UOW_DEPTH_KEY] = depth
+        if depth > 0:
+            return
+        if exc_type is not None:
+            await self.db.rollback()
+        else:
+            await self.db.commit()
 
 # ============================================
 # FUNCIONES PARA TESTING
@@ -227,6 +486,7 @@ def get_pool_status() -> dict:
         "checked_out": pool.checkedout(),
         "overflow": pool.overflow(),
         "total": pool.size() + pool.overflow(),
+        "replicas": len(replica_engines),
     }
 
 
@@ -0,0 +1,97 @@
+"""
+Ejecución concurrente de fragmentos de reporte independientes
+Cada fragmento usa su propia sesión (y conexión del pool) en un hilo
+"""
+
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+
+# Claves de session.info que heredan las sesiones de los fragmentos
+# (enrutado a réplica y read-your-writes)
+_INHERITED_INFO = ("readonly", "sticky_key")
+
+# Pool compartido por todos los requests: acota las conexiones que usa el
+# fan-out en todo el proceso (REPORT_FANOUT_MAX_WORKERS < DB_POOL_SIZE)
+_executor = ThreadPoolExecutor(
+    max_workers=settings.REPORT_FANOUT_MAX_WORKERS,
+    thread_name_prefix="report-fanout"
+)
+
+# True dentro de un fragmento: un fan-out anidado se ejecuta en serie para no
+# bloquear hilos del pool esperando a otros hilos del mismo pool
+_inside_fragment: contextvars.ContextVar[bool] = contextvars.ContextVar("report_fanout_fragment", default=False)
+
+Fragment = Callable[[Session], Any]
+
+
+def _run_fragment(fragment: Fragment, info: dict) -> Any:
+    """Ejecuta un fragmento con una sesión propia"""
+    _inside_fragment.set(True)
+    db = SessionLocal(info=dict(info))
+    try:
+        return fragment(db)
+    finally:
+        db.close()
+
+
+def fan_out(
+    fragments: Dict[str, Fragment],
+    db: Optional[Session] = None,
+    max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Ejecuta fragmentos independientes en paralelo y devuelve sus resultados.
+
+    Cada fragmento recibe una sesión nueva, así que no comparten conexión
+    ni transacción. Si un fragmento falla se propaga su excepción (los demás
+    terminan igualmente). Con max_concurrency <= 1 se ejecutan en serie sobre
+    `db` (también cuando se llama desde otro fragmento).
+
+    Args:
+        fragments: Nombre -> función que recibe una Session
+        db: Sesión del request (se copian sus opciones de enrutado)
+        max_concurrency: Fragmentos en vuelo a la vez para este request
+            (por defecto REPORT_FANOUT_CONCURRENCY)
+
+    Returns:
+        Nombre -> resultado de cada fragmento
+    """
+    limit = max_concurrency or settings.REPORT_FANOUT_CONCURRENCY
+    if limit <= 1 or len(fragments) <= 1 or _inside_fragment.get():
+        if db is not None:
+            return {name: fragment(db) for name, fragment in fragments.items()}
+        return {name: _run_fragment(fragment, {}) for name, fragment in fragments.items()}
+
+    info = {k: db.info[k] for k in _INHERITED_INFO if db is not None and k in db.info}
+    pending = list(fragments.items())
+    running: Dict[Future, str] = {}
+    results: Dict[str, Any] = {}
+    error: Optional[BaseException] = None
+
+    while pending or running:
+        # Nunca más de `limit` fragmentos del mismo request a la vez
+        while pending and len(running) < limit:
+            name, fragment = pending.pop(0)
+            # El contexto (p. ej. las stats de queries del request) se copia al hilo
+            context = contextvars.copy_context()
+            running[_executor.submit(context.run, _run_fragment, fragment, info)] = name
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                results[name] = future.result()
+            except BaseException as exc:
+                error = error or exc
+                pending.clear()
+
+    if error is not None:
+        raise error
+    return results
@@ -0,0 +1,167 @@
+"""
+Hashing de contraseñas en un pool de procesos
+bcrypt consume cientos de ms de CPU por operación: fuera del proceso de la API
+usa todos los núcleos sin bloquear el event loop ni el threadpool de requests
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import (
+    calibrar_bcrypt, configurar_bcrypt, get_password_hash, verify_password
+)
+
+logger = get_logger(__name__)
+
+
+class PasswordHasherSaturado(Exception):
+    """Hay PASSWORD_HASH_MAX_PENDING operaciones en curso; main.py lo responde con 503"""
+
+
+class PasswordHasher:
+    """
+    Pool acotado de procesos para verify_password / get_password_hash.
+
+    Como mucho `max_pending` operaciones en curso o en cola: las siguientes
+    fallan al instante con PasswordHasherSaturado en lugar de encolarse, así
+    una ráfaga de logins no acumula segundos de espera ni memoria.
+
+    Uso:
+    ```python
+    if not await password_hasher.verify(password, usuario.password_hash):
+        ...
+    ```
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        """
+        Args:
+            workers: Procesos del pool (0 = se ejecuta en el hilo que llama)
+            max_pending: Máximo de operaciones en curso o en espera
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = settings.BCRYPT_ROUNDS
+        self.rechazadas = 0
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Operaciones en curso o en espera"""
+        return self._pending
+
+    def start(self) -> None:
+        """
+        Calibra el costo de bcrypt, crea el pool y calienta sus procesos
+        (lifespan): el primer hash de cada proceso carga passlib y bcrypt, y
+        no debe pagarlo un login.
+        """
+        if settings.BCRYPT_CALIBRATE:
+            self.rounds = calibrar_bcrypt(
+                settings.BCRYPT_TARGET_MS,
+                settings.BCRYPT_MIN_ROUNDS,
+                settings.BCRYPT_MAX_ROUNDS
+            )
+            logger.info(f"Costo de bcrypt calibrado: {self.rounds} (objetivo {settings.BCRYPT_TARGET_MS} ms)")
+        configurar_bcrypt(self.rounds)
+        
+        if self.workers > 0:
+            with self._lock:
+                executor = self._get_executor()
+            # Cada tarea sin proceso libre arranca uno nuevo, hasta `workers`
+            for _ in range(self.workers):
+                executor.submit(get_password_hash, "warmup")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cierra el pool (lifespan); las operaciones en cola se cancelan"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password sin bloquear el event loop"""
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    async def hash(self, password: str) -> str:
+        """get_password_hash sin bloquear el event loop"""
+        return await asyncio.wrap_future(self._submit(get_password_hash, password))
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password desde código síncrono (el hilo espera sin ocupar CPU)"""
+        return self._submit(verify_password, plain_password, hashed_password).result()
+
+    def hash_sync(self, password: str) -> str:
+        """get_password_hash desde código síncrono"""
+        return self._submit(get_password_hash, password).result()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # spawn: el proceso de la API tiene hilos (fan-out, jobs) y hacer fork con hilos puede bloquear al hijo
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                # Los procesos nuevos no heredan la calibración: se les pasa el costo
+                initializer=configurar_bcrypt,
+                initargs=(self.rounds,)
+            )
+        return self._executor
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Reserva un lugar en la cola y envía la operación al pool"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rechazadas += 1
+                raise PasswordHasherSaturado(
+                    f"{self._pending} operaciones de contraseña pendientes (máximo {self.max_pending})"
+                )
+            self._pending += 1
+
+        try:
+            future = self._run(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if self.workers <= 0:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # Un proceso del pool murió (OOM, kill): se descarta el pool y se crea otro
+            logger.warning("Pool de hashing de contraseñas roto; se recrea")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+                executor = self._get_executor()
+            return executor.submit(fn, *args)
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+# Pool compartido por todos los requests del proceso
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -0,0 +1,185 @@
+"""
+Conteo de queries SQL por request
+Listeners de SQLAlchemy que acumulan número de queries, tiempo total y
+fingerprints de sentencias en el request actual (vía contextvar)
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+# Stats del request en curso (None = no se está midiendo)
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("sql_query_stats", default=None)
+
+# Normalización de sentencias para el fingerprint
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_PARAM = re.compile(r"%\(\w+\)s|%s|\?|:\w+|__\[POSTCOMPILE_\w+\]")
+_RE_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_SPACES = re.compile(r"\s+")
+
+# Directorios cuyo frame se reporta como origen de la query
+_APP_PATH = "/app/"
+_REPOSITORIES_PATH = "/app/repositories/"
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normaliza una sentencia SQL para agrupar las que solo difieren en valores.
+
+    Reemplaza literales y parámetros por `?`, colapsa listas `IN (?, ?, ...)`
+    y espacios.
+
+    Args:
+        statement: Sentencia SQL
+
+    Returns:
+        Sentencia normalizada
+    """
+    sql = _RE_STRING.sub("?", statement)
+    sql = _RE_PARAM.sub("?", sql)
+    sql = _RE_NUMBER.sub("?", sql)
+    sql = _RE_IN_LIST.sub("(...)", sql)
+    return _RE_SPACES.sub(" ", sql).strip()
+
+
+def _calling_method() -> Optional[str]:
+    """
+    Busca en el stack el método que originó la query.
+
+    Prioriza el primer método de un repository; si la query no pasa por
+    ninguno, devuelve el primer frame de la aplicación. Los lazy loads se
+    reportan con la relación cargada (p. ej. `lazy load Factura.detalles`),
+    ya que suelen dispararse al serializar la respuesta, fuera de la app.
+    """
+    frame = sys._getframe(2)
+    app_frame = None
+    lazy_attr = None
+    while frame is not None:
+        filename = frame.f_code.co_filename.replace("\\", "/")
+        if lazy_attr is None and frame.f_code.co_name == "_load_for_state":
+            prop = getattr(frame.f_locals.get("self"), "parent_property", None)
+            if prop is not None:
+                lazy_attr = str(prop)
+        if _REPOSITORIES_PATH in filename:
+            app_frame = frame
+            break
+        if app_frame is None and _APP_PATH in filename and "/app/core/" not in filename:
+            app_frame = frame
+        frame = frame.f_back
+
+    origin = _describe_frame(app_frame) if app_frame is not None else None
+    if lazy_attr:
+        return f"lazy load {lazy_attr}" + (f" desde {origin}" if origin else "")
+    return origin
+
+
+def _describe_frame(frame) -> str:
+    """Formatea un frame como `modulo.Clase.metodo:linea` (Clase = clase real de self)"""
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        name = f"{type(owner).__name__}.{frame.f_code.co_name}"
+    else:
+        name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{name}:{frame.f_lineno}"
+
+
+class QueryStats:
+    """
+    Estadísticas de queries SQL de un request.
+
+    Atributos:
+    - count: Número de queries ejecutadas
+    - total_time: Tiempo total en la base de datos (segundos)
+    - fingerprints: Repeticiones por sentencia normalizada
+    - callers: Método que originó cada fingerprint repetido
+    """
+
+    def __init__(self, n_plus_one_threshold: int = None):
+        self.n_plus_one_threshold = n_plus_one_threshold or settings.SQL_N_PLUS_ONE_THRESHOLD
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter = Counter()
+        self.callers: Dict[str, Optional[str]] = {}
+        # El mismo request puede ejecutar queries desde varios hilos
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float) -> None:
+        """Registra una query ejecutada"""
+        key = fingerprint(statement)
+        with self._lock:
+            self.count += 1
+            self.total_time += duration
+            self.fingerprints[key] += 1
+            repeated = self.fingerprints[key] == self.n_plus_one_threshold + 1
+
+        # El stack solo se inspecciona una vez por fingerprint sospechoso
+        if repeated:
+            self.callers[key] = _calling_method()
+
+    def repeated(self) -> List[dict]:
+        """
+        Fingerprints que se repitieron más de `n_plus_one_threshold` veces.
+
+        Returns:
+            Lista de {fingerprint, count, caller} ordenada por repeticiones
+        """
+        return [
+            {"fingerprint": key, "count": count, "caller": self.callers.get(key)}
+            for key, count in self.fingerprints.most_common()
+            if count > self.n_plus_one_threshold
+        ]
+
+
+def start_tracking() -> Token:
+    """
+    Empieza a medir las queries del contexto actual (request).
+
+    Returns:
+        Token para restaurar el contexto con stop_tracking
+    """
+    return _current_stats.set(QueryStats())
+
+
+def stop_tracking(token: Token) -> None:
+    """Deja de medir las queries del contexto actual"""
+    _current_stats.reset(token)
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """Stats del request en curso (None si no se está midiendo)"""
+    return _current_stats.get()
+
+
+# ============================================
+# LISTENERS DE SQLALCHEMY
+# ============================================
+
+# Se registran sobre la clase Engine, así que cubren el primario, las
+# réplicas y el engine síncrono interno del engine asíncrono.
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is None:
+        return
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    starts = conn.info.get("query_start_time")
+    if stats is None or not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
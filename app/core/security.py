@@ -3,19 +3,66 @@ Módulo de Seguridad
 Maneja autenticación, autorización, JWT tokens y hashing de passwords
 """
 
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 
+from app.core.cache import TTLCache, MISSING
 from app.core.config import settings
+from app.core.token_revocation import revocation_list
 
 # ============================================
 # CONFIGURACIÓN DE PASSWORD HASHING
 # ============================================
 
-# Context para hashing de passwords con bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Context para hashing de passwords con bcrypt. El costo efectivo lo fija
+# configurar_bcrypt (calibrado al arrancar); BCRYPT_ROUNDS es el valor sin calibrar
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=settings.BCRYPT_ROUNDS)
+
+
+def configurar_bcrypt(rounds: int) -> None:
+    """
+    Fija el costo de bcrypt de este proceso (también se ejecuta en cada
+    proceso del pool de hashing).
+    
+    Solo un hash más débil que `rounds` queda marcado para rehash: sin tope
+    superior, dos workers calibrados a costos vecinos no se rehacen mutuamente
+    los hashes en cada login.
+    """
+    # default_rounds y no rounds: passlib usa `rounds` también como máximo
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds
+    )
+
+
+def calibrar_bcrypt(target_ms: float, min_rounds: int, max_rounds: int, muestras: int = 3) -> int:
+    """
+    Elige el costo de bcrypt cuya verificación tarda lo más cerca posible de
+    `target_ms` en este host, sin pasarse, acotado a [min_rounds, max_rounds].
+    
+    Mide `min_rounds` (la mejor de `muestras`, para no contar interrupciones)
+    y extrapola: cada punto de costo duplica el tiempo.
+    
+    Returns:
+        Costo elegido
+    """
+    hasher = bcrypt.using(rounds=min_rounds)
+    base_ms = float("inf")
+    for _ in range(muestras):
+        inicio = time.perf_counter()
+        hasher.hash("calibracion")
+        base_ms = min(base_ms, (time.perf_counter() - inicio) * 1000)
+    
+    rounds = min_rounds
+    while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+        rounds += 1
+    return rounds
 
 
 # ============================================
@@ -36,6 +83,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Indica si el hash tiene un costo menor que el configurado (no calcula bcrypt)"""
+    return pwd_context.needs_update(hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     Genera un hash seguro de una contraseña.
@@ -103,6 +155,13 @@ def validate_password_strength(password: str) -> bool:
 # FUNCIONES DE JWT TOKEN
 # ============================================
 
+# Claims de tokens con firma ya verificada, por SHA-256 del token; cada
+# entrada vive hasta el `exp` del token (ttl de la caché = el del access token)
+token_cache = TTLCache(
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES
+)
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -129,7 +188,8 @@ def create_access_token(
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),  # Issued at
-        "type": "access"
+        "type": "access",
+        "jti": uuid.uuid4().hex  # Permite revocar este token (logout)
     })
     
     encoded_jwt = jwt.encode(
@@ -167,7 +227,8 @@ def create_refresh_token(
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),
-        "type": "refresh"
+        "type": "refresh",
+        "jti": uuid.uuid4().hex  # Permite revocar este token (logout)
     })
     
     encoded_jwt = jwt.encode(
@@ -183,26 +244,54 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Decodifica y valida un token JWT.
     
+    Un token válido se guarda en `token_cache` hasta su expiración: las
+    siguientes llamadas con el mismo token (middleware, dependencias) no
+    vuelven a parsearlo ni a calcular el HMAC. Los inválidos no se cachean.
+    
     Args:
         token: Token JWT a decodificar
         
     Returns:
         dict: Payload del token si es válido, None si es inválido
     """
+    if not settings.TOKEN_CACHE_ENABLED:
+        return _decode_token(token)
+    
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(key)
+    if payload is not MISSING:
+        return dict(payload)
+    
+    payload = _decode_token(token)
+    if payload is None:
+        return None
+    
+    # Sin `exp` el token no caduca: vive el ttl por defecto de la caché
+    exp = payload.get("exp")
+    restante = exp - time.time() if isinstance(exp, (int, float)) else None
+    if restante is None or restante > 0:
+        token_cache.set(key, payload, ttl=restante)
+    return dict(payload)
+
+
+def _decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Parsea el token y verifica firma y expiración (python-jose)"""
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
     """
-    Verifica un token JWT y su tipo.
+    Verifica un token JWT, su tipo y que no haya sido revocado.
+    
+    La revocación se consulta en memoria (ver app.core.token_revocation);
+    no se cachea junto con los claims para que un logout aplique al instante.
     
     Args:
         token: Token JWT a verificar
@@ -220,6 +309,9 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     if payload.get("type") != token_type:
         return None
     
+    if settings.TOKEN_REVOCATION_ENABLED and revocation_list.esta_revocado(payload):
+        return None
+    
     return payload
 
 
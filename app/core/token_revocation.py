@@ -0,0 +1,219 @@
+"""
+Lista de tokens revocados (logout y cierre forzado de sesiones)
+Copia por proceso de la tabla `tokens_revocados` detrás de un filtro de Bloom:
+un token no revocado se descarta con unos hashes, sin tocar la base
+"""
+
+import hashlib
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+
+class Revocacion(NamedTuple):
+    """Fila de tokens_revocados con las fechas como timestamps"""
+    id: int
+    jti: Optional[str]
+    usuario_id: Optional[int]
+    revocado_desde: float
+    expira: float
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bytearray.
+
+    `clave in filtro` nunca da falso negativo; da falso positivo con
+    probabilidad ~`error_rate` mientras no se superen `capacity` claves.
+    No admite borrado: se reconstruye cuando sobran claves vencidas.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+            capacity: Claves previstas
+            error_rate: Tasa de falsos positivos con `capacity` claves
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _posiciones(self, clave: str):
+        # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de un único digest
+        digest = hashlib.blake2b(clave.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, clave: str) -> None:
+        for pos in self._posiciones(clave):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, clave: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._posiciones(clave))
+
+
+class RevocationList:
+    """
+    Tokens revocados conocidos por este proceso.
+
+    - Por `jti`: un token concreto (logout); vale hasta el `exp` del token.
+    - Por usuario: todo token del usuario emitido (`iat`) hasta el momento
+      del cierre forzado. `iat` tiene resolución de segundos, así que un
+      token emitido en el mismo segundo que el cierre también queda revocado.
+
+    El camino caliente (`esta_revocado`) solo consulta el filtro de Bloom;
+    los conjuntos exactos se miran únicamente ante un positivo. La tabla se
+    aplica por deltas (`aplicar`) y cada tanto se recarga completa
+    (`reemplazar`), lo que además descarta del filtro las entradas vencidas.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+            capacity: Revocaciones vigentes previstas (dimensiona el filtro)
+            error_rate: Tasa de falsos positivos del filtro
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.consultas = 0
+        self.positivos = 0
+        self.cursor = 0
+        self._lock = threading.Lock()
+        self._jtis: Dict[str, float] = {}
+        self._usuarios: Dict[int, Tuple[float, float]] = {}  # usuario_id -> (desde, expira)
+        self._bloom = BloomFilter(capacity, error_rate)
+
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._usuarios)
+
+    def esta_revocado(self, payload: Dict[str, Any]) -> bool:
+        """Indica si el token (claims ya verificados) fue revocado"""
+        self.consultas += 1
+        bloom = self._bloom
+        jti = payload.get("jti")
+        sub = payload.get("sub")
+
+        if jti and f"j:{jti}" in bloom:
+            self.positivos += 1
+            if jti in self._jtis:
+                return True
+
+        if sub is not None and f"u:{sub}" in bloom:
+            self.positivos += 1
+            revocacion = self._usuarios.get(int(sub))
+            iat = payload.get("iat")
+            if revocacion is not None and (not isinstance(iat, (int, float)) or iat <= revocacion[0]):
+                return True
+
+        return False
+
+    def revocar_jti(self, jti: str, expira: float) -> None:
+        """Revoca un token hasta `expira` (timestamp de su `exp`)"""
+        with self._lock:
+            self._agregar_jti(jti, expira)
+
+    def revocar_usuario(self, usuario_id: int, desde: float, expira: float) -> None:
+        """
+        Revoca los tokens del usuario emitidos hasta `desde` (timestamp); la
+        entrada se descarta en `expira`, cuando ya no queda ninguno vigente.
+        """
+        with self._lock:
+            self._agregar_usuario(usuario_id, desde, expira)
+
+    def aplicar(self, filas: Iterable[Revocacion]) -> int:
+        """
+        Aplica filas nuevas de la tabla (delta desde `cursor`).
+
+        Returns:
+            Número de filas aplicadas
+        """
+        total = 0
+        with self._lock:
+            for fila in filas:
+                self._aplicar_fila(fila)
+                self.cursor = max(self.cursor, fila.id)
+                total += 1
+        return total
+
+    def reemplazar(self, filas: Iterable[Revocacion], ahora: Optional[float] = None) -> None:
+        """
+        Reemplaza el contenido por la tabla completa y reconstruye el filtro.
+
+        Recupera filas que un delta pudo saltarse (ids confirmados fuera de
+        orden) y deja fuera las revocaciones ya vencidas.
+        """
+        ahora = ahora if ahora is not None else time.time()
+        nueva = RevocationList(self.capacity, self.error_rate)
+        for fila in filas:
+            if fila.expira > ahora:
+                nueva._aplicar_fila(fila)
+            nueva.cursor = max(nueva.cursor, fila.id)
+
+        with self._lock:
+            # Lo revocado localmente mientras se leía la tabla no se pierde
+            for jti, expira in self._jtis.items():
+                if expira > ahora and jti not in nueva._jtis:
+                    nueva._agregar_jti(jti, expira)
+            for usuario_id, (desde, expira) in self._usuarios.items():
+                if expira > ahora:
+                    nueva._agregar_usuario(usuario_id, desde, expira)
+            # Se sustituyen las referencias: los lectores sin lock ven el estado viejo o el nuevo
+            self._jtis = nueva._jtis
+            self._usuarios = nueva._usuarios
+            self._bloom = nueva._bloom
+            self.cursor = max(self.cursor, nueva.cursor)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jtis = {}
+            self._usuarios = {}
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+            self.cursor = 0
+
+    def _aplicar_fila(self, fila: Revocacion) -> None:
+        if fila.jti:
+            self._agregar_jti(fila.jti, fila.expira)
+        elif fila.usuario_id is not None:
+            self._agregar_usuario(fila.usuario_id, fila.revocado_desde, fila.expira)
+
+    def _agregar_jti(self, jti: str, expira: float) -> None:
+        self._crecer_si_lleno()
+        self._jtis[jti] = expira
+        self._bloom.add(f"j:{jti}")
+
+    def _agregar_usuario(self, usuario_id: int, desde: float, expira: float) -> None:
+        self._crecer_si_lleno()
+        actual = self._usuarios.get(usuario_id)
+        if actual is not None:
+            desde, expira = max(desde, actual[0]), max(expira, actual[1])
+        self._usuarios[usuario_id] = (desde, expira)
+        self._bloom.add(f"u:{usuario_id}")
+
+    def _crecer_si_lleno(self) -> None:
+        # Pasada la capacidad los falsos positivos se disparan: se rehace el filtro al doble
+        if self._bloom.count < self._bloom.capacity:
+            return
+        bloom = BloomFilter(self._bloom.capacity * 2, self.error_rate)
+        for jti in self._jtis:
+            bloom.add(f"j:{jti}")
+        for usuario_id in self._usuarios:
+            bloom.add(f"u:{usuario_id}")
+        self._bloom = bloom
+
+
+# Revocaciones vistas por este proceso; TokenRevocacionService las sincroniza con la tabla
+revocation_list = RevocationList(
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE
+)
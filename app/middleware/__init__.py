@@ -4,7 +4,7 @@ Middleware module - Middlewares de la aplicación SGG-API
 
 from app.middleware.authentication import AuthenticationMiddleware
 from app.middleware.gym_context import GymContextMiddleware
-from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.logging_middleware import LoggingMiddleware, SQLLoggingMiddleware
 from app.middleware.error_handler import ErrorHandlerMiddleware
 from app.middleware.rate_limiter import RateLimiterMiddleware
 
@@ -12,6 +12,7 @@ __all__ = [
     "AuthenticationMiddleware",
     "GymContextMiddleware",
     "LoggingMiddleware",
+    "SQLLoggingMiddleware",
     "ErrorHandlerMiddleware",
     "RateLimiterMiddleware",
 ]
\ No newline at end of file
@@ -9,9 +9,10 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
-from app.core.logging import get_logger
+from app.core.logging import CustomLogger
+from app.core.query_tracker import start_tracking, stop_tracking, get_query_stats
 
-logger = get_logger(__name__)
+logger = CustomLogger(__name__)
 
 
 class LoggingMiddleware(BaseHTTPMiddleware):
@@ -182,6 +183,13 @@ class SQLLoggingMiddleware(BaseHTTPMiddleware):
     Middleware para loggear queries SQL ejecutadas durante un request.
     
     Útil para debugging y optimización de queries.
+    
+    Agrega los headers:
+    - X-DB-Queries: Número de queries ejecutadas
+    - X-DB-Time: Tiempo total en la base de datos
+    
+    y reporta como posible N+1 cada sentencia (normalizada) que se repite
+    más de SQL_N_PLUS_ONE_THRESHOLD veces, junto con el método que la originó.
     """
     
     async def dispatch(
@@ -198,16 +206,22 @@ class SQLLoggingMiddleware(BaseHTTPMiddleware):
             Response: Respuesta del endpoint
         """
         
-        # Contador de queries para este request
-        request.state.sql_query_count = 0
-        request.state.sql_query_time = 0.0
-        
-        # Procesar request
-        response = await call_next(request)
+        # Contador de queries para este request (lo alimentan los listeners de SQLAlchemy)
+        token = start_tracking()
+        try:
+            stats = get_query_stats()
+            response = await call_next(request)
+        finally:
+            stop_tracking(token)
         
         # Log de estadísticas SQL
-        query_count = getattr(request.state, "sql_query_count", 0)
-        query_time = getattr(request.state, "sql_query_time", 0.0)
+        query_count = stats.count
+        query_time = stats.total_time
+        request.state.sql_query_count = query_count
+        request.state.sql_query_time = query_time
+        
+        response.headers["X-DB-Queries"] = str(query_count)
+        response.headers["X-DB-Time"] = f"{query_time:.3f}s"
         
         if query_count > 0:
             logger.info(
@@ -215,15 +229,18 @@ class SQLLoggingMiddleware(BaseHTTPMiddleware):
                 path=request.url.path,
                 query_count=query_count,
                 query_time=query_time,
-                avg_query_time=query_time / query_count if query_count > 0 else 0
+                avg_query_time=query_time / query_count
             )
             
-            # Alerta si hay demasiadas queries (N+1 problem)
-            if query_count > 20:
+            # Alerta por cada sentencia repetida (N+1 problem)
+            for repeated in stats.repeated():
                 logger.warning(
-                    f"⚠️ Posible N+1 problem: {query_count} queries en {request.url.path}",
+                    f"⚠️ Posible N+1 problem: {repeated['count']} x \"{repeated['fingerprint']}\" "
+                    f"en {request.url.path} desde {repeated['caller'] or 'desconocido'}",
                     path=request.url.path,
-                    query_count=query_count
+                    query_count=repeated["count"],
+                    fingerprint=repeated["fingerprint"],
+                    caller=repeated["caller"]
                 )
         
         return response
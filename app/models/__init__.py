@@ -27,6 +27,10 @@ from app.models.dieta_comida import DietaComida
 from app.models.progreso_fisico import ProgresoFisico
 from app.models.notificacion import Notificacion
 from app.models.log_actividad import LogActividad
+from app.models.resumen_diario_acceso import ResumenDiarioAcceso
+from app.models.resumen_diario_ingreso import ResumenDiarioIngreso
+from app.models.job import Job
+from app.models.token_revocado import TokenRevocado
 
 __all__ = [
     "Base",
@@ -55,4 +59,8 @@ __all__ = [
     "ProgresoFisico",
     "Notificacion",
     "LogActividad",
+    "ResumenDiarioAcceso",
+    "ResumenDiarioIngreso",
+    "Job",
+    "TokenRevocado",
 ]
\ No newline at end of file
@@ -3,7 +3,7 @@ Modelo Acceso
 Registra las entradas y salidas de los usuarios al gimnasio
 """
 
-from sqlalchemy import Column, Integer, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, DateTime, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -33,6 +33,11 @@ class Acceso(Base):
     usuario = relationship("Usuario", back_populates="accesos")
     gimnasio = relationship("Gimnasio", back_populates="accesos")
     
+    __table_args__ = (
+        # Reportes de asistencia: filtro por gimnasio + rango de fechas
+        Index("ix_accesos_gimnasio_fecha_entrada", "gimnasio_id", "fecha_hora_entrada"),
+    )
+    
     def __repr__(self):
         return f"<Acceso(id={self.id}, usuario_id={self.usuario_id}, tipo='{self.tipo_acceso}')>"
     
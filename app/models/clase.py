@@ -39,6 +39,11 @@ class Clase(Base):
     def __repr__(self):
         return f"<Clase(id={self.id}, nombre='{self.nombre}')>"
     
+    @property
+    def entrenador_nombre(self) -> str:
+        """Nombre completo del entrenador (cargar Clase.entrenador con el perfil del repository)"""
+        return self.entrenador.nombre_completo if self.entrenador else None
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -0,0 +1,40 @@
+"""Modelo Job - Generación de reportes en segundo plano"""
+from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, Enum as SQLEnum, DateTime, Index
+from datetime import datetime
+from app.models.base import Base
+from app.core.constants import EstadoJobEnum
+
+class Job(Base):
+    """
+    Reporte pedido por POST /reportes/jobs y generado por un worker
+    (en el proceso de la API o con scripts/worker.py).
+    
+    El archivo resultante se guarda con FileHandler y se elimina al pasar
+    `fecha_expiracion` (el job queda en estado EXPIRADO).
+    """
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    gimnasio_id = Column(Integer, ForeignKey("gimnasios.id", ondelete="CASCADE"), nullable=False, index=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="SET NULL"), nullable=True)
+    tipo = Column(String(50), nullable=False, comment="Reporte a generar")
+    formato = Column(String(10), nullable=False, comment="json, pdf, csv o xlsx")
+    parametros = Column(JSON, nullable=True, comment="Argumentos del reporte (fechas, granularidad)")
+    estado = Column(SQLEnum(EstadoJobEnum), default=EstadoJobEnum.PENDIENTE, nullable=False)
+    intentos = Column(Integer, default=0, nullable=False)
+    worker_id = Column(String(100), nullable=True, comment="Worker que tomó el job")
+    error = Column(Text, nullable=True)
+    archivo = Column(String(500), nullable=True, comment="Ruta relativa al directorio de FileHandler")
+    tamano_bytes = Column(Integer, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.utcnow, nullable=False)
+    fecha_inicio = Column(DateTime, nullable=True)
+    fecha_fin = Column(DateTime, nullable=True)
+    fecha_expiracion = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Los workers buscan el siguiente pendiente y los jobs vencidos por estado
+        Index("ix_jobs_estado_fecha_creacion", "estado", "fecha_creacion"),
+    )
+    
+    def to_dict(self):
+        return {"id": self.id, "tipo": self.tipo, "formato": self.formato, "estado": self.estado.value if self.estado else None}
@@ -43,6 +43,11 @@ class Membresia(Base, TimestampMixin):
     def __repr__(self):
         return f"<Membresia(id={self.id}, usuario_id={self.usuario_id}, estado='{self.estado}')>"
     
+    @property
+    def membresia_tipo_nombre(self) -> str:
+        """Nombre del tipo de membresía (cargar Membresia.membresia_tipo con el perfil del repository)"""
+        return self.membresia_tipo.nombre if self.membresia_tipo else None
+    
     @property
     def esta_activa(self) -> bool:
         """Verifica si la membresía está activa y vigente"""
@@ -0,0 +1,45 @@
+"""Modelo ResumenDiarioAcceso - Accesos agregados por gimnasio, día y hora"""
+from sqlalchemy import Column, Integer, Date, ForeignKey, UniqueConstraint
+from app.models.base import Base
+
+class ResumenDiarioAcceso(Base):
+    """
+    Resumen de accesos por gimnasio, fecha y hora de entrada.
+    
+    Se actualiza de forma incremental al registrar entradas y salidas
+    (AccesoService) y se reconstruye con scripts/rebuild_resumenes.py.
+    """
+    __tablename__ = "resumen_diario_accesos"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    gimnasio_id = Column(Integer, ForeignKey("gimnasios.id", ondelete="CASCADE"), nullable=False)
+    fecha = Column(Date, nullable=False)
+    hora = Column(Integer, nullable=False, comment="Hora de entrada (0-23)")
+    entradas = Column(Integer, default=0, nullable=False)
+    usuarios_unicos = Column(
+        Integer, default=0, nullable=False,
+        comment="Usuarios cuya primera entrada del día cae en esta hora (la suma del día da los únicos del día)"
+    )
+    visitas_cerradas = Column(Integer, default=0, nullable=False, comment="Entradas con salida registrada")
+    minutos_estancia = Column(Integer, default=0, nullable=False, comment="Minutos totales de las visitas cerradas")
+    
+    __table_args__ = (
+        UniqueConstraint('gimnasio_id', 'fecha', 'hora', name='resumen_acceso_unico'),
+    )
+    
+    @property
+    def promedio_estancia_minutos(self) -> float:
+        """Duración media de las visitas cerradas"""
+        if not self.visitas_cerradas:
+            return 0
+        return round(self.minutos_estancia / self.visitas_cerradas, 2)
+    
+    def to_dict(self):
+        return {
+            "gimnasio_id": self.gimnasio_id,
+            "fecha": self.fecha.isoformat() if self.fecha else None,
+            "hora": self.hora,
+            "entradas": self.entradas,
+            "usuarios_unicos": self.usuarios_unicos,
+            "promedio_estancia_minutos": self.promedio_estancia_minutos,
+        }
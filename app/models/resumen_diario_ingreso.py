@@ -0,0 +1,35 @@
+"""Modelo ResumenDiarioIngreso - Facturación agregada por gimnasio, día, tipo y estado"""
+from sqlalchemy import Column, Integer, Date, Numeric, ForeignKey, Enum as SQLEnum, UniqueConstraint
+from app.models.base import Base
+from app.core.constants import TipoFacturaEnum, EstadoFacturaEnum
+
+class ResumenDiarioIngreso(Base):
+    """
+    Resumen de facturas por gimnasio, fecha de emisión, tipo y estado.
+    
+    Se actualiza de forma incremental al crear facturas (FacturaService) y al
+    cambiar su estado (PagoService); se reconstruye con scripts/rebuild_resumenes.py.
+    """
+    __tablename__ = "resumen_diario_ingresos"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    gimnasio_id = Column(Integer, ForeignKey("gimnasios.id", ondelete="CASCADE"), nullable=False)
+    fecha = Column(Date, nullable=False)
+    tipo = Column(SQLEnum(TipoFacturaEnum), nullable=False)
+    estado = Column(SQLEnum(EstadoFacturaEnum), nullable=False)
+    cantidad = Column(Integer, default=0, nullable=False)
+    total = Column(Numeric(12, 2), default=0, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('gimnasio_id', 'fecha', 'tipo', 'estado', name='resumen_ingreso_unico'),
+    )
+    
+    def to_dict(self):
+        return {
+            "gimnasio_id": self.gimnasio_id,
+            "fecha": self.fecha.isoformat() if self.fecha else None,
+            "tipo": self.tipo.value if self.tipo else None,
+            "estado": self.estado.value if self.estado else None,
+            "cantidad": self.cantidad,
+            "total": float(self.total) if self.total is not None else 0,
+        }
@@ -0,0 +1,25 @@
+"""Modelo TokenRevocado - Tokens JWT invalidados antes de su expiración"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from datetime import datetime
+from app.models.base import Base
+
+class TokenRevocado(Base):
+    """
+    Revocación de tokens: un token concreto (`jti`, logout) o todos los de
+    un usuario emitidos hasta `revocado_desde` (jti NULL, cierre forzado).
+    
+    Cada worker de la API mantiene una copia en memoria (app.core.token_revocation)
+    que lee las filas nuevas por id; pasada `fecha_expiracion` la fila ya no
+    afecta a ningún token vigente y se purga.
+    """
+    __tablename__ = "tokens_revocados"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    jti = Column(String(64), nullable=True, index=True, comment="NULL = todos los tokens del usuario")
+    usuario_id = Column(Integer, ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=True, index=True)
+    motivo = Column(String(50), nullable=True, comment="logout o cierre_forzado")
+    revocado_desde = Column(DateTime, default=datetime.utcnow, nullable=False)
+    fecha_expiracion = Column(DateTime, nullable=False, index=True, comment="Expiración del último token afectado")
+    
+    def to_dict(self):
+        return {"id": self.id, "jti": self.jti, "usuario_id": self.usuario_id, "motivo": self.motivo}
@@ -127,6 +127,11 @@ class Usuario(Base, TimestampMixin):
         
         return age
     
+    @property
+    def rol_nombre(self) -> str:
+        """Nombre del rol (cargar Usuario.rol con el perfil del repository)"""
+        return self.rol.nombre if self.rol else None
+    
     def to_dict(self, include_sensitive=False):
         """
         Convierte el modelo a diccionario.
@@ -174,4 +179,8 @@ class Usuario(Base, TimestampMixin):
     
     def es_cliente(self) -> bool:
         """Verifica si el usuario es cliente"""
-        return self.rol and self.rol.nombre == "cliente"
\ No newline at end of file
+        return self.rol and self.rol.nombre == "cliente"
+    
+    def es_staff(self) -> bool:
+        """Verifica si el usuario es parte del staff (super_admin, admin o entrenador)"""
+        return self.rol and self.rol.nombre in ["super_admin", "admin", "entrenador"]
\ No newline at end of file
@@ -1,10 +1,13 @@
 """Repository de Acceso"""
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime, date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.acceso import Acceso
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, half_open_range, STREAM_BATCH_SIZE
+from app.repositories.async_base import AsyncBaseRepository
 
 class AccesoRepository(BaseRepository[Acceso]):
     def __init__(self, db: Session):
@@ -29,18 +32,35 @@ class AccesoRepository(BaseRepository[Acceso]):
         
         return query.order_by(Acceso.fecha_hora_entrada.desc()).offset(skip).limit(limit).all()
     
+    def get_page_by_gimnasio(self, gimnasio_id: int, after: Optional[str] = None, limit: int = 100) -> Tuple[List[Acceso], Optional[str]]:
+        """Obtiene una página de accesos de un gimnasio (más recientes primero) por cursor"""
+        query = self.db.query(Acceso).filter(Acceso.gimnasio_id == gimnasio_id)
+        return self._paginate_after(query, after, limit, Acceso.fecha_hora_entrada, order_desc=True)
+    
     def get_acceso_abierto(self, usuario_id: int) -> Optional[Acceso]:
         """Obtiene acceso abierto (sin salida) de un usuario"""
         return self.db.query(Acceso).filter(
             and_(Acceso.usuario_id == usuario_id, Acceso.fecha_hora_salida.is_(None))
         ).first()
     
+    def tiene_entrada_desde(self, usuario_id: int, gimnasio_id: int, desde: datetime) -> bool:
+        """Verifica si el usuario registró alguna entrada en el gimnasio desde `desde`"""
+        return self._exists(
+            Acceso.usuario_id == usuario_id,
+            Acceso.gimnasio_id == gimnasio_id,
+            Acceso.fecha_hora_entrada >= desde
+        )
+    
     def get_usuarios_en_gimnasio(self, gimnasio_id: int) -> List[Acceso]:
         """Obtiene usuarios actualmente en el gimnasio (sin salida registrada)"""
         return self.db.query(Acceso).filter(
             and_(Acceso.gimnasio_id == gimnasio_id, Acceso.fecha_hora_salida.is_(None))
         ).all()
     
+    def contar_en_gimnasio(self, gimnasio_id: int) -> int:
+        """Cuenta los usuarios actualmente en el gimnasio (accesos sin salida)"""
+        return self.count({"gimnasio_id": gimnasio_id, "fecha_hora_salida": None})
+    
     def contar_visitas_usuario(self, usuario_id: int, fecha_inicio: date = None, fecha_fin: date = None) -> int:
         """Cuenta las visitas de un usuario en un rango de fechas"""
         query = self.db.query(Acceso).filter(Acceso.usuario_id == usuario_id)
@@ -50,4 +70,128 @@ class AccesoRepository(BaseRepository[Acceso]):
         if fecha_fin:
             query = query.filter(Acceso.fecha_hora_entrada <= datetime.combine(fecha_fin, datetime.max.time()))
         
-        return query.count()
\ No newline at end of file
+        return query.count()
+    
+    def conteo_por_dia(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Accesos y usuarios distintos de un gimnasio por día, en una sola consulta agrupada.
+        
+        Filtra con un rango semiabierto sobre fecha_hora_entrada (usa el
+        índice gimnasio_id + fecha_hora_entrada); DATE() solo se aplica al agrupar.
+        
+        Returns:
+            Filas (fecha, total, usuarios_unicos) ordenadas por fecha
+        """
+        dia = func.date(Acceso.fecha_hora_entrada)
+        stmt = select(
+            dia.label("fecha"),
+            func.count(Acceso.id).label("total"),
+            func.count(func.distinct(Acceso.usuario_id)).label("usuarios_unicos"),
+        ).where(
+            Acceso.gimnasio_id == gimnasio_id,
+            *half_open_range(Acceso.fecha_hora_entrada, fecha_inicio, fecha_fin)
+        ).group_by(dia).order_by(dia)
+        
+        return self.db.execute(stmt).all()
+    
+    def contar_usuarios_unicos(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> int:
+        """
+        Cuenta los usuarios distintos con alguna entrada en el rango.
+        
+        Recorre los accesos crudos de todo el rango: los únicos de un período
+        no se obtienen de los resúmenes diarios (un usuario cuenta en cada día).
+        """
+        stmt = select(func.count(func.distinct(Acceso.usuario_id))).where(
+            Acceso.gimnasio_id == gimnasio_id,
+            *half_open_range(Acceso.fecha_hora_entrada, fecha_inicio, fecha_fin)
+        )
+        return self.db.execute(stmt).scalar_one()
+    
+    def resumen_por_gimnasio(self, gimnasio_ids: List[int], fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Entradas y usuarios distintos de varios gimnasios en el rango, agrupados por gimnasio.
+        
+        Returns:
+            Filas (gimnasio_id, entradas, usuarios_unicos)
+        """
+        stmt = select(
+            Acceso.gimnasio_id,
+            func.count(Acceso.id).label("entradas"),
+            func.count(func.distinct(Acceso.usuario_id)).label("usuarios_unicos"),
+        ).where(
+            Acceso.gimnasio_id.in_(gimnasio_ids),
+            *half_open_range(Acceso.fecha_hora_entrada, fecha_inicio, fecha_fin)
+        ).group_by(Acceso.gimnasio_id)
+        
+        return self.db.execute(stmt).all()
+    
+    def iter_entradas(
+        self,
+        fecha_inicio: date,
+        fecha_fin: date,
+        gimnasio_id: Optional[int] = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[Row]:
+        """
+        Recorre los accesos del rango ordenados por entrada, sin cargarlos todos
+        en memoria (solo las columnas que usan los resúmenes).
+        
+        Returns:
+            Iterador de filas (gimnasio_id, usuario_id, fecha_hora_entrada, fecha_hora_salida)
+        """
+        stmt = select(
+            Acceso.gimnasio_id,
+            Acceso.usuario_id,
+            Acceso.fecha_hora_entrada,
+            Acceso.fecha_hora_salida,
+        ).where(
+            *half_open_range(Acceso.fecha_hora_entrada, fecha_inicio, fecha_fin)
+        ).order_by(Acceso.fecha_hora_entrada)
+        if gimnasio_id is not None:
+            stmt = stmt.where(Acceso.gimnasio_id == gimnasio_id)
+        
+        return self._stream(stmt, batch_size)
+
+
+class AsyncAccesoRepository(AsyncBaseRepository[Acceso]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Acceso, db)
+    
+    async def get_by_usuario(self, usuario_id: int, skip: int = 0, limit: int = 100) -> List[Acceso]:
+        """Obtiene accesos de un usuario"""
+        result = await self.db.execute(
+            select(Acceso).where(Acceso.usuario_id == usuario_id)
+            .order_by(Acceso.fecha_hora_entrada.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_page_by_gimnasio(self, gimnasio_id: int, after: Optional[str] = None, limit: int = 100) -> Tuple[List[Acceso], Optional[str]]:
+        """Obtiene una página de accesos de un gimnasio (más recientes primero) por cursor"""
+        stmt = select(Acceso).where(Acceso.gimnasio_id == gimnasio_id)
+        return await self._paginate_after(stmt, after, limit, Acceso.fecha_hora_entrada, order_desc=True)
+    
+    async def get_acceso_abierto(self, usuario_id: int) -> Optional[Acceso]:
+        """Obtiene acceso abierto (sin salida) de un usuario"""
+        result = await self.db.execute(
+            select(Acceso).where(
+                and_(Acceso.usuario_id == usuario_id, Acceso.fecha_hora_salida.is_(None))
+            ).limit(1)
+        )
+        return result.scalars().first()
+    
+    async def tiene_entrada_desde(self, usuario_id: int, gimnasio_id: int, desde: datetime) -> bool:
+        """Verifica si el usuario registró alguna entrada en el gimnasio desde `desde`"""
+        return await self._exists(
+            Acceso.usuario_id == usuario_id,
+            Acceso.gimnasio_id == gimnasio_id,
+            Acceso.fecha_hora_entrada >= desde
+        )
+    
+    async def get_usuarios_en_gimnasio(self, gimnasio_id: int) -> List[Acceso]:
+        """Obtiene usuarios actualmente en el gimnasio (sin salida registrada)"""
+        result = await self.db.execute(
+            select(Acceso).where(
+                and_(Acceso.gimnasio_id == gimnasio_id, Acceso.fecha_hora_salida.is_(None))
+            )
+        )
+        return list(result.scalars().all())
\ No newline at end of file
@@ -0,0 +1,499 @@
+"""
+Repository Base Asíncrono
+Versión asíncrona de BaseRepository sobre AsyncSession
+"""
+
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Tuple, Iterable, Sequence
+from sqlalchemy import select, func, desc, asc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.declarative import DeclarativeMeta
+
+from app.core.database import in_unit_of_work
+from app.repositories.base import (
+    keyset_condition,
+    keyset_order,
+    group_rows_by_keys,
+    bulk_update_statement,
+    upsert_statement,
+    increment_statement,
+    equality_conditions,
+    exists_statement,
+    exists_many_statement,
+    split_missing_keys,
+    IN_CHUNK_SIZE,
+    UPSERT_CHUNK_SIZE,
+)
+from app.utils.pagination import encode_cursor
+
+# TypeVar con bound genérico de SQLAlchemy
+ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
+
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """
+    Repository base asíncrono con operaciones CRUD genéricas.
+    
+    Expone la misma API que BaseRepository, pero cada operación es una
+    corrutina que libera el event loop mientras espera a la base de datos.
+    
+    Uso:
+    ```python
+    class AsyncAccesoRepository(AsyncBaseRepository[Acceso]):
+        def __init__(self, db: AsyncSession):
+            super().__init__(Acceso, db)
+    ```
+    """
+    
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        """
+        Inicializa el repository.
+        
+        Args:
+            model: Clase del modelo SQLAlchemy
+            db: Sesión asíncrona de base de datos
+        """
+        self.model = model
+        self.db = db
+    
+    # ========================================
+    # HELPERS
+    # ========================================
+    
+    async def _commit(self, db_obj: Optional[ModelType] = None, refresh: bool = False) -> None:
+        """Confirma la escritura pendiente, salvo dentro de un AsyncUnitOfWork (ver BaseRepository._commit)"""
+        if in_unit_of_work(self.db):
+            if refresh and db_obj is not None:
+                await self.db.flush()
+                await self.db.refresh(db_obj)
+            return
+        
+        await self.db.commit()
+        if refresh and db_obj is not None:
+            await self.db.refresh(db_obj)
+    
+    async def _rollback(self) -> None:
+        """Descarta la transacción, salvo dentro de un AsyncUnitOfWork"""
+        if not in_unit_of_work(self.db):
+            await self.db.rollback()
+    
+    def _apply_filters(self, stmt, filters: Dict[str, Any] = None):
+        """Aplica filtros de igualdad {campo: valor} a un select"""
+        if filters:
+            for field, value in filters.items():
+                if hasattr(self.model, field):
+                    stmt = stmt.where(getattr(self.model, field) == value)
+        return stmt
+    
+    # ========================================
+    # OPERACIONES CRUD BÁSICAS
+    # ========================================
+    
+    async def get_by_id(self, id: int) -> Optional[ModelType]:
+        """
+        Obtiene un registro por ID (usa el identity map de la sesión).
+        
+        Args:
+            id: ID del registro
+        
+        Returns:
+            Registro o None si no existe
+        """
+        return await self.db.get(self.model, id)
+    
+    async def get_many(self, ids: Iterable[int]) -> List[ModelType]:
+        """
+        Obtiene varios registros por ID con una sola query `WHERE id IN (...)`.
+        
+        Args:
+            ids: IDs a obtener (se admiten duplicados)
+        
+        Returns:
+            Registros en el mismo orden en que se pidieron
+        """
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        found = {}
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CHUNK_SIZE]
+            result = await self.db.execute(select(self.model).where(self.model.id.in_(chunk)))
+            for obj in result.scalars().all():
+                found[obj.id] = obj
+        
+        return [found[i] for i in ids if i in found]
+    
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Dict[str, Any] = None,
+        order_by: str = None,
+        order_desc: bool = False
+    ) -> List[ModelType]:
+        """
+        Obtiene todos los registros con paginación y filtros opcionales.
+        
+        Args:
+            skip: Número de registros a saltar
+            limit: Número máximo de registros a retornar
+            filters: Diccionario de filtros {campo: valor}
+            order_by: Campo por el cual ordenar
+            order_desc: Si ordenar descendente
+        
+        Returns:
+            Lista de registros
+        """
+        stmt = self._apply_filters(select(self.model), filters)
+        
+        if order_by and hasattr(self.model, order_by):
+            order_column = getattr(self.model, order_by)
+            stmt = stmt.order_by(desc(order_column) if order_desc else asc(order_column))
+        
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def get_by_filters(self, **filters) -> List[ModelType]:
+        """
+        Obtiene registros por filtros múltiples.
+        
+        Args:
+            **filters: Filtros como keyword arguments
+        
+        Returns:
+            Lista de registros que coinciden con los filtros
+        """
+        result = await self.db.execute(self._apply_filters(select(self.model), filters))
+        return list(result.scalars().all())
+    
+    async def get_one_by_filters(self, **filters) -> Optional[ModelType]:
+        """
+        Obtiene un único registro por filtros.
+        
+        Args:
+            **filters: Filtros como keyword arguments
+        
+        Returns:
+            Primer registro que coincide o None
+        """
+        stmt = self._apply_filters(select(self.model), filters).limit(1)
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+    
+    async def create(self, obj_data: Dict[str, Any], refresh: bool = False) -> ModelType:
+        """
+        Crea un nuevo registro.
+        
+        Args:
+            obj_data: Diccionario con los datos del registro
+            refresh: Si recargar el registro tras guardarlo
+        
+        Returns:
+            Registro creado
+        """
+        db_obj = self.model(**obj_data)
+        self.db.add(db_obj)
+        await self._commit(db_obj, refresh)
+        return db_obj
+    
+    async def update(self, id: int, obj_data: Dict[str, Any], refresh: bool = False) -> Optional[ModelType]:
+        """
+        Actualiza un registro existente.
+        
+        Args:
+            id: ID del registro a actualizar
+            obj_data: Diccionario con los datos a actualizar
+            refresh: Si recargar el registro tras guardarlo
+        
+        Returns:
+            Registro actualizado o None si no existe
+        """
+        db_obj = await self.get_by_id(id)
+        if not db_obj:
+            return None
+        
+        for field, value in obj_data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+        
+        await self._commit(db_obj, refresh)
+        return db_obj
+    
+    async def delete(self, id: int) -> bool:
+        """
+        Elimina un registro.
+        
+        Args:
+            id: ID del registro a eliminar
+        
+        Returns:
+            True si se eliminó, False si no existe
+        """
+        db_obj = await self.get_by_id(id)
+        if not db_obj:
+            return False
+        
+        await self.db.delete(db_obj)
+        await self._commit()
+        return True
+    
+    async def count(self, filters: Dict[str, Any] = None) -> int:
+        """
+        Cuenta los registros con filtros opcionales.
+        
+        Args:
+            filters: Diccionario de filtros {campo: valor}
+        
+        Returns:
+            Número de registros
+        """
+        stmt = self._apply_filters(select(func.count()).select_from(self.model), filters)
+        return (await self.db.execute(stmt)).scalar_one()
+    
+    async def exists(self, id: int) -> bool:
+        """
+        Verifica si existe un registro con el ID dado.
+        
+        Args:
+            id: ID a verificar
+        
+        Returns:
+            True si existe, False en caso contrario
+        """
+        return await self.exists_by_filters(id=id)
+    
+    async def exists_by_filters(self, **filters) -> bool:
+        """
+        Verifica si existe un registro con los filtros dados.
+        
+        Args:
+            **filters: Filtros como keyword arguments
+        
+        Returns:
+            True si existe, False en caso contrario
+        """
+        return await self._exists(*equality_conditions(self.model, filters))
+    
+    async def _exists(self, *conditions) -> bool:
+        """Verifica si existe algún registro que cumpla las condiciones SQL dadas"""
+        return bool((await self.db.execute(exists_statement(self.model, list(conditions)))).scalar())
+    
+    async def exists_many(
+        self,
+        keys: Iterable[Any],
+        fields: Sequence[str] = ("id",),
+        **filters
+    ) -> List[Any]:
+        """
+        Verifica un lote de claves en una query (ver BaseRepository.exists_many).
+        
+        Args:
+            keys: IDs, o tuplas con un valor por campo si la clave es compuesta
+            fields: Columnas que forman la clave
+            **filters: Filtros adicionales (p. ej. activo=True)
+        
+        Returns:
+            Claves que no existen, sin duplicados y en el orden recibido
+        """
+        keys = list(dict.fromkeys(keys))
+        conditions = equality_conditions(self.model, filters)
+        found_rows = []
+        for start in range(0, len(keys), IN_CHUNK_SIZE):
+            chunk = keys[start:start + IN_CHUNK_SIZE]
+            result = await self.db.execute(exists_many_statement(self.model, fields, chunk, conditions))
+            found_rows.extend(result.all())
+        
+        return split_missing_keys(keys, fields, found_rows)
+    
+    # ========================================
+    # PAGINACIÓN POR CURSOR (KEYSET)
+    # ========================================
+    
+    async def get_page_after(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        filters: Dict[str, Any] = None,
+        order_by: str = "id",
+        order_desc: bool = False
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Obtiene una página de registros posterior al cursor dado.
+        
+        Args:
+            after: Cursor devuelto por la página anterior (None = primera página)
+            limit: Número máximo de registros a retornar
+            filters: Diccionario de filtros {campo: valor}
+            order_by: Campo por el cual ordenar
+            order_desc: Si ordenar descendente
+            
+        Returns:
+            Tupla (registros, next_cursor) donde next_cursor es None en la última página
+        """
+        stmt = self._apply_filters(select(self.model), filters)
+        order_column = getattr(self.model, order_by) if hasattr(self.model, order_by) else self.model.id
+        return await self._paginate_after(stmt, after, limit, order_column, order_desc)
+    
+    async def _paginate_after(
+        self,
+        stmt,
+        after: Optional[str],
+        limit: int,
+        order_column,
+        order_desc: bool = False
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Aplica paginación keyset a un select existente (ver BaseRepository._paginate_after)"""
+        if limit <= 0:
+            return [], None
+        
+        if after:
+            stmt = stmt.where(keyset_condition(order_column, self.model.id, after, order_desc))
+        
+        stmt = stmt.order_by(*keyset_order(order_column, self.model.id, order_desc)).limit(limit + 1)
+        rows = list((await self.db.execute(stmt)).scalars().all())
+        
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(getattr(last, order_column.key), last.id)
+    
+    # ========================================
+    # OPERACIONES ADICIONALES
+    # ========================================
+    
+    async def bulk_create(self, objects_data: List[Dict[str, Any]]) -> List[ModelType]:
+        """
+        Crea múltiples registros en una sola operación.
+        
+        Args:
+            objects_data: Lista de diccionarios con datos
+        
+        Returns:
+            Lista de registros creados
+        """
+        db_objects = [self.model(**obj_data) for obj_data in objects_data]
+        self.db.add_all(db_objects)
+        await self._commit()
+        return db_objects
+    
+    async def bulk_update(self, updates: List[Dict[str, Any]]) -> int:
+        """
+        Actualiza múltiples registros por PK en una sola transacción
+        (ver BaseRepository.bulk_update).
+        
+        Args:
+            updates: Lista de diccionarios con 'id' y datos a actualizar
+        
+        Returns:
+            Número de filas afectadas
+        """
+        table = self.model.__table__
+        updates = [u for u in updates if u.get('id')]
+        count = 0
+        
+        try:
+            for keys, rows in group_rows_by_keys(table, updates, exclude=('id',)).items():
+                if not keys:
+                    continue
+                params = [{**{k: row[k] for k in keys}, "_pk": row['id']} for row in rows]
+                result = await self.db.execute(bulk_update_statement(table), params)
+                count += result.rowcount
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+        
+        return count
+    
+    async def bulk_upsert(
+        self,
+        rows: List[Dict[str, Any]],
+        update_fields: Optional[List[str]] = None,
+        conflict_fields: Optional[List[str]] = None
+    ) -> int:
+        """
+        Inserta registros y actualiza los que ya existen (ver BaseRepository.bulk_upsert).
+        
+        Args:
+            rows: Lista de diccionarios con los datos
+            update_fields: Columnas a sobrescribir en duplicados ([] = ignorar duplicados)
+            conflict_fields: Clave única que detecta el duplicado en ON CONFLICT
+        
+        Returns:
+            Número de filas afectadas según el driver
+        """
+        table = self.model.__table__
+        dialect_name = self.db.get_bind().dialect.name
+        conflict_fields = conflict_fields or [c.name for c in table.primary_key.columns]
+        count = 0
+        
+        try:
+            for keys, group in group_rows_by_keys(table, rows).items():
+                if update_fields is None:
+                    fields = [k for k in keys if k not in conflict_fields]
+                else:
+                    fields = [k for k in update_fields if k in keys]
+                for start in range(0, len(group), UPSERT_CHUNK_SIZE):
+                    chunk = group[start:start + UPSERT_CHUNK_SIZE]
+                    stmt = upsert_statement(table, dialect_name, chunk, fields, conflict_fields)
+                    count += (await self.db.execute(stmt)).rowcount
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+        
+        return count
+    
+    async def increment(self, keys: Dict[str, Any], deltas: Dict[str, Any]) -> None:
+        """
+        Suma `deltas` a la fila con clave única `keys` (ver BaseRepository.increment).
+        
+        Args:
+            keys: Valores de la clave única
+            deltas: Incrementos por columna
+        """
+        table = self.model.__table__
+        stmt = increment_statement(table, self.db.get_bind().dialect.name, keys, deltas)
+        
+        try:
+            await self.db.execute(stmt)
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+    
+    async def get_or_create(self, defaults: Dict[str, Any] = None, **filters) -> tuple[ModelType, bool]:
+        """
+        Obtiene un registro o lo crea si no existe (ver BaseRepository.get_or_create).
+        
+        Args:
+            defaults: Valores adicionales para crear el registro
+            **filters: Filtros para buscar el registro (clave única)
+        
+        Returns:
+            Tupla (registro, creado) donde creado es True si se creó
+        """
+        instance = await self.get_one_by_filters(**filters)
+        
+        if instance:
+            return instance, False
+        
+        create_data = {**filters}
+        if defaults:
+            create_data.update(defaults)
+        
+        if self.db.get_bind().dialect.name == "mysql":
+            # MySQL no distingue inserción y duplicado en el rowcount: el duplicado llega como error
+            try:
+                await self.db.execute(self.model.__table__.insert().values(create_data))
+                await self._commit()
+            except IntegrityError:
+                await self._rollback()
+                instance = await self.get_one_by_filters(**filters)
+                if instance is None:
+                    raise
+                return instance, False
+            return await self.get_one_by_filters(**filters), True
+        
+        created = await self.bulk_upsert([create_data], update_fields=[], conflict_fields=list(filters)) > 0
+        return await self.get_one_by_filters(**filters), created
@@ -3,14 +3,235 @@ Repository Base
 Clase base para todos los repositorios con operaciones CRUD genéricas
 """
 
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+import copy
+from datetime import date, datetime, time, timedelta
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Tuple, Iterable, Iterator, Sequence
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy import and_, or_, desc, asc, inspect, update, bindparam, select, literal, tuple_, case, func
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import mysql, sqlite
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
+from app.core.config import settings
+from app.core.database import in_unit_of_work
+from app.utils.pagination import encode_cursor, decode_cursor
+
 # TypeVar con bound genérico de SQLAlchemy
 ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
 
+# Máximo de IDs por cláusula IN en get_many
+IN_CHUNK_SIZE = 1000
+
+# Máximo de filas por sentencia INSERT multi-VALUES en bulk_upsert
+UPSERT_CHUNK_SIZE = 500
+
+# Filas por lote al recorrer resultados con cursor del lado del servidor
+STREAM_BATCH_SIZE = 1000
+
+
+def keyset_condition(order_column, id_column, after: str, order_desc: bool = False):
+    """
+    Construye el filtro keyset "posterior al cursor" para (order_column, id).
+    
+    Equivale a `(order_column, id) > (valor, id)` (o `<` si es descendente),
+    expandido con OR para que MySQL pueda usar el índice de la columna.
+    
+    Args:
+        order_column: Columna de ordenamiento
+        id_column: Columna de desempate (PK)
+        after: Token de cursor
+        order_desc: Si el orden es descendente
+        
+    Returns:
+        Expresión SQL para el WHERE
+    """
+    valor, last_id = decode_cursor(after)
+    if order_column is id_column:
+        return id_column < last_id if order_desc else id_column > last_id
+    if order_desc:
+        return or_(order_column < valor, and_(order_column == valor, id_column < last_id))
+    return or_(order_column > valor, and_(order_column == valor, id_column > last_id))
+
+
+def keyset_order(order_column, id_column, order_desc: bool = False) -> list:
+    """Orden estable (order_column, id) usado por la paginación keyset"""
+    if order_column is id_column:
+        return [desc(id_column) if order_desc else asc(id_column)]
+    if order_desc:
+        return [desc(order_column), desc(id_column)]
+    return [asc(order_column), asc(id_column)]
+
+
+def half_open_range(column, fecha_inicio: Optional[date] = None, fecha_fin: Optional[date] = None) -> list:
+    """
+    Condiciones `inicio <= columna < fin + 1 día` para filtrar una columna
+    datetime por fechas sin envolverla en DATE(), de modo que use su índice.
+    
+    Args:
+        column: Columna DateTime
+        fecha_inicio: Primer día incluido (None = sin límite)
+        fecha_fin: Último día incluido (None = sin límite)
+    """
+    conditions = []
+    if fecha_inicio is not None:
+        conditions.append(column >= datetime.combine(fecha_inicio, time.min))
+    if fecha_fin is not None:
+        conditions.append(column < datetime.combine(fecha_fin + timedelta(days=1), time.min))
+    return conditions
+
+
+def count_if(condition):
+    """`SUM(CASE WHEN condición THEN 1 ELSE 0 END)` (0 si no hay filas)"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def sum_if(column, condition):
+    """`SUM(CASE WHEN condición THEN columna ELSE 0 END)` (0 si no hay filas)"""
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+def equality_conditions(model, filters: Dict[str, Any]) -> list:
+    """Condiciones `campo == valor` para los filtros que son atributos del modelo"""
+    return [getattr(model, field) == value for field, value in filters.items() if hasattr(model, field)]
+
+
+def exists_statement(model, conditions: list):
+    """`SELECT EXISTS(SELECT 1 FROM tabla WHERE ... LIMIT 1)`: se detiene en la primera fila"""
+    subquery = select(literal(1)).select_from(model).where(*conditions).limit(1)
+    return select(subquery.exists())
+
+
+def exists_many_statement(model, fields: Sequence[str], keys: list, conditions: list):
+    """
+    SELECT de las claves existentes entre `keys` con un solo IN.
+    
+    Con un campo usa `col IN (...)`; con varios, `(col1, col2) IN ((...), ...)`.
+    """
+    columns = [getattr(model, field) for field in fields]
+    if len(columns) == 1:
+        key_filter = columns[0].in_(keys)
+    else:
+        key_filter = tuple_(*columns).in_(keys)
+    return select(*columns).where(key_filter, *conditions).distinct()
+
+
+def split_missing_keys(keys: Iterable[Any], fields: Sequence[str], found_rows) -> List[Any]:
+    """Devuelve las claves de `keys` (sin duplicados, en orden) que no están en `found_rows`"""
+    if len(fields) == 1:
+        found = {row[0] for row in found_rows}
+    else:
+        found = {tuple(row) for row in found_rows}
+    return [key for key in keys if key not in found]
+
+
+def group_rows_by_keys(table, rows: Iterable[Dict[str, Any]], exclude=()) -> Dict[tuple, List[Dict[str, Any]]]:
+    """
+    Agrupa filas por su conjunto de columnas para poder ejecutarlas con executemany.
+    
+    Descarta las claves que no son columnas de la tabla y no modifica los dicts recibidos.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        clean = {k: v for k, v in row.items() if k in table.c}
+        keys = tuple(sorted(k for k in clean if k not in exclude))
+        groups.setdefault(keys, []).append(clean)
+    return groups
+
+
+def bulk_update_statement(table):
+    """
+    UPDATE por PK para executemany: `UPDATE t SET <claves del dict> WHERE id = :_pk`.
+    
+    El SET se genera a partir de las claves de cada grupo de parámetros, así que
+    todas las filas de una misma ejecución deben traer las mismas columnas.
+    """
+    return update(table).where(table.c.id == bindparam("_pk"))
+
+
+def dialect_insert(table, dialect_name: str):
+    """INSERT específico del dialecto (admite ON DUPLICATE KEY / ON CONFLICT)"""
+    if dialect_name == "mysql":
+        return mysql.insert(table)
+    if dialect_name == "sqlite":
+        return sqlite.insert(table)
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects import postgresql
+        return postgresql.insert(table)
+    raise NotImplementedError(f"upsert no soportado para el dialecto '{dialect_name}'")
+
+
+def upsert_statement(
+    table,
+    dialect_name: str,
+    rows: List[Dict[str, Any]],
+    update_fields: List[str],
+    conflict_fields: List[str]
+):
+    """
+    Construye un INSERT multi-VALUES que actualiza o ignora las filas duplicadas.
+    
+    - MySQL: `INSERT ... ON DUPLICATE KEY UPDATE` (sin campos a actualizar, `pk = pk`)
+    - SQLite/PostgreSQL: `INSERT ... ON CONFLICT (...) DO UPDATE` (o `DO NOTHING`)
+    
+    Args:
+        table: Tabla destino
+        dialect_name: Nombre del dialecto de la conexión
+        rows: Filas a insertar (todas con las mismas claves)
+        update_fields: Columnas a sobrescribir si la fila ya existe
+        conflict_fields: Columnas de la clave única (solo ON CONFLICT)
+        
+    Returns:
+        Sentencia lista para ejecutar
+    """
+    stmt = dialect_insert(table, dialect_name).values(rows)
+    
+    if dialect_name == "mysql":
+        if not update_fields:
+            # Actualización nula en vez de INSERT IGNORE: IGNORE también convierte
+            # en avisos los errores de NOT NULL, truncado o clave foránea
+            pk = next(iter(table.primary_key.columns)).name
+            return stmt.on_duplicate_key_update({pk: table.c[pk]})
+        return stmt.on_duplicate_key_update({f: stmt.inserted[f] for f in update_fields})
+    
+    if not update_fields:
+        return stmt.on_conflict_do_nothing()
+    return stmt.on_conflict_do_update(
+        index_elements=conflict_fields,
+        set_={f: stmt.excluded[f] for f in update_fields}
+    )
+
+
+def increment_statement(
+    table,
+    dialect_name: str,
+    keys: Dict[str, Any],
+    deltas: Dict[str, Any]
+):
+    """
+    Construye un upsert que suma `deltas` a la fila identificada por `keys`,
+    creándola con esos valores si no existe (`col = col + nuevo`). Es atómico,
+    así que admite incrementos concurrentes sobre la misma fila.
+    
+    Args:
+        table: Tabla destino
+        dialect_name: Nombre del dialecto de la conexión
+        keys: Valores de la clave única de la fila
+        deltas: Incrementos por columna (pueden ser negativos)
+        
+    Returns:
+        Sentencia lista para ejecutar
+    """
+    stmt = dialect_insert(table, dialect_name).values({**keys, **deltas})
+    
+    if dialect_name == "mysql":
+        return stmt.on_duplicate_key_update({f: table.c[f] + stmt.inserted[f] for f in deltas})
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={f: table.c[f] + stmt.excluded[f] for f in deltas}
+    )
+
 
 class BaseRepository(Generic[ModelType]):
     """
@@ -19,21 +240,112 @@ class BaseRepository(Generic[ModelType]):
     Uso:
     ```python
     class UsuarioRepository(BaseRepository[Usuario]):
-        def __init__(self, db: Session):
-            super().__init__(Usuario, db)
+        loader_profiles = {
+            "list": [joinedload(Usuario.rol)],
+        }
+        
+        def __init__(self, db: Session, profile: Optional[str] = None):
+            super().__init__(Usuario, db, profile)
     ```
     """
     
-    def __init__(self, model: Type[ModelType], db: Session):
+    # Perfiles de carga de relaciones: {"list" | "detail" | "report": [opciones]}
+    loader_profiles: Dict[str, list] = {}
+    
+    # Campos derivados disponibles en select_columns: {nombre: expresión SQL}
+    column_expressions: Dict[str, Any] = {}
+    
+    def __init__(self, model: Type[ModelType], db: Session, profile: Optional[str] = None):
         """
         Inicializa el repository.
         
         Args:
             model: Clase del modelo SQLAlchemy
             db: Sesión de base de datos
+            profile: Perfil de carga de relaciones (ver loader_profiles)
         """
         self.model = model
         self.db = db
+        self.profile = profile
+    
+    # ========================================
+    # PERFILES DE CARGA
+    # ========================================
+    
+    def with_profile(self, profile: Optional[str]) -> "BaseRepository[ModelType]":
+        """
+        Devuelve una copia del repository que carga las relaciones según el perfil.
+        
+        Args:
+            profile: Nombre del perfil (None = sin opciones de carga)
+            
+        Returns:
+            Repository sobre la misma sesión
+        """
+        repo = copy.copy(self)
+        repo.profile = profile
+        return repo
+    
+    def _loader_options(self) -> list:
+        """
+        Opciones de carga del perfil activo.
+        
+        Con DB_RAISE_ON_LAZY_LOAD se agrega raiseload("*"): cualquier relación que
+        el perfil no cargue lanza una excepción en lugar de hacer una query por fila.
+        """
+        if not self.profile:
+            return []
+        if self.profile not in self.loader_profiles:
+            raise ValueError(f"Perfil de carga '{self.profile}' no definido en {type(self).__name__}")
+        
+        options = list(self.loader_profiles[self.profile])
+        if settings.DB_RAISE_ON_LAZY_LOAD:
+            options.append(raiseload("*"))
+        return options
+    
+    def _profile_relationships(self) -> set:
+        """Nombres de las relaciones (primer nivel) que carga el perfil activo"""
+        keys = set()
+        for option in self.loader_profiles.get(self.profile, []) if self.profile else []:
+            path = getattr(option, "path", None)
+            if path is not None and len(path) > 1:
+                keys.add(path[1].key)
+        return keys
+    
+    def _query(self):
+        """Query sobre el modelo con las opciones de carga del perfil activo"""
+        return self.db.query(self.model).options(*self._loader_options())
+    
+    # ========================================
+    # TRANSACCIÓN
+    # ========================================
+    
+    def _commit(self, db_obj: Optional[ModelType] = None, refresh: bool = False) -> None:
+        """
+        Confirma la escritura pendiente.
+        
+        Dentro de un UnitOfWork no hace commit: el UnitOfWork hace un único
+        flush y commit al salir.
+        
+        Args:
+            db_obj: Registro escrito
+            refresh: Si recargar el registro desde la base de datos
+                (solo hace falta para valores generados por el servidor)
+        """
+        if in_unit_of_work(self.db):
+            if refresh and db_obj is not None:
+                self.db.flush()
+                self.db.refresh(db_obj)
+            return
+        
+        self.db.commit()
+        if refresh and db_obj is not None:
+            self.db.refresh(db_obj)
+    
+    def _rollback(self) -> None:
+        """Descarta la transacción, salvo dentro de un UnitOfWork (lo hace el UnitOfWork)"""
+        if not in_unit_of_work(self.db):
+            self.db.rollback()
     
     # ========================================
     # OPERACIONES CRUD BÁSICAS
@@ -43,13 +355,58 @@ class BaseRepository(Generic[ModelType]):
         """
         Obtiene un registro por ID.
         
+        Consulta primero el identity map de la sesión: si la PK ya se cargó
+        en este request no se vuelve a ir a la base de datos.
+        
         Args:
             id: ID del registro
             
         Returns:
             Registro o None si no existe
         """
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        obj = self.db.get(self.model, id, options=self._loader_options())
+        
+        # Si ya estaba en el identity map (cargado con otro perfil) las opciones no
+        # se aplicaron: se completan las relaciones del perfil que falten
+        if obj is not None and inspect(obj).unloaded & self._profile_relationships():
+            obj = self._query().filter(self.model.id == id).one_or_none()
+        return obj
+    
+    def get_many(self, ids: Iterable[int]) -> List[ModelType]:
+        """
+        Obtiene varios registros por ID con una sola query `WHERE id IN (...)`.
+        
+        Los registros ya presentes en el identity map de la sesión no se
+        vuelven a consultar. Los IDs inexistentes se omiten.
+        
+        Args:
+            ids: IDs a obtener (se admiten duplicados)
+            
+        Returns:
+            Registros en el mismo orden en que se pidieron
+        """
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        found = self._from_identity_map(ids)
+        
+        missing = [i for i in ids if i not in found]
+        for start in range(0, len(missing), IN_CHUNK_SIZE):
+            chunk = missing[start:start + IN_CHUNK_SIZE]
+            for obj in self._query().filter(self.model.id.in_(chunk)).all():
+                found[obj.id] = obj
+        
+        return [found[i] for i in ids if i in found]
+    
+    def _from_identity_map(self, ids: List[int]) -> Dict[int, ModelType]:
+        """Devuelve {id: registro} para los IDs ya cargados (y no expirados) en la sesión"""
+        found = {}
+        for id in ids:
+            obj = self.db.identity_map.get(identity_key(self.model, id))
+            if obj is None:
+                continue
+            state = inspect(obj)
+            if not state.expired and not state.was_deleted:
+                found[id] = obj
+        return found
     
     def get_all(
         self,
@@ -72,7 +429,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Lista de registros
         """
-        query = self.db.query(self.model)
+        query = self._query()
         
         # Aplicar filtros
         if filters:
@@ -97,7 +454,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Lista de registros que coinciden con los filtros
         """
-        query = self.db.query(self.model)
+        query = self._query()
         
         for field, value in filters.items():
             if hasattr(self.model, field):
@@ -115,7 +472,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Primer registro que coincide o None
         """
-        query = self.db.query(self.model)
+        query = self._query()
         
         for field, value in filters.items():
             if hasattr(self.model, field):
@@ -123,29 +480,30 @@ class BaseRepository(Generic[ModelType]):
         
         return query.first()
     
-    def create(self, obj_data: Dict[str, Any]) -> ModelType:
+    def create(self, obj_data: Dict[str, Any], refresh: bool = False) -> ModelType:
         """
         Crea un nuevo registro.
         
         Args:
             obj_data: Diccionario con los datos del registro
+            refresh: Si recargar el registro tras guardarlo
             
         Returns:
             Registro creado
         """
         db_obj = self.model(**obj_data)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._commit(db_obj, refresh)
         return db_obj
     
-    def update(self, id: int, obj_data: Dict[str, Any]) -> Optional[ModelType]:
+    def update(self, id: int, obj_data: Dict[str, Any], refresh: bool = False) -> Optional[ModelType]:
         """
         Actualiza un registro existente.
         
         Args:
             id: ID del registro a actualizar
             obj_data: Diccionario con los datos a actualizar
+            refresh: Si recargar el registro tras guardarlo
             
         Returns:
             Registro actualizado o None si no existe
@@ -158,8 +516,7 @@ class BaseRepository(Generic[ModelType]):
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._commit(db_obj, refresh)
         return db_obj
     
     def delete(self, id: int) -> bool:
@@ -177,7 +534,7 @@ class BaseRepository(Generic[ModelType]):
             return False
         
         self.db.delete(db_obj)
-        self.db.commit()
+        self._commit()
         return True
     
     def count(self, filters: Dict[str, Any] = None) -> int:
@@ -209,25 +566,237 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             True si existe, False en caso contrario
         """
-        return self.db.query(self.model).filter(self.model.id == id).count() > 0
+        return self.exists_by_filters(id=id)
     
     def exists_by_filters(self, **filters) -> bool:
         """
         Verifica si existe un registro con los filtros dados.
         
+        Usa `SELECT EXISTS(...)`, que se detiene en la primera coincidencia en
+        lugar de contarlas todas.
+        
         Args:
             **filters: Filtros como keyword arguments
             
         Returns:
             True si existe, False en caso contrario
         """
-        query = self.db.query(self.model)
+        return self._exists(*equality_conditions(self.model, filters))
+    
+    def _exists(self, *conditions) -> bool:
+        """Verifica si existe algún registro que cumpla las condiciones SQL dadas"""
+        return bool(self.db.execute(exists_statement(self.model, list(conditions))).scalar())
+    
+    def exists_many(
+        self,
+        keys: Iterable[Any],
+        fields: Sequence[str] = ("id",),
+        **filters
+    ) -> List[Any]:
+        """
+        Verifica un lote de claves en una query (por cada IN_CHUNK_SIZE claves).
+        
+        Uso:
+        ```python
+        faltantes = usuario_repo.exists_many([1, 2, 3])
+        faltantes = reserva_repo.exists_many(
+            [(usuario_id, horario_id, fecha), ...],
+            fields=("usuario_id", "clase_horario_id", "fecha_reserva")
+        )
+        ```
+        
+        Args:
+            keys: IDs, o tuplas con un valor por campo si la clave es compuesta
+            fields: Columnas que forman la clave
+            **filters: Filtros adicionales (p. ej. activo=True)
+            
+        Returns:
+            Claves que no existen, sin duplicados y en el orden recibido
+        """
+        keys = list(dict.fromkeys(keys))
+        conditions = equality_conditions(self.model, filters)
+        found_rows = []
+        for start in range(0, len(keys), IN_CHUNK_SIZE):
+            chunk = keys[start:start + IN_CHUNK_SIZE]
+            found_rows.extend(self.db.execute(exists_many_statement(self.model, fields, chunk, conditions)).all())
+        
+        return split_missing_keys(keys, fields, found_rows)
+    
+    # ========================================
+    # PAGINACIÓN POR CURSOR (KEYSET)
+    # ========================================
+    
+    def get_page_after(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        filters: Dict[str, Any] = None,
+        order_by: str = "id",
+        order_desc: bool = False
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Obtiene una página de registros posterior al cursor dado.
+        
+        A diferencia de get_all (OFFSET), el costo de cada página es el mismo
+        sin importar qué tan profundo se navegue.
+        
+        Args:
+            after: Cursor devuelto por la página anterior (None = primera página)
+            limit: Número máximo de registros a retornar
+            filters: Diccionario de filtros {campo: valor}
+            order_by: Campo por el cual ordenar
+            order_desc: Si ordenar descendente
+            
+        Returns:
+            Tupla (registros, next_cursor) donde next_cursor es None en la última página
+        """
+        query = self._query()
+        
+        if filters:
+            for field, value in filters.items():
+                if hasattr(self.model, field):
+                    query = query.filter(getattr(self.model, field) == value)
+        
+        order_column = getattr(self.model, order_by) if hasattr(self.model, order_by) else self.model.id
+        return self._paginate_after(query, after, limit, order_column, order_desc)
+    
+    def _paginate_after(
+        self,
+        query,
+        after: Optional[str],
+        limit: int,
+        order_column,
+        order_desc: bool = False
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Aplica paginación keyset a una query existente.
+        
+        Pide limit + 1 filas para saber si hay página siguiente sin contar la tabla.
+        
+        Args:
+            query: Query ya filtrada
+            after: Cursor de la página anterior
+            limit: Tamaño de página
+            order_column: Columna de ordenamiento
+            order_desc: Si ordenar descendente
+            
+        Returns:
+            Tupla (registros, next_cursor)
+        """
+        if limit <= 0:
+            return [], None
+        
+        if after:
+            query = query.filter(keyset_condition(order_column, self.model.id, after, order_desc))
+        
+        rows = query.order_by(*keyset_order(order_column, self.model.id, order_desc)).limit(limit + 1).all()
+        
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(getattr(last, order_column.key), last.id)
+    
+    # ========================================
+    # PROYECCIÓN DE COLUMNAS
+    # ========================================
+    
+    def select_columns(
+        self,
+        fields: Iterable[str],
+        *,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        order_by: Optional[str] = "id",
+        order_desc: bool = False,
+        **filters
+    ) -> List[Row]:
+        """
+        Obtiene solo las columnas pedidas, sin instanciar el modelo.
+        
+        Devuelve objetos Row (tuplas con acceso por atributo) que no pasan por
+        el identity map y que los schemas con `from_attributes` validan
+        directamente, p. ej. `select_columns(UsuarioResponse.model_fields, ...)`.
+        
+        Los nombres que no son columnas del modelo ni están en
+        `column_expressions` se ignoran (el schema usa su valor por defecto).
+        
+        Args:
+            fields: Nombres de los campos a seleccionar
+            skip: Número de registros a saltar
+            limit: Número máximo de registros a retornar
+            order_by: Campo por el cual ordenar
+            order_desc: Si ordenar descendente
+            **filters: Filtros de igualdad como keyword arguments
+            
+        Returns:
+            Lista de Row con los campos pedidos
+        """
+        stmt = select(*self._projection(fields)).select_from(self.model)
         
         for field, value in filters.items():
             if hasattr(self.model, field):
-                query = query.filter(getattr(self.model, field) == value)
+                stmt = stmt.where(getattr(self.model, field) == value)
         
-        return query.count() > 0
+        if order_by and hasattr(self.model, order_by):
+            order_column = getattr(self.model, order_by)
+            stmt = stmt.order_by(desc(order_column) if order_desc else asc(order_column))
+        
+        stmt = stmt.offset(skip)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        return self.db.execute(stmt).all()
+    
+    def iter_columns(
+        self,
+        fields: Iterable[str],
+        *conditions,
+        order_by: Optional[str] = "id",
+        batch_size: int = STREAM_BATCH_SIZE,
+        **filters
+    ) -> Iterator[Row]:
+        """
+        Como `select_columns`, pero recorre el resultado por lotes sin cargarlo
+        en memoria (exportaciones de miles o millones de filas).
+        
+        Args:
+            fields: Nombres de los campos a seleccionar
+            *conditions: Condiciones adicionales (expresiones SQLAlchemy)
+            order_by: Campo por el cual ordenar
+            batch_size: Filas por lote leídas del cursor
+            **filters: Filtros de igualdad como keyword arguments
+            
+        Returns:
+            Iterador de Row con los campos pedidos
+        """
+        stmt = select(*self._projection(fields)).select_from(self.model).where(
+            *conditions, *equality_conditions(self.model, filters)
+        )
+        if order_by and hasattr(self.model, order_by):
+            stmt = stmt.order_by(getattr(self.model, order_by))
+        return self._stream(stmt, batch_size)
+    
+    def _stream(self, stmt, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Row]:
+        """
+        Ejecuta la sentencia con `yield_per`: en MySQL usa un cursor del lado
+        del servidor y solo mantiene `batch_size` filas en memoria.
+        """
+        return iter(self.db.execute(stmt.execution_options(yield_per=batch_size)))
+    
+    def _projection(self, fields: Iterable[str]) -> list:
+        """Columnas y expresiones (etiquetadas con su nombre) para los campos pedidos"""
+        column_keys = set(self.model.__mapper__.column_attrs.keys())
+        columns = []
+        for name in fields:
+            if name in self.column_expressions:
+                columns.append(self.column_expressions[name].label(name))
+            elif name in column_keys:
+                columns.append(getattr(self.model, name))
+        if not columns:
+            raise ValueError(f"Ninguno de los campos pedidos es columna de {self.model.__name__}")
+        return columns
     
     # ========================================
     # OPERACIONES ADICIONALES
@@ -245,33 +814,146 @@ class BaseRepository(Generic[ModelType]):
         """
         db_objects = [self.model(**obj_data) for obj_data in objects_data]
         self.db.bulk_save_objects(db_objects)
-        self.db.commit()
+        self._commit()
         return db_objects
     
     def bulk_update(self, updates: List[Dict[str, Any]]) -> int:
         """
-        Actualiza múltiples registros en una sola operación.
+        Actualiza múltiples registros por PK en una sola transacción.
+        
+        Las filas se agrupan por conjunto de columnas y cada grupo se envía como
+        un único `UPDATE ... WHERE id = ?` con executemany, sin cargar los objetos.
         
         Args:
             updates: Lista de diccionarios con 'id' y datos a actualizar
             
         Returns:
-            Número de registros actualizados
+            Número de filas afectadas
         """
+        table = self.model.__table__
+        updates = [u for u in updates if u.get('id')]
         count = 0
-        for update_data in updates:
-            obj_id = update_data.pop('id', None)
-            if obj_id and self.update(obj_id, update_data):
-                count += 1
+        
+        try:
+            for keys, rows in group_rows_by_keys(table, updates, exclude=('id',)).items():
+                if not keys:
+                    continue
+                params = [{**{k: row[k] for k in keys}, "_pk": row['id']} for row in rows]
+                result = self.db.execute(bulk_update_statement(table), params)
+                count += result.rowcount
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        
+        # Los objetos ya cargados en la sesión quedan desactualizados
+        for obj in self._from_identity_map([u['id'] for u in updates]).values():
+            self.db.expire(obj)
+        
         return count
     
+    def bulk_upsert(
+        self,
+        rows: List[Dict[str, Any]],
+        update_fields: Optional[List[str]] = None,
+        conflict_fields: Optional[List[str]] = None
+    ) -> int:
+        """
+        Inserta registros y actualiza los que ya existen (PK o clave única duplicada).
+        
+        Args:
+            rows: Lista de diccionarios con los datos
+            update_fields: Columnas a sobrescribir en duplicados
+                (None = todas las recibidas salvo las de conflicto, [] = ignorar duplicados)
+            conflict_fields: Clave única que detecta el duplicado en ON CONFLICT
+                (por defecto la PK; MySQL usa cualquier clave única)
+            
+        Returns:
+            Número de filas afectadas según el driver. En MySQL cada fila insertada
+            cuenta 1 y cada fila actualizada 2.
+        """
+        table = self.model.__table__
+        dialect_name = self.db.get_bind().dialect.name
+        conflict_fields = conflict_fields or [c.name for c in table.primary_key.columns]
+        count = 0
+        
+        try:
+            for keys, group in group_rows_by_keys(table, rows).items():
+                if update_fields is None:
+                    fields = [k for k in keys if k not in conflict_fields]
+                else:
+                    fields = [k for k in update_fields if k in keys]
+                for start in range(0, len(group), UPSERT_CHUNK_SIZE):
+                    chunk = group[start:start + UPSERT_CHUNK_SIZE]
+                    stmt = upsert_statement(table, dialect_name, chunk, fields, conflict_fields)
+                    count += self.db.execute(stmt).rowcount
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        
+        return count
+    
+    def increment(self, keys: Dict[str, Any], deltas: Dict[str, Any]) -> None:
+        """
+        Suma `deltas` a la fila con clave única `keys` (la crea si no existe).
+        
+        Pensado para contadores y tablas de resumen: el incremento se hace en
+        la base de datos en una sola sentencia, sin leer la fila antes.
+        
+        Args:
+            keys: Valores de la clave única (p. ej. gimnasio_id, fecha)
+            deltas: Incrementos por columna
+        """
+        table = self.model.__table__
+        stmt = increment_statement(table, self.db.get_bind().dialect.name, keys, deltas)
+        
+        try:
+            self.db.execute(stmt)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+    
+    def replace_where(self, rows: List[Dict[str, Any]], *conditions) -> int:
+        """
+        Sustituye los registros que cumplen `conditions` por `rows` en una sola
+        transacción (DELETE + INSERT executemany). Útil para reconstruir tablas
+        derivadas por rangos.
+        
+        Args:
+            rows: Registros nuevos
+            *conditions: Condiciones SQL de los registros a reemplazar
+            
+        Returns:
+            Número de registros insertados
+        """
+        table = self.model.__table__
+        
+        try:
+            self.db.execute(table.delete().where(*conditions))
+            if rows:
+                self.db.execute(table.insert(), rows)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        
+        return len(rows)
+    
     def get_or_create(self, defaults: Dict[str, Any] = None, **filters) -> tuple[ModelType, bool]:
         """
         Obtiene un registro o lo crea si no existe.
         
+        Los filtros deben corresponder a una clave única de la tabla: la
+        inserción usa esa clave como destino de ON CONFLICT (en MySQL el
+        duplicado se detecta por el IntegrityError), así que dos peticiones
+        concurrentes no crean dos registros ni fallan. Cualquier otro error de
+        la inserción se propaga.
+        
         Args:
             defaults: Valores adicionales para crear el registro
-            **filters: Filtros para buscar el registro
+            **filters: Filtros para buscar el registro (clave única)
             
         Returns:
             Tupla (registro, creado) donde creado es True si se creó
@@ -281,10 +963,23 @@ class BaseRepository(Generic[ModelType]):
         if instance:
             return instance, False
         
-        # Crear nuevo registro
         create_data = {**filters}
         if defaults:
             create_data.update(defaults)
         
-        instance = self.create(create_data)
-        return instance, True
\ No newline at end of file
+        if self.db.get_bind().dialect.name == "mysql":
+            # Con CLIENT_FOUND_ROWS MySQL cuenta 1 tanto al insertar como al dar con
+            # el duplicado, así que se inserta sin más y el duplicado llega como error
+            try:
+                self.db.execute(self.model.__table__.insert().values(create_data))
+                self._commit()
+            except IntegrityError:
+                self._rollback()
+                instance = self.get_one_by_filters(**filters)
+                if instance is None:
+                    raise
+                return instance, False
+            return self.get_one_by_filters(**filters), True
+        
+        created = self.bulk_upsert([create_data], update_fields=[], conflict_fields=list(filters)) > 0
+        return self.get_one_by_filters(**filters), created
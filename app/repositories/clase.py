@@ -1,21 +1,35 @@
 """Repository de Clase"""
-from typing import List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, select
 from app.models.clase import Clase
+from app.models.usuario import Usuario
 from app.repositories.base import BaseRepository
 
 class ClaseRepository(BaseRepository[Clase]):
-    def __init__(self, db: Session):
-        super().__init__(Clase, db)
+    loader_profiles = {
+        "list": [joinedload(Clase.entrenador)],
+        "detail": [joinedload(Clase.entrenador), selectinload(Clase.horarios)],
+        # Los reportes solo agregan columnas propias de la clase
+        "report": [],
+    }
+    
+    column_expressions = {
+        "entrenador_nombre": select(
+            Usuario.nombre + " " + Usuario.apellido
+        ).where(Usuario.id == Clase.entrenador_id).scalar_subquery(),
+    }
+    
+    def __init__(self, db: Session, profile: Optional[str] = None):
+        super().__init__(Clase, db, profile)
     
     def get_by_gimnasio(self, gimnasio_id: int, activo: bool = None, skip: int = 0, limit: int = 100) -> List[Clase]:
         """Obtiene clases de un gimnasio"""
-        query = self.db.query(Clase).filter(Clase.gimnasio_id == gimnasio_id)
+        query = self._query().filter(Clase.gimnasio_id == gimnasio_id)
         if activo is not None:
             query = query.filter(Clase.activo == activo)
         return query.offset(skip).limit(limit).all()
     
     def get_by_entrenador(self, entrenador_id: int, skip: int = 0, limit: int = 100) -> List[Clase]:
         """Obtiene clases de un entrenador"""
-        return self.db.query(Clase).filter(Clase.entrenador_id == entrenador_id).offset(skip).limit(limit).all()
\ No newline at end of file
+        return self._query().filter(Clase.entrenador_id == entrenador_id).offset(skip).limit(limit).all()
\ No newline at end of file
@@ -24,10 +24,8 @@ class EntrenadorClienteRepository(BaseRepository[EntrenadorCliente]):
     
     def existe_relacion(self, entrenador_id: int, cliente_id: int) -> bool:
         """Verifica si existe una relación activa entre entrenador y cliente"""
-        return self.db.query(EntrenadorCliente).filter(
-            and_(
-                EntrenadorCliente.entrenador_id == entrenador_id,
-                EntrenadorCliente.cliente_id == cliente_id,
-                EntrenadorCliente.activo == True
-            )
-        ).count() > 0
\ No newline at end of file
+        return self.exists_by_filters(
+            entrenador_id=entrenador_id,
+            cliente_id=cliente_id,
+            activo=True
+        )
\ No newline at end of file
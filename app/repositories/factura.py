@@ -1,10 +1,12 @@
 """Repository de Factura"""
-from typing import List
+from typing import List, Optional, Tuple
+from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
+from sqlalchemy.engine import Row
 from app.models.factura import Factura
 from app.core.constants import EstadoFacturaEnum
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, sum_if, half_open_range
 
 class FacturaRepository(BaseRepository[Factura]):
     def __init__(self, db: Session):
@@ -14,6 +16,11 @@ class FacturaRepository(BaseRepository[Factura]):
         """Obtiene facturas de un gimnasio"""
         return self.db.query(Factura).filter(Factura.gimnasio_id == gimnasio_id).offset(skip).limit(limit).all()
     
+    def get_page_by_gimnasio(self, gimnasio_id: int, after: Optional[str] = None, limit: int = 100) -> Tuple[List[Factura], Optional[str]]:
+        """Obtiene una página de facturas de un gimnasio (más recientes primero) por cursor"""
+        query = self.db.query(Factura).filter(Factura.gimnasio_id == gimnasio_id)
+        return self._paginate_after(query, after, limit, Factura.fecha_emision, order_desc=True)
+    
     def get_by_usuario(self, usuario_id: int, skip: int = 0, limit: int = 100) -> List[Factura]:
         """Obtiene facturas de un usuario"""
         return self.db.query(Factura).filter(Factura.usuario_id == usuario_id).offset(skip).limit(limit).all()
@@ -29,4 +36,87 @@ class FacturaRepository(BaseRepository[Factura]):
                 Factura.gimnasio_id == gimnasio_id,
                 Factura.estado == EstadoFacturaEnum.PENDIENTE
             )
-        ).all()
\ No newline at end of file
+        ).all()
+    
+    def resumen_por_estado_tipo(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Facturas de un gimnasio emitidas en el rango agrupadas por estado y tipo.
+        
+        Returns:
+            Filas (estado, tipo, cantidad, total) con total como Decimal
+        """
+        stmt = select(
+            Factura.estado,
+            Factura.tipo,
+            func.count(Factura.id).label("cantidad"),
+            func.coalesce(func.sum(Factura.total), 0).label("total"),
+        ).where(
+            Factura.gimnasio_id == gimnasio_id,
+            *half_open_range(Factura.fecha_emision, fecha_inicio, fecha_fin)
+        ).group_by(Factura.estado, Factura.tipo)
+        
+        return self.db.execute(stmt).all()
+    
+    def totales_por_dia(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Totales diarios de facturas de un gimnasio en el rango.
+        
+        Returns:
+            Filas (fecha, cantidad, facturado, pagado) ordenadas por fecha
+        """
+        dia = func.date(Factura.fecha_emision)
+        stmt = select(
+            dia.label("fecha"),
+            func.count(Factura.id).label("cantidad"),
+            func.coalesce(func.sum(Factura.total), 0).label("facturado"),
+            sum_if(Factura.total, Factura.estado == EstadoFacturaEnum.PAGADA).label("pagado"),
+        ).where(
+            Factura.gimnasio_id == gimnasio_id,
+            *half_open_range(Factura.fecha_emision, fecha_inicio, fecha_fin)
+        ).group_by(dia).order_by(dia)
+        
+        return self.db.execute(stmt).all()
+
+    def resumen_por_gimnasio_estado(self, gimnasio_ids: List[int], fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Facturas de varios gimnasios emitidas en el rango agrupadas por gimnasio y estado.
+        
+        Returns:
+            Filas (gimnasio_id, estado, cantidad, total)
+        """
+        stmt = select(
+            Factura.gimnasio_id,
+            Factura.estado,
+            func.count(Factura.id).label("cantidad"),
+            func.coalesce(func.sum(Factura.total), 0).label("total"),
+        ).where(
+            Factura.gimnasio_id.in_(gimnasio_ids),
+            *half_open_range(Factura.fecha_emision, fecha_inicio, fecha_fin)
+        ).group_by(Factura.gimnasio_id, Factura.estado)
+        
+        return self.db.execute(stmt).all()
+    
+    
+    def resumen_diario(self, fecha_inicio: date, fecha_fin: date, gimnasio_id: Optional[int] = None) -> List[Row]:
+        """
+        Facturas del rango agrupadas por gimnasio, día de emisión, tipo y estado
+        (origen de la reconstrucción de resumen_diario_ingresos).
+        
+        Returns:
+            Filas (gimnasio_id, fecha, tipo, estado, cantidad, total)
+        """
+        dia = func.date(Factura.fecha_emision)
+        stmt = select(
+            Factura.gimnasio_id,
+            dia.label("fecha"),
+            Factura.tipo,
+            Factura.estado,
+            func.count(Factura.id).label("cantidad"),
+            func.coalesce(func.sum(Factura.total), 0).label("total"),
+        ).where(
+            *half_open_range(Factura.fecha_emision, fecha_inicio, fecha_fin)
+        ).group_by(Factura.gimnasio_id, dia, Factura.tipo, Factura.estado)
+        if gimnasio_id is not None:
+            stmt = stmt.where(Factura.gimnasio_id == gimnasio_id)
+        
+        return self.db.execute(stmt).all()
@@ -1,8 +1,12 @@
 """Repository de Gimnasio"""
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.gimnasio import Gimnasio
 from app.repositories.base import BaseRepository
+from app.repositories.async_base import AsyncBaseRepository
 
 class GimnasioRepository(BaseRepository[Gimnasio]):
     def __init__(self, db: Session):
@@ -18,4 +22,28 @@ class GimnasioRepository(BaseRepository[Gimnasio]):
     
     def get_activos(self, skip: int = 0, limit: int = 100):
         """Obtiene gimnasios activos"""
-        return self.db.query(Gimnasio).filter(Gimnasio.activo == True).offset(skip).limit(limit).all()
\ No newline at end of file
+        return self.db.query(Gimnasio).filter(Gimnasio.activo == True).offset(skip).limit(limit).all()
+    
+    def get_nombres(self, ids: Optional[List[int]] = None) -> List[Row]:
+        """
+        Id y nombre de los gimnasios indicados (por defecto: todos los activos), ordenados por id.
+        
+        Returns:
+            Filas (id, nombre)
+        """
+        stmt = select(Gimnasio.id, Gimnasio.nombre).order_by(Gimnasio.id)
+        if ids is None:
+            stmt = stmt.where(Gimnasio.activo == True)
+        else:
+            stmt = stmt.where(Gimnasio.id.in_(ids))
+        return self.db.execute(stmt).all()
+
+
+class AsyncGimnasioRepository(AsyncBaseRepository[Gimnasio]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Gimnasio, db)
+    
+    async def get_by_codigo(self, codigo_unico: str) -> Optional[Gimnasio]:
+        """Obtiene gimnasio por código único"""
+        result = await self.db.execute(select(Gimnasio).where(Gimnasio.codigo_unico == codigo_unico))
+        return result.scalars().first()
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Repository de Job"""
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from app.models.job import Job
+from app.core.constants import EstadoJobEnum
+from app.repositories.base import BaseRepository
+
+class JobRepository(BaseRepository[Job]):
+    def __init__(self, db: Session):
+        super().__init__(Job, db)
+    
+    def get_by_gimnasio(self, job_id: int, gimnasio_id: int) -> Optional[Job]:
+        """Obtiene un job solo si pertenece al gimnasio"""
+        return self.db.query(Job).filter(Job.id == job_id, Job.gimnasio_id == gimnasio_id).first()
+    
+    def tomar_siguiente(self, worker_id: str) -> Optional[Job]:
+        """
+        Reserva el job pendiente más antiguo para un worker.
+        
+        El UPDATE solo aplica si el job sigue pendiente, así que dos workers
+        (hilos o procesos) nunca toman el mismo; el que pierde prueba con el
+        siguiente. No requiere `SELECT ... FOR UPDATE SKIP LOCKED`, que SQLite no tiene.
+        
+        Returns:
+            Job reservado (EN_PROCESO) o None si no hay pendientes
+        """
+        while True:
+            job_id = self.db.execute(
+                select(Job.id).where(
+                    Job.estado == EstadoJobEnum.PENDIENTE
+                ).order_by(Job.fecha_creacion, Job.id).limit(1)
+            ).scalar()
+            if job_id is None:
+                self._rollback()
+                return None
+            
+            result = self.db.execute(
+                update(Job).where(
+                    Job.id == job_id, Job.estado == EstadoJobEnum.PENDIENTE
+                ).values(
+                    estado=EstadoJobEnum.EN_PROCESO,
+                    worker_id=worker_id,
+                    fecha_inicio=datetime.utcnow(),
+                    intentos=Job.intentos + 1,
+                ).execution_options(synchronize_session=False)
+            )
+            self._commit()
+            if result.rowcount == 1:
+                job = self.db.get(Job, job_id, populate_existing=True)
+                # Cierra la transacción: la conexión no queda tomada mientras se genera el reporte
+                self._commit()
+                return job
+    
+    def liberar_abandonados(self, iniciado_antes: datetime, max_intentos: int) -> int:
+        """
+        Devuelve a la cola los jobs en proceso desde antes de `iniciado_antes`
+        (el worker murió o se reinició); los que agotaron los intentos fallan.
+        
+        Returns:
+            Número de jobs liberados o marcados como fallidos
+        """
+        abandonado = (Job.estado == EstadoJobEnum.EN_PROCESO) & (Job.fecha_inicio < iniciado_antes)
+        reintentos = self.db.execute(
+            update(Job).where(abandonado, Job.intentos < max_intentos).values(
+                estado=EstadoJobEnum.PENDIENTE, worker_id=None
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        fallidos = self.db.execute(
+            update(Job).where(abandonado, Job.intentos >= max_intentos).values(
+                estado=EstadoJobEnum.FALLIDO,
+                error="El worker no terminó el job",
+                fecha_fin=datetime.utcnow(),
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        self._commit()
+        return reintentos + fallidos
+    
+    def get_expirados(self, ahora: datetime, limit: int = 100) -> List[Job]:
+        """Jobs terminados cuya retención venció y aún tienen archivo"""
+        return self.db.query(Job).filter(
+            Job.estado == EstadoJobEnum.COMPLETADO,
+            Job.fecha_expiracion <= ahora
+        ).order_by(Job.fecha_expiracion).limit(limit).all()
@@ -1,25 +1,37 @@
 """Repository de Membresía"""
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from datetime import date
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_, select, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.membresia import Membresia
+from app.models.usuario import Usuario
+from app.models.membresia_tipo import MembresiaTipo
 from app.core.constants import EstadoMembresiaEnum
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, count_if, STREAM_BATCH_SIZE
+from app.repositories.async_base import AsyncBaseRepository
 
 class MembresiaRepository(BaseRepository[Membresia]):
-    def __init__(self, db: Session):
-        super().__init__(Membresia, db)
+    loader_profiles = {
+        "list": [joinedload(Membresia.membresia_tipo)],
+        "detail": [joinedload(Membresia.membresia_tipo), joinedload(Membresia.usuario)],
+        # Los reportes solo agregan columnas propias de la membresía
+        "report": [],
+    }
+    
+    def __init__(self, db: Session, profile: Optional[str] = None):
+        super().__init__(Membresia, db, profile)
     
     def get_by_usuario(self, usuario_id: int, skip: int = 0, limit: int = 100) -> List[Membresia]:
         """Obtiene membresías de un usuario"""
-        return self.db.query(Membresia).filter(
+        return self._query().filter(
             Membresia.usuario_id == usuario_id
         ).offset(skip).limit(limit).all()
     
     def get_activa_usuario(self, usuario_id: int) -> Optional[Membresia]:
         """Obtiene membresía activa actual de un usuario"""
-        return self.db.query(Membresia).filter(
+        return self._query().filter(
             and_(
                 Membresia.usuario_id == usuario_id,
                 Membresia.estado == EstadoMembresiaEnum.ACTIVA,
@@ -31,7 +43,7 @@ class MembresiaRepository(BaseRepository[Membresia]):
     def get_proximas_vencer(self, dias: int = 7) -> List[Membresia]:
         """Obtiene membresías que vencen en los próximos N días"""
         fecha_limite = date.today() + timedelta(days=dias)
-        return self.db.query(Membresia).filter(
+        return self._query().filter(
             and_(
                 Membresia.estado == EstadoMembresiaEnum.ACTIVA,
                 Membresia.fecha_fin <= fecha_limite,
@@ -39,13 +51,110 @@ class MembresiaRepository(BaseRepository[Membresia]):
             )
         ).all()
     
+    def _condicion_proximas_vencer(self, dias: int):
+        """Membresías activas cuya fecha de fin cae entre hoy y hoy + N días"""
+        hoy = date.today()
+        return and_(
+            Membresia.estado == EstadoMembresiaEnum.ACTIVA,
+            Membresia.fecha_fin >= hoy,
+            Membresia.fecha_fin <= hoy + timedelta(days=dias)
+        )
+    
+    def count_proximas_vencer(self, gimnasio_id: int, dias: int = 7) -> int:
+        """Cuenta las membresías de un gimnasio que vencen en los próximos N días"""
+        stmt = select(func.count(Membresia.id)).join(Membresia.usuario).where(
+            Usuario.gimnasio_id == gimnasio_id,
+            self._condicion_proximas_vencer(dias)
+        )
+        return self.db.execute(stmt).scalar_one()
+    
+    def resumen_por_estado(self, gimnasio_id: int, dias_proximas_vencer: int = 7) -> Row:
+        """
+        Conteos de membresías de un gimnasio en una sola query.
+        
+        Returns:
+            Fila con: total, activas, vencidas, canceladas, proximas_vencer
+        """
+        stmt = select(
+            func.count(Membresia.id).label("total"),
+            count_if(Membresia.estado == EstadoMembresiaEnum.ACTIVA).label("activas"),
+            count_if(Membresia.estado == EstadoMembresiaEnum.VENCIDA).label("vencidas"),
+            count_if(Membresia.estado == EstadoMembresiaEnum.CANCELADA).label("canceladas"),
+            count_if(self._condicion_proximas_vencer(dias_proximas_vencer)).label("proximas_vencer"),
+        ).join(Membresia.usuario).where(
+            Usuario.gimnasio_id == gimnasio_id
+        )
+        return self.db.execute(stmt).one()
+    
+    def resumen_por_gimnasio(self, gimnasio_ids: List[int], dias_proximas_vencer: int = 7) -> List[Row]:
+        """
+        Conteos de membresías de varios gimnasios agrupados por gimnasio, en una sola query.
+        
+        Returns:
+            Una fila por gimnasio con: gimnasio_id, total, activas, vencidas, canceladas, proximas_vencer
+        """
+        stmt = select(
+            Usuario.gimnasio_id,
+            func.count(Membresia.id).label("total"),
+            count_if(Membresia.estado == EstadoMembresiaEnum.ACTIVA).label("activas"),
+            count_if(Membresia.estado == EstadoMembresiaEnum.VENCIDA).label("vencidas"),
+            count_if(Membresia.estado == EstadoMembresiaEnum.CANCELADA).label("canceladas"),
+            count_if(self._condicion_proximas_vencer(dias_proximas_vencer)).label("proximas_vencer"),
+        ).join(Membresia.usuario).where(
+            Usuario.gimnasio_id.in_(gimnasio_ids)
+        ).group_by(Usuario.gimnasio_id)
+        return self.db.execute(stmt).all()
+    
+    def iter_by_gimnasio(self, gimnasio_id: int, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Row]:
+        """
+        Recorre las membresías de un gimnasio con el cliente y el tipo, sin
+        cargarlas en memoria (exportaciones).
+        
+        Returns:
+            Iterador de filas (id, usuario_id, usuario_nombre, usuario_email, membresia_tipo,
+            fecha_inicio, fecha_fin, estado, precio_pagado)
+        """
+        stmt = select(
+            Membresia.id,
+            Membresia.usuario_id,
+            (Usuario.nombre + " " + Usuario.apellido).label("usuario_nombre"),
+            Usuario.email.label("usuario_email"),
+            MembresiaTipo.nombre.label("membresia_tipo"),
+            Membresia.fecha_inicio,
+            Membresia.fecha_fin,
+            Membresia.estado,
+            Membresia.precio_pagado,
+        ).join(Membresia.usuario).join(Membresia.membresia_tipo).where(
+            Usuario.gimnasio_id == gimnasio_id
+        ).order_by(Membresia.id)
+        return self._stream(stmt, batch_size)
+    
     def get_vencidas(self) -> List[Membresia]:
         """Obtiene membresías vencidas que aún están marcadas como activas"""
-        return self.db.query(Membresia).filter(
+        return self._query().filter(
             and_(
                 Membresia.estado == EstadoMembresiaEnum.ACTIVA,
                 Membresia.fecha_fin < date.today()
             )
         ).all()
 
+
+class AsyncMembresiaRepository(AsyncBaseRepository[Membresia]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Membresia, db)
+    
+    async def get_activa_usuario(self, usuario_id: int) -> Optional[Membresia]:
+        """Obtiene membresía activa actual de un usuario"""
+        result = await self.db.execute(
+            select(Membresia).where(
+                and_(
+                    Membresia.usuario_id == usuario_id,
+                    Membresia.estado == EstadoMembresiaEnum.ACTIVA,
+                    Membresia.fecha_inicio <= date.today(),
+                    Membresia.fecha_fin >= date.today()
+                )
+            ).limit(1)
+        )
+        return result.scalars().first()
+
 from datetime import timedelta
\ No newline at end of file
@@ -1,8 +1,12 @@
 """Repository de Notificación"""
-from typing import List
+from typing import List, Optional, Tuple
+from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.notificacion import Notificacion
 from app.repositories.base import BaseRepository
+from app.repositories.async_base import AsyncBaseRepository
 
 class NotificacionRepository(BaseRepository[Notificacion]):
     def __init__(self, db: Session):
@@ -15,6 +19,11 @@ class NotificacionRepository(BaseRepository[Notificacion]):
             query = query.filter(Notificacion.leida == leida)
         return query.order_by(Notificacion.fecha_creacion.desc()).offset(skip).limit(limit).all()
     
+    def get_page_by_usuario(self, usuario_id: int, after: Optional[str] = None, limit: int = 100) -> Tuple[List[Notificacion], Optional[str]]:
+        """Obtiene una página de notificaciones de un usuario (más recientes primero) por cursor"""
+        query = self.db.query(Notificacion).filter(Notificacion.usuario_id == usuario_id)
+        return self._paginate_after(query, after, limit, Notificacion.fecha_creacion, order_desc=True)
+    
     def get_no_leidas(self, usuario_id: int) -> List[Notificacion]:
         """Obtiene notificaciones no leídas de un usuario"""
         return self.get_by_usuario(usuario_id, leida=False)
@@ -36,5 +45,40 @@ class NotificacionRepository(BaseRepository[Notificacion]):
             "leida": True,
             "fecha_lectura": datetime.utcnow()
         })
-        self.db.commit()
-        return count
\ No newline at end of file
+        self._commit()
+        return count
+
+
+class AsyncNotificacionRepository(AsyncBaseRepository[Notificacion]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Notificacion, db)
+    
+    async def get_by_usuario(self, usuario_id: int, leida: bool = None, skip: int = 0, limit: int = 100) -> List[Notificacion]:
+        """Obtiene notificaciones de un usuario"""
+        stmt = select(Notificacion).where(Notificacion.usuario_id == usuario_id)
+        if leida is not None:
+            stmt = stmt.where(Notificacion.leida == leida)
+        result = await self.db.execute(
+            stmt.order_by(Notificacion.fecha_creacion.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_page_by_usuario(self, usuario_id: int, after: Optional[str] = None, limit: int = 100) -> Tuple[List[Notificacion], Optional[str]]:
+        """Obtiene una página de notificaciones de un usuario (más recientes primero) por cursor"""
+        stmt = select(Notificacion).where(Notificacion.usuario_id == usuario_id)
+        return await self._paginate_after(stmt, after, limit, Notificacion.fecha_creacion, order_desc=True)
+    
+    async def get_no_leidas(self, usuario_id: int) -> List[Notificacion]:
+        """Obtiene notificaciones no leídas de un usuario"""
+        return await self.get_by_usuario(usuario_id, leida=False)
+    
+    async def marcar_todas_leidas(self, usuario_id: int) -> int:
+        """Marca todas las notificaciones de un usuario como leídas"""
+        result = await self.db.execute(
+            update(Notificacion).where(
+                Notificacion.usuario_id == usuario_id,
+                Notificacion.leida == False
+            ).values(leida=True, fecha_lectura=datetime.utcnow())
+        )
+        await self.db.commit()
+        return result.rowcount
\ No newline at end of file
@@ -2,10 +2,12 @@
 from typing import List, Optional
 from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.reserva import Reserva
 from app.core.constants import EstadoReservaEnum
 from app.repositories.base import BaseRepository
+from app.repositories.async_base import AsyncBaseRepository
 
 class ReservaRepository(BaseRepository[Reserva]):
     def __init__(self, db: Session):
@@ -37,10 +39,28 @@ class ReservaRepository(BaseRepository[Reserva]):
     
     def tiene_reserva(self, usuario_id: int, clase_horario_id: int, fecha_reserva: date) -> bool:
         """Verifica si un usuario tiene reserva en un horario y fecha"""
-        return self.db.query(Reserva).filter(
-            and_(
-                Reserva.usuario_id == usuario_id,
-                Reserva.clase_horario_id == clase_horario_id,
-                Reserva.fecha_reserva == fecha_reserva
-            )
-        ).count() > 0
\ No newline at end of file
+        return self.exists_by_filters(
+            usuario_id=usuario_id,
+            clase_horario_id=clase_horario_id,
+            fecha_reserva=fecha_reserva
+        )
+
+
+class AsyncReservaRepository(AsyncBaseRepository[Reserva]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Reserva, db)
+    
+    async def get_by_usuario(self, usuario_id: int, skip: int = 0, limit: int = 100) -> List[Reserva]:
+        """Obtiene reservas de un usuario"""
+        result = await self.db.execute(
+            select(Reserva).where(Reserva.usuario_id == usuario_id).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def tiene_reserva(self, usuario_id: int, clase_horario_id: int, fecha_reserva: date) -> bool:
+        """Verifica si un usuario tiene reserva en un horario y fecha"""
+        return await self.exists_by_filters(
+            usuario_id=usuario_id,
+            clase_horario_id=clase_horario_id,
+            fecha_reserva=fecha_reserva
+        )
\ No newline at end of file
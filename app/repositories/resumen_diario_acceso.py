@@ -0,0 +1,99 @@
+"""Repository de ResumenDiarioAcceso"""
+from typing import List, Optional
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.resumen_diario_acceso import ResumenDiarioAcceso
+from app.repositories.base import BaseRepository
+from app.repositories.async_base import AsyncBaseRepository
+
+
+def _claves(gimnasio_id: int, fecha_hora_entrada: datetime) -> dict:
+    """Fila del resumen a la que pertenece una entrada"""
+    return {
+        "gimnasio_id": gimnasio_id,
+        "fecha": fecha_hora_entrada.date(),
+        "hora": fecha_hora_entrada.hour,
+    }
+
+
+class ResumenDiarioAccesoRepository(BaseRepository[ResumenDiarioAcceso]):
+    def __init__(self, db: Session):
+        super().__init__(ResumenDiarioAcceso, db)
+    
+    def registrar_entrada(self, gimnasio_id: int, fecha_hora_entrada: datetime, primera_del_dia: bool) -> None:
+        """Suma una entrada (y un usuario único si es su primera entrada del día)"""
+        self.increment(
+            _claves(gimnasio_id, fecha_hora_entrada),
+            {"entradas": 1, "usuarios_unicos": int(primera_del_dia)}
+        )
+    
+    def registrar_salida(self, gimnasio_id: int, fecha_hora_entrada: datetime, minutos: int) -> None:
+        """Suma una visita cerrada a la hora de su entrada"""
+        self.increment(
+            _claves(gimnasio_id, fecha_hora_entrada),
+            {"visitas_cerradas": 1, "minutos_estancia": minutos}
+        )
+    
+    def por_dia(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Totales diarios de un gimnasio en el rango (ambos días incluidos).
+        
+        Returns:
+            Filas (fecha, entradas, usuarios_unicos, visitas_cerradas, minutos_estancia)
+        """
+        stmt = select(
+            ResumenDiarioAcceso.fecha,
+            func.sum(ResumenDiarioAcceso.entradas).label("entradas"),
+            func.sum(ResumenDiarioAcceso.usuarios_unicos).label("usuarios_unicos"),
+            func.sum(ResumenDiarioAcceso.visitas_cerradas).label("visitas_cerradas"),
+            func.sum(ResumenDiarioAcceso.minutos_estancia).label("minutos_estancia"),
+        ).where(
+            ResumenDiarioAcceso.gimnasio_id == gimnasio_id,
+            ResumenDiarioAcceso.fecha >= fecha_inicio,
+            ResumenDiarioAcceso.fecha <= fecha_fin
+        ).group_by(ResumenDiarioAcceso.fecha).order_by(ResumenDiarioAcceso.fecha)
+        
+        return self.db.execute(stmt).all()
+    
+    def reemplazar_rango(
+        self,
+        filas: List[dict],
+        fecha_inicio: date,
+        fecha_fin: date,
+        gimnasio_id: Optional[int] = None
+    ) -> int:
+        """
+        Sustituye el resumen de un rango de fechas por `filas` (reconstrucción).
+        
+        Returns:
+            Número de filas insertadas
+        """
+        conditions = [
+            ResumenDiarioAcceso.fecha >= fecha_inicio,
+            ResumenDiarioAcceso.fecha <= fecha_fin
+        ]
+        if gimnasio_id is not None:
+            conditions.append(ResumenDiarioAcceso.gimnasio_id == gimnasio_id)
+        return self.replace_where(filas, *conditions)
+
+
+class AsyncResumenDiarioAccesoRepository(AsyncBaseRepository[ResumenDiarioAcceso]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(ResumenDiarioAcceso, db)
+    
+    async def registrar_entrada(self, gimnasio_id: int, fecha_hora_entrada: datetime, primera_del_dia: bool) -> None:
+        """Suma una entrada (y un usuario único si es su primera entrada del día)"""
+        await self.increment(
+            _claves(gimnasio_id, fecha_hora_entrada),
+            {"entradas": 1, "usuarios_unicos": int(primera_del_dia)}
+        )
+    
+    async def registrar_salida(self, gimnasio_id: int, fecha_hora_entrada: datetime, minutos: int) -> None:
+        """Suma una visita cerrada a la hora de su entrada"""
+        await self.increment(
+            _claves(gimnasio_id, fecha_hora_entrada),
+            {"visitas_cerradas": 1, "minutos_estancia": minutos}
+        )
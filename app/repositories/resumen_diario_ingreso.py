@@ -0,0 +1,121 @@
+"""Repository de ResumenDiarioIngreso"""
+from typing import List, Optional
+from datetime import date
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+from app.models.factura import Factura
+from app.models.resumen_diario_ingreso import ResumenDiarioIngreso
+from app.core.constants import EstadoFacturaEnum
+from app.repositories.base import BaseRepository, sum_if
+
+class ResumenDiarioIngresoRepository(BaseRepository[ResumenDiarioIngreso]):
+    def __init__(self, db: Session):
+        super().__init__(ResumenDiarioIngreso, db)
+    
+    def _sumar(self, factura: Factura, estado: EstadoFacturaEnum, signo: int) -> None:
+        """Suma (signo=1) o resta (signo=-1) una factura en la fila de su día, tipo y estado"""
+        self.increment(
+            {
+                "gimnasio_id": factura.gimnasio_id,
+                "fecha": factura.fecha_emision.date(),
+                "tipo": factura.tipo,
+                "estado": estado,
+            },
+            {"cantidad": signo, "total": signo * factura.total}
+        )
+    
+    def registrar_factura(self, factura: Factura) -> None:
+        """Agrega una factura nueva al resumen"""
+        self._sumar(factura, factura.estado, 1)
+    
+    def cambiar_estado(self, factura: Factura, estado_anterior: EstadoFacturaEnum) -> None:
+        """Mueve una factura de la fila de su estado anterior a la de su estado actual"""
+        if estado_anterior == factura.estado:
+            return
+        self._sumar(factura, estado_anterior, -1)
+        self._sumar(factura, factura.estado, 1)
+    
+    def _filtro(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> list:
+        return [
+            ResumenDiarioIngreso.gimnasio_id == gimnasio_id,
+            ResumenDiarioIngreso.fecha >= fecha_inicio,
+            ResumenDiarioIngreso.fecha <= fecha_fin
+        ]
+    
+    def resumen_por_estado_tipo(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Mismo resultado que FacturaRepository.resumen_por_estado_tipo, leído del resumen.
+        
+        Returns:
+            Filas (estado, tipo, cantidad, total)
+        """
+        stmt = select(
+            ResumenDiarioIngreso.estado,
+            ResumenDiarioIngreso.tipo,
+            func.sum(ResumenDiarioIngreso.cantidad).label("cantidad"),
+            func.coalesce(func.sum(ResumenDiarioIngreso.total), 0).label("total"),
+        ).where(
+            *self._filtro(gimnasio_id, fecha_inicio, fecha_fin)
+        ).group_by(ResumenDiarioIngreso.estado, ResumenDiarioIngreso.tipo)
+        
+        return self.db.execute(stmt).all()
+    
+    def totales_por_dia(self, gimnasio_id: int, fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Mismo resultado que FacturaRepository.totales_por_dia, leído del resumen.
+        
+        Returns:
+            Filas (fecha, cantidad, facturado, pagado) ordenadas por fecha
+        """
+        stmt = select(
+            ResumenDiarioIngreso.fecha,
+            func.sum(ResumenDiarioIngreso.cantidad).label("cantidad"),
+            func.coalesce(func.sum(ResumenDiarioIngreso.total), 0).label("facturado"),
+            sum_if(ResumenDiarioIngreso.total, ResumenDiarioIngreso.estado == EstadoFacturaEnum.PAGADA).label("pagado"),
+        ).where(
+            *self._filtro(gimnasio_id, fecha_inicio, fecha_fin)
+        ).group_by(ResumenDiarioIngreso.fecha).order_by(ResumenDiarioIngreso.fecha)
+        
+        return self.db.execute(stmt).all()
+    
+    def resumen_por_gimnasio_estado(self, gimnasio_ids: List[int], fecha_inicio: date, fecha_fin: date) -> List[Row]:
+        """
+        Mismo resultado que FacturaRepository.resumen_por_gimnasio_estado, leído del resumen.
+        
+        Returns:
+            Filas (gimnasio_id, estado, cantidad, total)
+        """
+        stmt = select(
+            ResumenDiarioIngreso.gimnasio_id,
+            ResumenDiarioIngreso.estado,
+            func.sum(ResumenDiarioIngreso.cantidad).label("cantidad"),
+            func.coalesce(func.sum(ResumenDiarioIngreso.total), 0).label("total"),
+        ).where(
+            ResumenDiarioIngreso.gimnasio_id.in_(gimnasio_ids),
+            ResumenDiarioIngreso.fecha >= fecha_inicio,
+            ResumenDiarioIngreso.fecha <= fecha_fin
+        ).group_by(ResumenDiarioIngreso.gimnasio_id, ResumenDiarioIngreso.estado)
+        
+        return self.db.execute(stmt).all()
+    
+    def reemplazar_rango(
+        self,
+        filas: List[dict],
+        fecha_inicio: date,
+        fecha_fin: date,
+        gimnasio_id: Optional[int] = None
+    ) -> int:
+        """
+        Sustituye el resumen de un rango de fechas por `filas` (reconstrucción).
+        
+        Returns:
+            Número de filas insertadas
+        """
+        conditions = [
+            ResumenDiarioIngreso.fecha >= fecha_inicio,
+            ResumenDiarioIngreso.fecha <= fecha_fin
+        ]
+        if gimnasio_id is not None:
+            conditions.append(ResumenDiarioIngreso.gimnasio_id == gimnasio_id)
+        return self.replace_where(filas, *conditions)
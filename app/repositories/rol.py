@@ -1,8 +1,11 @@
 """Repository de Rol"""
 from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.rol import Rol
 from app.repositories.base import BaseRepository
+from app.repositories.async_base import AsyncBaseRepository
 
 class RolRepository(BaseRepository[Rol]):
     def __init__(self, db: Session):
@@ -10,4 +13,14 @@ class RolRepository(BaseRepository[Rol]):
     
     def get_by_nombre(self, nombre: str) -> Optional[Rol]:
         """Obtiene rol por nombre"""
-        return self.db.query(Rol).filter(Rol.nombre == nombre).first()
\ No newline at end of file
+        return self.db.query(Rol).filter(Rol.nombre == nombre).first()
+
+
+class AsyncRolRepository(AsyncBaseRepository[Rol]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Rol, db)
+    
+    async def get_by_nombre(self, nombre: str) -> Optional[Rol]:
+        """Obtiene rol por nombre"""
+        result = await self.db.execute(select(Rol).where(Rol.nombre == nombre))
+        return result.scalars().first()
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""Repository de TokenRevocado"""
+from typing import List
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Row
+from app.models.token_revocado import TokenRevocado
+from app.repositories.base import BaseRepository
+
+# Columnas que necesita la copia en memoria de cada worker
+COLUMNAS_REVOCACION = (
+    TokenRevocado.id,
+    TokenRevocado.jti,
+    TokenRevocado.usuario_id,
+    TokenRevocado.revocado_desde,
+    TokenRevocado.fecha_expiracion,
+)
+
+class TokenRevocadoRepository(BaseRepository[TokenRevocado]):
+    def __init__(self, db: Session):
+        super().__init__(TokenRevocado, db)
+    
+    def get_desde(self, ultimo_id: int, limit: int = 1000) -> List[Row]:
+        """Revocaciones con id posterior a `ultimo_id` (delta de sincronización), en orden de id"""
+        stmt = select(*COLUMNAS_REVOCACION).where(
+            TokenRevocado.id > ultimo_id
+        ).order_by(TokenRevocado.id).limit(limit)
+        return self.db.execute(stmt).all()
+    
+    def get_vigentes(self, ahora: datetime) -> List[Row]:
+        """Revocaciones que aún afectan a algún token (recarga completa)"""
+        stmt = select(*COLUMNAS_REVOCACION).where(
+            TokenRevocado.fecha_expiracion > ahora
+        ).order_by(TokenRevocado.id)
+        return self.db.execute(stmt).all()
+    
+    def eliminar_expirados(self, ahora: datetime) -> int:
+        """Borra las revocaciones cuyos tokens ya expiraron"""
+        result = self.db.execute(
+            delete(TokenRevocado).where(TokenRevocado.fecha_expiracion <= ahora)
+        )
+        self._commit()
+        return result.rowcount
@@ -1,25 +1,41 @@
 """Repository de Usuario"""
 from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, select, func, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.usuario import Usuario
-from app.repositories.base import BaseRepository
+from app.models.rol import Rol
+from app.core.constants import GeneroEnum, RolEnum
+from app.repositories.base import BaseRepository, count_if
+from app.repositories.async_base import AsyncBaseRepository
 
 class UsuarioRepository(BaseRepository[Usuario]):
-    def __init__(self, db: Session):
-        super().__init__(Usuario, db)
+    loader_profiles = {
+        "list": [joinedload(Usuario.rol)],
+        "detail": [joinedload(Usuario.rol), joinedload(Usuario.gimnasio)],
+        # Miles de filas: una query IN por relación en lugar de un JOIN por fila
+        "report": [selectinload(Usuario.rol)],
+    }
+    
+    column_expressions = {
+        "rol_nombre": select(Rol.nombre).where(Rol.id == Usuario.rol_id).scalar_subquery(),
+    }
+    
+    def __init__(self, db: Session, profile: Optional[str] = None):
+        super().__init__(Usuario, db, profile)
     
     def get_by_email(self, email: str) -> Optional[Usuario]:
         """Obtiene usuario por email"""
-        return self.db.query(Usuario).filter(Usuario.email == email).first()
+        return self._query().filter(Usuario.email == email).first()
     
     def get_by_gimnasio(self, gimnasio_id: int, skip: int = 0, limit: int = 100) -> List[Usuario]:
         """Obtiene usuarios de un gimnasio"""
-        return self.db.query(Usuario).filter(Usuario.gimnasio_id == gimnasio_id).offset(skip).limit(limit).all()
+        return self._query().filter(Usuario.gimnasio_id == gimnasio_id).offset(skip).limit(limit).all()
     
     def get_by_rol(self, gimnasio_id: int, rol_nombre: str, skip: int = 0, limit: int = 100) -> List[Usuario]:
         """Obtiene usuarios por rol en un gimnasio"""
-        return self.db.query(Usuario).join(Usuario.rol).filter(
+        return self._query().join(Usuario.rol).filter(
             and_(Usuario.gimnasio_id == gimnasio_id, Usuario.rol.has(nombre=rol_nombre))
         ).offset(skip).limit(limit).all()
     
@@ -33,6 +49,98 @@ class UsuarioRepository(BaseRepository[Usuario]):
     
     def get_activos(self, gimnasio_id: int, skip: int = 0, limit: int = 100) -> List[Usuario]:
         """Obtiene usuarios activos de un gimnasio"""
-        return self.db.query(Usuario).filter(
+        return self._query().filter(
             and_(Usuario.gimnasio_id == gimnasio_id, Usuario.activo == True)
-        ).offset(skip).limit(limit).all()
\ No newline at end of file
+        ).offset(skip).limit(limit).all()
+    
+    def get_estado(self, usuario_id: int) -> Optional[Row]:
+        """
+        Estado del usuario para autorizar un request, sin cargar el modelo.
+        
+        Returns:
+            Fila (activo, rol, gimnasio_id) o None si no existe
+        """
+        stmt = select(
+            Usuario.activo,
+            Rol.nombre.label("rol"),
+            Usuario.gimnasio_id,
+        ).outerjoin(Usuario.rol).where(Usuario.id == usuario_id)
+        
+        return self.db.execute(stmt).first()
+    
+    def resumen_por_rol(self, gimnasio_id: int) -> List[Row]:
+        """
+        Conteos de usuarios de un gimnasio agrupados por rol, en una sola query.
+        
+        Returns:
+            Una fila por rol con: rol, total, activos, masculino, femenino, otro, sin_genero
+        """
+        stmt = select(
+            Rol.nombre.label("rol"),
+            func.count(Usuario.id).label("total"),
+            count_if(Usuario.activo == True).label("activos"),
+            count_if(Usuario.genero == GeneroEnum.MASCULINO).label("masculino"),
+            count_if(Usuario.genero == GeneroEnum.FEMENINO).label("femenino"),
+            count_if(Usuario.genero == GeneroEnum.OTRO).label("otro"),
+            count_if(Usuario.genero.is_(None)).label("sin_genero"),
+        ).join(Usuario.rol).where(
+            Usuario.gimnasio_id == gimnasio_id
+        ).group_by(Rol.nombre)
+        
+        return self.db.execute(stmt).all()
+
+    def resumen_por_gimnasio(self, gimnasio_ids: List[int]) -> List[Row]:
+        """
+        Conteos de usuarios de varios gimnasios agrupados por gimnasio, en una sola query.
+        
+        Returns:
+            Una fila por gimnasio con: gimnasio_id, total, activos, clientes
+        """
+        stmt = select(
+            Usuario.gimnasio_id,
+            func.count(Usuario.id).label("total"),
+            count_if(Usuario.activo == True).label("activos"),
+            count_if(Rol.nombre == RolEnum.CLIENTE.value).label("clientes"),
+        ).join(Usuario.rol).where(
+            Usuario.gimnasio_id.in_(gimnasio_ids)
+        ).group_by(Usuario.gimnasio_id)
+        
+        return self.db.execute(stmt).all()
+
+
+class AsyncUsuarioRepository(AsyncBaseRepository[Usuario]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(Usuario, db)
+    
+    async def get_by_email(self, email: str) -> Optional[Usuario]:
+        """Obtiene usuario por email con su rol"""
+        result = await self.db.execute(
+            select(Usuario).options(selectinload(Usuario.rol)).where(Usuario.email == email)
+        )
+        return result.scalars().first()
+    
+    async def get_estado(self, usuario_id: int) -> Optional[Row]:
+        """Estado del usuario para autorizar un request (activo, rol, gimnasio_id), sin cargar el modelo"""
+        stmt = select(
+            Usuario.activo,
+            Rol.nombre.label("rol"),
+            Usuario.gimnasio_id,
+        ).outerjoin(Usuario.rol).where(Usuario.id == usuario_id)
+        
+        return (await self.db.execute(stmt)).first()
+    
+    async def actualizar_password_hash(self, usuario_id: int, hash_actual: str, hash_nuevo: str) -> bool:
+        """
+        Reemplaza el hash de la contraseña solo si sigue siendo `hash_actual`
+        (rehash tras login: no pisa un cambio de contraseña concurrente).
+        
+        Returns:
+            True si se actualizó
+        """
+        result = await self.db.execute(
+            update(Usuario).where(
+                Usuario.id == usuario_id, Usuario.password_hash == hash_actual
+            ).values(password_hash=hash_nuevo).execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        return result.rowcount == 1
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Schemas de Job (reportes en segundo plano)"""
+from datetime import date, datetime
+from typing import Any, Literal
+from pydantic import BaseModel, ConfigDict, model_validator
+from app.core.config import settings
+from app.core.constants import EstadoJobEnum
+
+TipoReporteJob = Literal[
+    "usuarios", "membresias", "asistencia", "financiero", "clases", "inventario", "dashboard"
+]
+FormatoJob = Literal["json", "pdf", "csv", "xlsx"]
+
+class JobCreate(BaseModel):
+    """Schema para pedir un reporte en segundo plano"""
+    tipo: TipoReporteJob
+    formato: FormatoJob = "pdf"
+    fecha_inicio: date | None = None
+    fecha_fin: date | None = None
+    granularity: Literal["day", "week", "month"] | None = None
+    
+    def parametros(self) -> dict:
+        """Argumentos del reporte que se guardan con el job"""
+        return self.model_dump(mode="json", exclude={"tipo", "formato"}, exclude_none=True)
+
+class JobResponse(BaseModel):
+    """Schema de respuesta de job"""
+    id: int
+    gimnasio_id: int
+    tipo: str
+    formato: str
+    parametros: dict[str, Any] | None = None
+    estado: EstadoJobEnum
+    intentos: int
+    error: str | None = None
+    tamano_bytes: int | None = None
+    fecha_creacion: datetime
+    fecha_inicio: datetime | None = None
+    fecha_fin: datetime | None = None
+    fecha_expiracion: datetime | None = None
+    download_url: str | None = None
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    @model_validator(mode="after")
+    def completar_derivados(self):
+        """URL de descarga cuando el archivo está disponible"""
+        if self.estado == EstadoJobEnum.COMPLETADO and self.download_url is None:
+            self.download_url = f"{settings.API_V1_PREFIX}/reportes/jobs/{self.id}/download"
+        return self
@@ -1,7 +1,8 @@
 """Schemas de Usuario"""
 from datetime import datetime, date
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, model_validator
 from app.core.constants import GeneroEnum
+from app.utils.date_utils import calcular_edad
 
 class UsuarioBase(BaseModel):
     nombre: str = Field(..., min_length=2, max_length=100)
@@ -45,6 +46,15 @@ class UsuarioResponse(UsuarioBase):
     fecha_actualizacion: datetime
     
     model_config = ConfigDict(from_attributes=True)
+    
+    @model_validator(mode="after")
+    def completar_derivados(self):
+        """Completa los campos derivados al validar desde una proyección de columnas"""
+        if self.nombre_completo is None:
+            self.nombre_completo = f"{self.nombre} {self.apellido}"
+        if self.edad is None and self.fecha_nacimiento:
+            self.edad = calcular_edad(self.fecha_nacimiento)
+        return self
 
 class UsuarioDetail(UsuarioResponse):
     """Schema detallado de usuario con relaciones"""
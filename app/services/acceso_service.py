@@ -1,11 +1,15 @@
 """Service de Acceso"""
-from datetime import datetime
+from datetime import datetime, time
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from app.repositories.acceso import AccesoRepository
-from app.repositories.usuario import UsuarioRepository
-from app.repositories.membresia import MembresiaRepository
+from app.core.database import UnitOfWork, AsyncUnitOfWork
+from app.repositories.acceso import AccesoRepository, AsyncAccesoRepository
+from app.repositories.resumen_diario_acceso import ResumenDiarioAccesoRepository, AsyncResumenDiarioAccesoRepository
+from app.repositories.usuario import UsuarioRepository, AsyncUsuarioRepository
+from app.repositories.membresia import MembresiaRepository, AsyncMembresiaRepository
 from app.schemas.acceso import RegistrarEntrada, RegistrarSalida
+from app.services.reporte_service import invalidar_reportes, REPORTES_ASISTENCIA
 from app.core.constants import TipoAccesoEnum
 
 class AccesoService:
@@ -14,6 +18,7 @@ class AccesoService:
         self.repo = AccesoRepository(db)
         self.usuario_repo = UsuarioRepository(db)
         self.membresia_repo = MembresiaRepository(db)
+        self.resumen_repo = ResumenDiarioAccesoRepository(db)
     
     def registrar_entrada(self, data: RegistrarEntrada, gimnasio_id: int):
         # Verificar usuario
@@ -41,15 +46,24 @@ class AccesoService:
                 detail="El usuario ya tiene una entrada sin salida registrada"
             )
         
-        # Registrar entrada
+        # Registrar entrada y actualizar el resumen diario en la misma transacción
+        ahora = datetime.now()
+        primera_del_dia = not self.repo.tiene_entrada_desde(
+            data.usuario_id, gimnasio_id, datetime.combine(ahora.date(), time.min)
+        )
         acceso_data = {
             "usuario_id": data.usuario_id,
             "gimnasio_id": gimnasio_id,
-            "fecha_hora_entrada": datetime.now(),
+            "fecha_hora_entrada": ahora,
             "tipo_acceso": data.tipo_acceso
         }
         
-        return self.repo.create(acceso_data)
+        with UnitOfWork(self.db):
+            acceso = self.repo.create(acceso_data)
+            self.resumen_repo.registrar_entrada(gimnasio_id, ahora, primera_del_dia)
+        
+        invalidar_reportes(gimnasio_id, *REPORTES_ASISTENCIA)
+        return acceso
     
     def registrar_salida(self, data: RegistrarSalida):
         # Buscar acceso abierto
@@ -60,11 +74,98 @@ class AccesoService:
                 detail="No se encontró entrada sin salida para este usuario"
             )
         
-        # Registrar salida
-        return self.repo.update(acceso.id, {"fecha_hora_salida": datetime.now()})
+        # Registrar salida (la estancia se suma a la hora de entrada en el resumen)
+        with UnitOfWork(self.db):
+            acceso = self.repo.update(acceso.id, {"fecha_hora_salida": datetime.now()})
+            self.resumen_repo.registrar_salida(acceso.gimnasio_id, acceso.fecha_hora_entrada, acceso.duracion_minutos)
+        
+        invalidar_reportes(acceso.gimnasio_id, *REPORTES_ASISTENCIA)
+        return acceso
     
     def get_usuarios_en_gimnasio(self, gimnasio_id: int):
         return self.repo.get_usuarios_en_gimnasio(gimnasio_id)
     
     def get_by_usuario(self, usuario_id: int, skip: int = 0, limit: int = 100):
-        return self.repo.get_by_usuario(usuario_id, skip, limit)
\ No newline at end of file
+        return self.repo.get_by_usuario(usuario_id, skip, limit)
+
+
+class AsyncAccesoService:
+    """Versión asíncrona de AccesoService para el router de accesos (check-in/out)"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = AsyncAccesoRepository(db)
+        self.usuario_repo = AsyncUsuarioRepository(db)
+        self.membresia_repo = AsyncMembresiaRepository(db)
+        self.resumen_repo = AsyncResumenDiarioAccesoRepository(db)
+    
+    async def registrar_entrada(self, data: RegistrarEntrada, gimnasio_id: int):
+        # Verificar usuario
+        usuario = await self.usuario_repo.get_by_id(data.usuario_id)
+        if not usuario:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
+        
+        # Verificar que pertenezca al gimnasio
+        if usuario.gimnasio_id != gimnasio_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario no pertenece a este gimnasio")
+        
+        # Verificar membresía activa
+        membresia_activa = await self.membresia_repo.get_activa_usuario(data.usuario_id)
+        if not membresia_activa:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El usuario no tiene una membresía activa"
+            )
+        
+        # Verificar si ya tiene acceso abierto
+        acceso_abierto = await self.repo.get_acceso_abierto(data.usuario_id)
+        if acceso_abierto:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El usuario ya tiene una entrada sin salida registrada"
+            )
+        
+        # Registrar entrada y actualizar el resumen diario en la misma transacción
+        ahora = datetime.now()
+        primera_del_dia = not await self.repo.tiene_entrada_desde(
+            data.usuario_id, gimnasio_id, datetime.combine(ahora.date(), time.min)
+        )
+        acceso_data = {
+            "usuario_id": data.usuario_id,
+            "gimnasio_id": gimnasio_id,
+            "fecha_hora_entrada": ahora,
+            "tipo_acceso": data.tipo_acceso
+        }
+        
+        async with AsyncUnitOfWork(self.db):
+            acceso = await self.repo.create(acceso_data)
+            await self.resumen_repo.registrar_entrada(gimnasio_id, ahora, primera_del_dia)
+        
+        invalidar_reportes(gimnasio_id, *REPORTES_ASISTENCIA)
+        return acceso
+    
+    async def registrar_salida(self, data: RegistrarSalida):
+        # Buscar acceso abierto
+        acceso = await self.repo.get_acceso_abierto(data.usuario_id)
+        if not acceso:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No se encontró entrada sin salida para este usuario"
+            )
+        
+        # Registrar salida (la estancia se suma a la hora de entrada en el resumen)
+        async with AsyncUnitOfWork(self.db):
+            acceso = await self.repo.update(acceso.id, {"fecha_hora_salida": datetime.now()})
+            await self.resumen_repo.registrar_salida(acceso.gimnasio_id, acceso.fecha_hora_entrada, acceso.duracion_minutos)
+        
+        invalidar_reportes(acceso.gimnasio_id, *REPORTES_ASISTENCIA)
+        return acceso
+    
+    async def get_usuarios_en_gimnasio(self, gimnasio_id: int):
+        return await self.repo.get_usuarios_en_gimnasio(gimnasio_id)
+    
+    async def get_by_usuario(self, usuario_id: int, skip: int = 0, limit: int = 100):
+        return await self.repo.get_by_usuario(usuario_id, skip, limit)
+    
+    async def get_page_by_gimnasio(self, gimnasio_id: int, after: str = None, limit: int = 100):
+        return await self.repo.get_page_by_gimnasio(gimnasio_id, after, limit)
\ No newline at end of file
@@ -2,18 +2,68 @@
 from typing import Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import BackgroundTasks, HTTPException, status
 
-from app.repositories.usuario import UsuarioRepository
-from app.repositories.gimnasio import GimnasioRepository
-from app.repositories.rol import RolRepository
+from app.repositories.usuario import UsuarioRepository, AsyncUsuarioRepository
+from app.repositories.gimnasio import AsyncGimnasioRepository
+from app.repositories.rol import AsyncRolRepository
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger
 from app.core.security import (
-    verify_password, get_password_hash, create_access_token,
-    create_refresh_token, verify_token, validate_password_strength
+    create_access_token, create_refresh_token, verify_token, validate_password_strength,
+    password_needs_rehash
 )
+from app.core.password_hasher import password_hasher, PasswordHasherSaturado
+from app.core.auth_context import AuthContext
+from app.services.token_revocacion_service import TokenRevocacionService
 from app.schemas.auth import Login, Register, Token
 from app.models.usuario import Usuario
 
+logger = get_logger(__name__)
+
+
+def _emitir_tokens(usuario: Usuario) -> Token:
+    """Access token y refresh token de un usuario ya autenticado"""
+    access_token = create_access_token(
+        data={
+            "sub": str(usuario.id),
+            "email": usuario.email,
+            "role": usuario.rol.nombre,
+            "gimnasio_id": usuario.gimnasio_id
+        }
+    )
+    
+    refresh_token = create_refresh_token(
+        data={
+            "sub": str(usuario.id),
+            "email": usuario.email
+        }
+    )
+    
+    return Token(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer"
+    )
+
+
+async def rehash_password(usuario_id: int, password: str, hash_actual: str) -> None:
+    """
+    Rehace el hash con el costo calibrado tras un login correcto (tarea en
+    segundo plano, después de responder). La contraseña ya se verificó en el
+    login: aquí solo se hashea. Si el pool está saturado se omite y se vuelve
+    a intentar en el siguiente login.
+    """
+    try:
+        hash_nuevo = await password_hasher.hash(password)
+    except PasswordHasherSaturado:
+        return
+    
+    async with AsyncSessionLocal() as db:
+        if await AsyncUsuarioRepository(db).actualizar_password_hash(usuario_id, hash_actual, hash_nuevo):
+            logger.info(f"Hash de contraseña del usuario {usuario_id} actualizado al costo {password_hasher.rounds}")
+
 
 class AuthService:
     """Servicio de autenticación y autorización"""
@@ -21,46 +71,38 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.usuario_repo = UsuarioRepository(db)
-        self.gimnasio_repo = GimnasioRepository(db)
-        self.rol_repo = RolRepository(db)
     
-    def login(self, login_data: Login) -> Token:
+    def refresh_access_token(self, refresh_token: str) -> Token:
         """
-        Autentica un usuario y genera tokens JWT.
+        Genera un nuevo access token usando un refresh token.
         
         Args:
-            login_data: Credenciales de login
+            refresh_token: Refresh token válido
             
         Returns:
-            Token: Access token y refresh token
+            Token: Nuevo access token
             
         Raises:
-            HTTPException: Si las credenciales son inválidas
+            HTTPException: Si el refresh token es inválido
         """
-        # Buscar usuario por email
-        usuario = self.usuario_repo.get_by_email(login_data.email)
+        payload = verify_token(refresh_token, token_type="refresh")
         
-        if not usuario:
+        if not payload:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Email o contraseña incorrectos"
+                detail="Refresh token inválido o expirado"
             )
         
-        # Verificar contraseña
-        if not verify_password(login_data.password, usuario.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Email o contraseña incorrectos"
-            )
+        user_id = int(payload.get("sub"))
+        usuario = self.usuario_repo.get_by_id(user_id)
         
-        # Verificar que el usuario esté activo
-        if not usuario.activo:
+        if not usuario or not usuario.activo:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Usuario inactivo. Contacta al administrador"
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuario no encontrado o inactivo"
             )
         
-        # Generar tokens
+        # Generar nuevo access token
         access_token = create_access_token(
             data={
                 "sub": str(usuario.id),
@@ -70,20 +112,84 @@ class AuthService:
             }
         )
         
-        refresh_token = create_refresh_token(
-            data={
-                "sub": str(usuario.id),
-                "email": usuario.email
-            }
-        )
-        
         return Token(
             access_token=access_token,
-            refresh_token=refresh_token,
             token_type="bearer"
         )
     
-    def register(self, register_data: Register) -> Usuario:
+    def logout(self, current_user: AuthContext, refresh_token: Optional[str] = None) -> None:
+        """
+        Revoca el access token del request y, si se envía, el refresh token
+        del mismo usuario.
+        
+        Args:
+            current_user: Usuario autenticado (trae el jti y exp de su token)
+            refresh_token: Refresh token a invalidar junto con la sesión
+        """
+        revocacion = TokenRevocacionService(self.db)
+        if current_user.jti:
+            revocacion.revocar_token({
+                "jti": current_user.jti,
+                "sub": str(current_user.id),
+                "exp": current_user.exp
+            })
+        
+        if refresh_token:
+            payload = verify_token(refresh_token, token_type="refresh")
+            if payload and payload.get("sub") == str(current_user.id):
+                revocacion.revocar_token(payload)
+
+
+class AsyncAuthService:
+    """
+    Versión asíncrona de AuthService para login, registro y cambio de
+    contraseña: mientras bcrypt corre en el pool de procesos el event loop
+    sigue atendiendo otros requests.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.usuario_repo = AsyncUsuarioRepository(db)
+        self.gimnasio_repo = AsyncGimnasioRepository(db)
+        self.rol_repo = AsyncRolRepository(db)
+    
+    async def login(self, login_data: Login, background_tasks: Optional[BackgroundTasks] = None) -> Token:
+        """
+        Autentica un usuario y genera tokens JWT.
+        
+        Si el hash guardado tiene un costo menor que el calibrado, se rehace en
+        `background_tasks` (rehash_password) sin alargar la respuesta.
+        
+        Raises:
+            HTTPException: Si las credenciales son inválidas
+            PasswordHasherSaturado: Si el pool de bcrypt está al límite (503)
+        """
+        usuario = await self.usuario_repo.get_by_email(login_data.email)
+        
+        if not usuario:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Email o contraseña incorrectos"
+            )
+        
+        if not await password_hasher.verify(login_data.password, usuario.password_hash):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Email o contraseña incorrectos"
+            )
+        
+        if not usuario.activo:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Usuario inactivo. Contacta al administrador"
+            )
+        
+        if background_tasks is not None and password_needs_rehash(usuario.password_hash):
+            background_tasks.add_task(rehash_password, usuario.id, login_data.password, usuario.password_hash)
+        
+        return _emitir_tokens(usuario)
+    
+    async def register(self, register_data: Register) -> Usuario:
         """
         Registra un nuevo usuario (cliente).
         
@@ -95,16 +201,17 @@ class AuthService:
             
         Raises:
             HTTPException: Si hay errores de validación
+            PasswordHasherSaturado: Si el pool de bcrypt está al límite (503)
         """
         # Verificar que el email no esté en uso
-        if self.usuario_repo.get_by_email(register_data.email):
+        if await self.usuario_repo.get_by_email(register_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El email ya está registrado"
             )
         
         # Verificar que el gimnasio exista
-        gimnasio = self.gimnasio_repo.get_by_codigo(register_data.gimnasio_codigo)
+        gimnasio = await self.gimnasio_repo.get_by_codigo(register_data.gimnasio_codigo)
         if not gimnasio:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -119,7 +226,7 @@ class AuthService:
             )
         
         # Obtener rol de cliente
-        rol_cliente = self.rol_repo.get_by_nombre("cliente")
+        rol_cliente = await self.rol_repo.get_by_nombre("cliente")
         if not rol_cliente:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -131,62 +238,19 @@ class AuthService:
             "nombre": register_data.nombre,
             "apellido": register_data.apellido,
             "email": register_data.email,
-            "password_hash": get_password_hash(register_data.password),
+            "password_hash": await password_hasher.hash(register_data.password),
             "telefono": register_data.telefono,
             "gimnasio_id": gimnasio.id,
             "rol_id": rol_cliente.id,
+            # Con el rol asignado la respuesta lee rol_nombre sin lazy load
+            "rol": rol_cliente,
             "activo": True
         }
         
-        usuario = self.usuario_repo.create(usuario_data)
+        usuario = await self.usuario_repo.create(usuario_data)
         return usuario
     
-    def refresh_access_token(self, refresh_token: str) -> Token:
-        """
-        Genera un nuevo access token usando un refresh token.
-        
-        Args:
-            refresh_token: Refresh token válido
-            
-        Returns:
-            Token: Nuevo access token
-            
-        Raises:
-            HTTPException: Si el refresh token es inválido
-        """
-        payload = verify_token(refresh_token, token_type="refresh")
-        
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Refresh token inválido o expirado"
-            )
-        
-        user_id = int(payload.get("sub"))
-        usuario = self.usuario_repo.get_by_id(user_id)
-        
-        if not usuario or not usuario.activo:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Usuario no encontrado o inactivo"
-            )
-        
-        # Generar nuevo access token
-        access_token = create_access_token(
-            data={
-                "sub": str(usuario.id),
-                "email": usuario.email,
-                "role": usuario.rol.nombre,
-                "gimnasio_id": usuario.gimnasio_id
-            }
-        )
-        
-        return Token(
-            access_token=access_token,
-            token_type="bearer"
-        )
-    
-    def change_password(self, user_id: int, current_password: str, new_password: str) -> bool:
+    async def change_password(self, user_id: int, current_password: str, new_password: str) -> bool:
         """
         Cambia la contraseña de un usuario.
         
@@ -200,8 +264,9 @@ class AuthService:
             
         Raises:
             HTTPException: Si hay errores de validación
+            PasswordHasherSaturado: Si el pool de bcrypt está al límite (503)
         """
-        usuario = self.usuario_repo.get_by_id(user_id)
+        usuario = await self.usuario_repo.get_by_id(user_id)
         
         if not usuario:
             raise HTTPException(
@@ -210,7 +275,7 @@ class AuthService:
             )
         
         # Verificar contraseña actual
-        if not verify_password(current_password, usuario.password_hash):
+        if not await password_hasher.verify(current_password, usuario.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Contraseña actual incorrecta"
@@ -224,8 +289,8 @@ class AuthService:
             )
         
         # Actualizar contraseña
-        self.usuario_repo.update(user_id, {
-            "password_hash": get_password_hash(new_password)
+        await self.usuario_repo.update(user_id, {
+            "password_hash": await password_hasher.hash(new_password)
         })
         
         return True
\ No newline at end of file
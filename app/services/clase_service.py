@@ -2,23 +2,26 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.clase import ClaseRepository
-from app.schemas.clase import ClaseCreate, ClaseUpdate
+from app.schemas.clase import ClaseCreate, ClaseUpdate, ClaseResponse
 
 class ClaseService:
     def __init__(self, db: Session):
-        self.repo = ClaseRepository(db)
+        self.repo = ClaseRepository(db, profile="list")
     
     def create(self, data: ClaseCreate):
         return self.repo.create(data.model_dump())
     
     def get_by_id(self, id: int):
-        obj = self.repo.get_by_id(id)
+        obj = self.repo.with_profile("detail").get_by_id(id)
         if not obj:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Clase no encontrada")
         return obj
     
     def get_by_gimnasio(self, gimnasio_id: int, skip: int = 0, limit: int = 100):
-        return self.repo.get_by_gimnasio(gimnasio_id, skip=skip, limit=limit)
+        """Lista de clases como filas con solo las columnas de ClaseResponse"""
+        return self.repo.select_columns(
+            ClaseResponse.model_fields, gimnasio_id=gimnasio_id, skip=skip, limit=limit
+        )
     
     def update(self, id: int, data: ClaseUpdate):
         return self.repo.update(id, data.model_dump(exclude_unset=True))
@@ -47,8 +47,7 @@ class EntrenadorService:
             )
         
         relaciones = self.entrenador_cliente_repo.get_clientes_entrenador(entrenador_id, activo)
-        clientes = [self.usuario_repo.get_by_id(rel.cliente_id) for rel in relaciones]
-        return [c for c in clientes if c is not None]
+        return self.usuario_repo.get_many(rel.cliente_id for rel in relaciones)
     
     def asignar_cliente(self, entrenador_id: int, cliente_id: int, notas: str = None) -> bool:
         """
@@ -62,8 +61,11 @@ class EntrenadorService:
         Returns:
             True si se asignó exitosamente
         """
+        # Cargar entrenador y cliente en una sola query
+        usuarios = {u.id: u for u in self.usuario_repo.get_many([entrenador_id, cliente_id])}
+        
         # Verificar entrenador
-        entrenador = self.usuario_repo.get_by_id(entrenador_id)
+        entrenador = usuarios.get(entrenador_id)
         if not entrenador or not entrenador.es_entrenador():
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -71,7 +73,7 @@ class EntrenadorService:
             )
         
         # Verificar cliente
-        cliente = self.usuario_repo.get_by_id(cliente_id)
+        cliente = usuarios.get(cliente_id)
         if not cliente or not cliente.es_cliente():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
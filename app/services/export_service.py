@@ -0,0 +1,138 @@
+"""Service de exportación de reportes y listados"""
+from datetime import date, timedelta
+from typing import Iterator, List, Tuple
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.repositories.base import half_open_range
+from app.repositories.usuario import UsuarioRepository
+from app.repositories.membresia import MembresiaRepository
+from app.repositories.acceso import AccesoRepository
+from app.repositories.factura import FacturaRepository
+from app.repositories.clase import ClaseRepository
+from app.repositories.inventario import InventarioRepository
+from app.models.acceso import Acceso
+from app.models.factura import Factura
+from app.domain.exceptions.validation_exceptions import InvalidDataException
+
+# Columnas exportadas por reporte (las de la base o `column_expressions` del repository)
+COLUMNAS_USUARIOS = [
+    "id", "nombre", "apellido", "email", "telefono", "documento_identidad", "fecha_nacimiento",
+    "genero", "rol_nombre", "activo", "fecha_creacion",
+]
+COLUMNAS_MEMBRESIAS = [
+    "id", "usuario_id", "usuario_nombre", "usuario_email", "membresia_tipo",
+    "fecha_inicio", "fecha_fin", "estado", "precio_pagado",
+]
+COLUMNAS_ASISTENCIA = ["id", "usuario_id", "fecha_hora_entrada", "fecha_hora_salida", "tipo_acceso"]
+COLUMNAS_FINANCIERO = [
+    "id", "numero_factura", "usuario_id", "tipo", "estado", "metodo_pago",
+    "subtotal", "impuestos", "descuentos", "total", "fecha_emision", "fecha_pago",
+]
+COLUMNAS_CLASES = [
+    "id", "nombre", "entrenador_id", "entrenador_nombre", "capacidad_maxima",
+    "duracion_minutos", "activo", "fecha_creacion",
+]
+COLUMNAS_INVENTARIO = [
+    "id", "categoria_id", "nombre", "codigo", "cantidad", "estado", "costo", "ubicacion",
+    "fecha_adquisicion", "fecha_ultimo_mantenimiento", "fecha_proximo_mantenimiento", "activo",
+]
+
+EXPORTABLES = ("usuarios", "membresias", "asistencia", "financiero", "clases", "inventario")
+
+
+class ExportService:
+    """
+    Filas de detalle detrás de cada reporte, leídas con cursor del lado del
+    servidor para exportarlas a CSV / XLSX sin cargarlas en memoria.
+
+    Cada método devuelve (columnas, iterador de filas); el endpoint arma la
+    respuesta con `app.utils.export.export_response`.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def exportar(
+        self,
+        tipo: str,
+        gimnasio_id: int,
+        fecha_inicio: date = None,
+        fecha_fin: date = None
+    ) -> Tuple[List[str], Iterator[Row]]:
+        """
+        Filas a exportar para un tipo de reporte.
+
+        Args:
+            tipo: Uno de EXPORTABLES
+            gimnasio_id: ID del gimnasio
+            fecha_inicio: Inicio del rango (solo asistencia y financiero)
+            fecha_fin: Fin del rango (solo asistencia y financiero)
+
+        Returns:
+            Tupla (columnas, filas)
+        """
+        if tipo == "asistencia":
+            return self.accesos(gimnasio_id, fecha_inicio, fecha_fin)
+        if tipo == "financiero":
+            # Mismo rango por defecto que reporte_financiero: el mes en curso
+            fecha_fin = fecha_fin or date.today()
+            fecha_inicio = fecha_inicio or date(fecha_fin.year, fecha_fin.month, 1)
+            return self.facturas(gimnasio_id, fecha_inicio, fecha_fin)
+        if tipo not in EXPORTABLES:
+            raise InvalidDataException("tipo", f"debe ser uno de: {', '.join(EXPORTABLES)}")
+        return getattr(self, tipo)(gimnasio_id)
+
+    def usuarios(self, gimnasio_id: int) -> Tuple[List[str], Iterator[Row]]:
+        """Usuarios del gimnasio con su rol"""
+        repo = UsuarioRepository(self.db)
+        return COLUMNAS_USUARIOS, repo.iter_columns(COLUMNAS_USUARIOS, gimnasio_id=gimnasio_id)
+
+    def membresias(self, gimnasio_id: int) -> Tuple[List[str], Iterator[Row]]:
+        """Membresías de los clientes del gimnasio"""
+        repo = MembresiaRepository(self.db)
+        return COLUMNAS_MEMBRESIAS, repo.iter_by_gimnasio(gimnasio_id)
+
+    def accesos(
+        self,
+        gimnasio_id: int,
+        fecha_inicio: date = None,
+        fecha_fin: date = None
+    ) -> Tuple[List[str], Iterator[Row]]:
+        """Accesos del rango (por defecto: últimos 30 días, como reporte_asistencia)"""
+        fecha_fin = fecha_fin or date.today()
+        fecha_inicio = fecha_inicio or fecha_fin - timedelta(days=30)
+        repo = AccesoRepository(self.db)
+        filas = repo.iter_columns(
+            COLUMNAS_ASISTENCIA,
+            *half_open_range(Acceso.fecha_hora_entrada, fecha_inicio, fecha_fin),
+            order_by="fecha_hora_entrada",
+            gimnasio_id=gimnasio_id
+        )
+        return COLUMNAS_ASISTENCIA, filas
+
+    def facturas(
+        self,
+        gimnasio_id: int,
+        fecha_inicio: date = None,
+        fecha_fin: date = None
+    ) -> Tuple[List[str], Iterator[Row]]:
+        """Facturas del gimnasio emitidas en el rango (sin fechas: todas)"""
+        repo = FacturaRepository(self.db)
+        filas = repo.iter_columns(
+            COLUMNAS_FINANCIERO,
+            *half_open_range(Factura.fecha_emision, fecha_inicio, fecha_fin),
+            order_by="fecha_emision",
+            gimnasio_id=gimnasio_id
+        )
+        return COLUMNAS_FINANCIERO, filas
+
+    def clases(self, gimnasio_id: int) -> Tuple[List[str], Iterator[Row]]:
+        """Clases del gimnasio con su entrenador"""
+        repo = ClaseRepository(self.db)
+        return COLUMNAS_CLASES, repo.iter_columns(COLUMNAS_CLASES, gimnasio_id=gimnasio_id)
+
+    def inventario(self, gimnasio_id: int) -> Tuple[List[str], Iterator[Row]]:
+        """Equipamiento del gimnasio"""
+        repo = InventarioRepository(self.db)
+        return COLUMNAS_INVENTARIO, repo.iter_columns(COLUMNAS_INVENTARIO, gimnasio_id=gimnasio_id)
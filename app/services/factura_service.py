@@ -2,16 +2,23 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.database import UnitOfWork
+from app.models.factura_detalle import FacturaDetalle
 from app.repositories.factura import FacturaRepository
+from app.repositories.resumen_diario_ingreso import ResumenDiarioIngresoRepository
 from app.schemas.factura import FacturaCreate
-from app.core.constants import EstadoFacturaEnum
+from app.services.reporte_service import invalidar_reportes, REPORTES_FINANCIEROS
+from app.core.constants import EstadoFacturaEnum, TipoItemFacturaEnum
 import random
 
 class FacturaService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = FacturaRepository(db)
+        self.resumen_repo = ResumenDiarioIngresoRepository(db)
     
     def create(self, data: FacturaCreate):
+        """Crea la factura con sus detalles en una sola transacción"""
         # Generar número de factura único
         numero_factura = self._generar_numero_factura()
         
@@ -31,14 +38,26 @@ class FacturaService:
             "estado": EstadoFacturaEnum.PENDIENTE,
             "metodo_pago": data.metodo_pago,
             "notas": data.notas,
-            "fecha_emision": datetime.now()
+            "fecha_emision": datetime.now(),
+            "detalles": [
+                FacturaDetalle(
+                    concepto=d.concepto,
+                    tipo_item=TipoItemFacturaEnum(d.tipo_item),
+                    item_id=d.item_id,
+                    cantidad=d.cantidad,
+                    precio_unitario=d.precio_unitario,
+                    subtotal=d.precio_unitario * d.cantidad
+                )
+                for d in data.detalles
+            ]
         }
         
-        factura = self.repo.create(factura_data)
-        
-        # Crear detalles
-        # (esto requeriría acceso a FacturaDetalleRepository)
+        # Factura, detalles y resumen diario se escriben en el mismo commit
+        with UnitOfWork(self.db):
+            factura = self.repo.create(factura_data)
+            self.resumen_repo.registrar_factura(factura)
         
+        invalidar_reportes(factura.gimnasio_id, *REPORTES_FINANCIEROS)
         return factura
     
     def _generar_numero_factura(self) -> str:
@@ -55,5 +74,8 @@ class FacturaService:
     def get_by_gimnasio(self, gimnasio_id: int, skip: int = 0, limit: int = 100):
         return self.repo.get_by_gimnasio(gimnasio_id, skip, limit)
     
+    def get_page_by_gimnasio(self, gimnasio_id: int, after: str = None, limit: int = 100):
+        return self.repo.get_page_by_gimnasio(gimnasio_id, after, limit)
+    
     def get_by_usuario(self, usuario_id: int):
         return self.repo.get_by_usuario(usuario_id)
\ No newline at end of file
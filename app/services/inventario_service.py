@@ -2,7 +2,7 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.inventario import InventarioRepository
-from app.schemas.inventario import InventarioCreate, InventarioUpdate
+from app.schemas.inventario import InventarioCreate, InventarioUpdate, InventarioResponse
 
 class InventarioService:
     def __init__(self, db: Session):
@@ -18,7 +18,10 @@ class InventarioService:
         return obj
     
     def get_by_gimnasio(self, gimnasio_id: int, skip: int = 0, limit: int = 100):
-        return self.repo.get_by_gimnasio(gimnasio_id, skip=skip, limit=limit)
+        """Lista de inventario como filas con solo las columnas de InventarioResponse"""
+        return self.repo.select_columns(
+            InventarioResponse.model_fields, gimnasio_id=gimnasio_id, skip=skip, limit=limit
+        )
     
     def get_requiere_mantenimiento(self, gimnasio_id: int):
         return self.repo.get_requiere_mantenimiento(gimnasio_id)
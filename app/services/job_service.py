@@ -0,0 +1,238 @@
+"""Service de Jobs: reportes pesados generados en segundo plano"""
+import json
+import os
+import traceback
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import EstadoJobEnum
+from app.core.database import SessionLocal
+from app.core.logging import get_logger
+from app.models.job import Job
+from app.repositories.job import JobRepository
+from app.schemas.job import JobCreate
+from app.domain.exceptions.validation_exceptions import InvalidDataException
+from app.services.export_service import ExportService
+from app.services.reporte_service import ReporteService
+from app.utils.export import iter_csv, iter_xlsx, MEDIA_TYPES
+from app.utils.file_handler import FileHandler
+from app.utils.pdf_generator import generar_pdf_reporte
+
+logger = get_logger(__name__)
+
+# Subdirectorio de uploads donde quedan los archivos generados
+JOBS_SUBDIR = "reportes"
+
+# Método de ReporteService y título de cada tipo de reporte
+REPORTES = {
+    "usuarios": ("reporte_usuarios", "Reporte de usuarios"),
+    "membresias": ("reporte_membresias", "Reporte de membresías"),
+    "asistencia": ("reporte_asistencia", "Reporte de asistencia"),
+    "financiero": ("reporte_financiero", "Reporte financiero"),
+    "clases": ("reporte_clases", "Reporte de clases"),
+    "inventario": ("reporte_inventario", "Reporte de inventario"),
+    "dashboard": ("dashboard_general", "Dashboard general"),
+}
+
+# Argumentos que acepta cada reporte además del gimnasio
+ARGUMENTOS = {
+    "asistencia": ("fecha_inicio", "fecha_fin"),
+    "financiero": ("fecha_inicio", "fecha_fin", "granularity"),
+}
+
+MEDIA_TYPES_JOB = {**MEDIA_TYPES, "json": "application/json", "pdf": "application/pdf"}
+
+
+class JobService:
+    def __init__(self, db: Session, file_handler: Optional[FileHandler] = None):
+        self.db = db
+        self.repo = JobRepository(db)
+        self.files = file_handler or FileHandler()
+    
+    # ========================================
+    # API
+    # ========================================
+    
+    def crear(self, gimnasio_id: int, usuario_id: Optional[int], data: JobCreate) -> Job:
+        """Encola un reporte; un worker lo toma en orden de llegada"""
+        if data.tipo == "dashboard" and data.formato in ("csv", "xlsx"):
+            raise InvalidDataException("formato", "el dashboard solo se genera en json o pdf")
+        if data.fecha_inicio and data.fecha_fin and data.fecha_inicio > data.fecha_fin:
+            raise InvalidDataException("fecha_inicio", "no puede ser posterior a fecha_fin")
+        
+        return self.repo.create({
+            "gimnasio_id": gimnasio_id,
+            "usuario_id": usuario_id,
+            "tipo": data.tipo,
+            "formato": data.formato,
+            "parametros": data.parametros(),
+            "estado": EstadoJobEnum.PENDIENTE,
+        })
+    
+    def get(self, job_id: int, gimnasio_id: int) -> Job:
+        job = self.repo.get_by_gimnasio(job_id, gimnasio_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job no encontrado")
+        return job
+    
+    def get_archivo(self, job_id: int, gimnasio_id: int) -> Tuple[str, str, str]:
+        """
+        Archivo generado por un job terminado.
+        
+        Returns:
+            Tupla (ruta en disco, nombre de descarga, media type)
+        
+        Raises:
+            HTTPException: 409 si aún no terminó o falló, 410 si el archivo expiró
+        """
+        job = self.get(job_id, gimnasio_id)
+        if job.estado == EstadoJobEnum.EXPIRADO:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="El archivo del reporte expiró")
+        if job.estado != EstadoJobEnum.COMPLETADO:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"El job está {job.estado.value}"
+            )
+        
+        ruta = self.files.ruta_completa(job.archivo)
+        if not os.path.exists(ruta):
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="El archivo del reporte expiró")
+        
+        nombre = f"{job.tipo}_{job.gimnasio_id}_{job.id}.{job.formato}"
+        return ruta, nombre, MEDIA_TYPES_JOB[job.formato]
+    
+    # ========================================
+    # WORKER
+    # ========================================
+    
+    def tomar_siguiente(self, worker_id: str) -> Optional[Job]:
+        """Reserva el siguiente job pendiente (ver JobRepository.tomar_siguiente)"""
+        return self.repo.tomar_siguiente(worker_id)
+    
+    def ejecutar(self, job: Job) -> Job:
+        """
+        Genera el archivo de un job reservado y registra el resultado.
+        
+        Las queries del reporte van por una sesión de solo lectura (réplicas);
+        esta sesión solo escribe el estado del job.
+        """
+        try:
+            archivo = self._generar(job)
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.tipo}/{job.formato}) falló: {e}\n{traceback.format_exc()}")
+            self.db.rollback()
+            return self.repo.update(job.id, {
+                "estado": EstadoJobEnum.FALLIDO,
+                "error": str(e)[:1000] or type(e).__name__,
+                "fecha_fin": datetime.utcnow(),
+            })
+        
+        fin = datetime.utcnow()
+        return self.repo.update(job.id, {
+            "estado": EstadoJobEnum.COMPLETADO,
+            "archivo": archivo["path"],
+            "tamano_bytes": archivo["size"],
+            "error": None,
+            "fecha_fin": fin,
+            "fecha_expiracion": fin + timedelta(hours=settings.JOB_RESULT_TTL_HOURS),
+        })
+    
+    def limpiar_expirados(self, ahora: Optional[datetime] = None) -> int:
+        """
+        Elimina los archivos cuya retención venció y marca sus jobs como EXPIRADO.
+        
+        Returns:
+            Número de jobs expirados
+        """
+        ahora = ahora or datetime.utcnow()
+        total = 0
+        while jobs := self.repo.get_expirados(ahora):
+            for job in jobs:
+                self.files.eliminar_archivo(job.archivo)
+                job.estado = EstadoJobEnum.EXPIRADO
+                job.archivo = None
+            self.db.commit()
+            total += len(jobs)
+        return total
+    
+    def liberar_abandonados(self) -> int:
+        """Reencola los jobs que quedaron en proceso tras caerse un worker"""
+        limite = datetime.utcnow() - timedelta(minutes=settings.JOB_STALE_MINUTES)
+        return self.repo.liberar_abandonados(limite, settings.JOB_MAX_ATTEMPTS)
+    
+    # ========================================
+    # GENERACIÓN
+    # ========================================
+    
+    def _generar(self, job: Job) -> Dict[str, Any]:
+        """Genera el archivo del job con FileHandler y devuelve su ruta y tamaño"""
+        parametros = self._argumentos(job)
+        nombre = f"{job.tipo}.{job.formato}"
+        prefijo = f"job{job.id}"
+        
+        db = SessionLocal(info={"readonly": True})
+        try:
+            if job.formato in ("csv", "xlsx"):
+                columnas, filas = ExportService(db).exportar(job.tipo, job.gimnasio_id, **parametros)
+                escribir = iter_xlsx if job.formato == "xlsx" else iter_csv
+                return self.files.guardar_chunks(escribir(columnas, filas), nombre, JOBS_SUBDIR, prefijo)
+            
+            metodo, titulo = REPORTES[job.tipo]
+            argumentos = {k: v for k, v in parametros.items() if k in ARGUMENTOS.get(job.tipo, ())}
+            reporte = jsonable_encoder(getattr(ReporteService(db), metodo)(job.gimnasio_id, **argumentos))
+        finally:
+            db.close()
+        
+        if job.formato == "json":
+            contenido = json.dumps(reporte, ensure_ascii=False, indent=2).encode("utf-8")
+            return self.files.guardar_chunks([contenido], nombre, JOBS_SUBDIR, prefijo)
+        
+        ruta = self.files.nueva_ruta(nombre, JOBS_SUBDIR, prefijo)
+        datos, tablas = _secciones_pdf(reporte)
+        try:
+            generar_pdf_reporte(titulo, datos, tablas, filename=ruta["full_path"])
+        except BaseException:
+            self.files.eliminar_archivo(ruta["path"])
+            raise
+        return {**ruta, "size": os.path.getsize(ruta["full_path"])}
+    
+    def _argumentos(self, job: Job) -> Dict[str, Any]:
+        """Parámetros guardados en el job, con las fechas como date"""
+        parametros = dict(job.parametros or {})
+        for campo in ("fecha_inicio", "fecha_fin"):
+            if parametros.get(campo):
+                parametros[campo] = date.fromisoformat(parametros[campo])
+        if job.formato in ("csv", "xlsx"):
+            # Las exportaciones solo reciben el rango de fechas
+            parametros.pop("granularity", None)
+        return parametros
+
+
+def _titulo(clave: str) -> str:
+    return clave.replace("_", " ").capitalize()
+
+
+def _secciones_pdf(reporte: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Reparte un reporte (ya serializable) entre datos generales y tablas para
+    generar_pdf_reporte: los valores simples van como datos, los dict como
+    tablas concepto/valor y las listas de dict como tablas con encabezados.
+    """
+    datos = {}
+    tablas = []
+    for clave, valor in reporte.items():
+        if isinstance(valor, dict):
+            filas = [[_titulo(k), str(v)] for k, v in valor.items()]
+            tablas.append({"titulo": _titulo(clave), "datos": [["Concepto", "Valor"], *filas]})
+        elif isinstance(valor, list):
+            if valor and isinstance(valor[0], dict):
+                columnas = list(valor[0].keys())
+                filas = [[str(fila.get(c, "")) for c in columnas] for fila in valor]
+                tablas.append({"titulo": _titulo(clave), "datos": [[_titulo(c) for c in columnas], *filas]})
+        else:
+            datos[_titulo(clave)] = valor
+    return datos, tablas
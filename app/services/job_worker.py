@@ -0,0 +1,125 @@
+"""
+Worker de jobs de reportes
+Hilos que toman jobs pendientes de la tabla `jobs` y generan sus archivos.
+Corre dentro de la API (JOB_WORKERS > 0) o aparte con scripts/worker.py
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logging import get_logger
+from app.services.job_service import JobService
+
+logger = get_logger(__name__)
+
+
+class JobWorker:
+    """
+    Pool de hilos que procesa la cola de jobs.
+    
+    Varios procesos (workers de uvicorn, scripts/worker.py) pueden compartir
+    la misma tabla: cada job lo reserva un único hilo (ver
+    JobRepository.tomar_siguiente).
+    """
+    
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        cleanup_interval: Optional[int] = None
+    ):
+        self.concurrency = concurrency if concurrency is not None else settings.JOB_WORKERS
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL
+        self.cleanup_interval = cleanup_interval if cleanup_interval is not None else settings.JOB_CLEANUP_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._cleanup_lock = threading.Lock()
+        self._last_cleanup = 0.0
+    
+    def start(self) -> None:
+        """Arranca los hilos (no bloquea)"""
+        self._stop.clear()
+        for n in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._loop,
+                args=(f"{self.worker_id}:{n}",),
+                name=f"job-worker-{n}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Worker de jobs {self.worker_id} iniciado con {self.concurrency} hilos")
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Pide a los hilos que terminen tras el job en curso y los espera"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def run_forever(self) -> None:
+        """Arranca los hilos y bloquea hasta Ctrl+C (scripts/worker.py)"""
+        self.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            logger.info("Deteniendo worker de jobs...")
+        finally:
+            self.stop()
+    
+    def procesar_siguiente(self, worker_id: str) -> bool:
+        """
+        Toma y ejecuta un job pendiente.
+        
+        Returns:
+            True si había un job (procesado con éxito o no), False si la cola está vacía
+        """
+        db = SessionLocal()
+        try:
+            service = JobService(db)
+            job = service.tomar_siguiente(worker_id)
+            if job is None:
+                return False
+            job = service.ejecutar(job)
+            logger.info(f"Job {job.id} ({job.tipo}/{job.formato}) {job.estado.value}")
+            return True
+        finally:
+            db.close()
+    
+    def mantenimiento(self, force: bool = False) -> None:
+        """Cada `cleanup_interval` segundos: reencola jobs abandonados y borra archivos vencidos"""
+        if not self._cleanup_lock.acquire(blocking=False):
+            return
+        try:
+            if not force and time.monotonic() - self._last_cleanup < self.cleanup_interval:
+                return
+            self._last_cleanup = time.monotonic()
+            db = SessionLocal()
+            try:
+                service = JobService(db)
+                liberados = service.liberar_abandonados()
+                expirados = service.limpiar_expirados()
+            finally:
+                db.close()
+            if liberados or expirados:
+                logger.info(f"Jobs: {liberados} reencolados, {expirados} archivos expirados")
+        finally:
+            self._cleanup_lock.release()
+    
+    def _loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.procesar_siguiente(worker_id):
+                    continue
+                self.mantenimiento()
+            except Exception as e:
+                # Un error de conexión no debe matar el hilo: se reintenta tras la espera
+                logger.error(f"Error en el worker de jobs {worker_id}: {e}")
+            self._stop.wait(self.poll_interval)
@@ -7,11 +7,12 @@ from app.repositories.usuario import UsuarioRepository
 from app.repositories.membresia_tipo import MembresiaTipoRepository
 from app.schemas.membresia import MembresiaCreate, MembresiaUpdate
 from app.core.constants import EstadoMembresiaEnum
+from app.services.reporte_service import invalidar_reportes, REPORTES_MEMBRESIAS
 
 class MembresiaService:
     def __init__(self, db: Session):
         self.db = db
-        self.repo = MembresiaRepository(db)
+        self.repo = MembresiaRepository(db, profile="list")
         self.usuario_repo = UsuarioRepository(db)
         self.tipo_repo = MembresiaTipoRepository(db)
     
@@ -40,7 +41,9 @@ class MembresiaService:
         
         membresia_data["estado"] = EstadoMembresiaEnum.ACTIVA
         
-        return self.repo.create(membresia_data)
+        membresia = self.repo.create(membresia_data)
+        self._invalidar_reportes(membresia.usuario_id)
+        return membresia
     
     def get_by_id(self, id: int):
         membresia = self.repo.get_by_id(id)
@@ -55,17 +58,31 @@ class MembresiaService:
         return self.repo.get_activa_usuario(usuario_id)
     
     def update(self, id: int, data: MembresiaUpdate):
-        return self.repo.update(id, data.model_dump(exclude_unset=True))
+        membresia = self.repo.update(id, data.model_dump(exclude_unset=True))
+        if membresia:
+            self._invalidar_reportes(membresia.usuario_id)
+        return membresia
     
     def cancelar(self, id: int):
         membresia = self.get_by_id(id)
-        return self.repo.update(id, {"estado": EstadoMembresiaEnum.CANCELADA})
+        membresia = self.repo.update(id, {"estado": EstadoMembresiaEnum.CANCELADA})
+        self._invalidar_reportes(membresia.usuario_id)
+        return membresia
     
     def actualizar_vencidas(self):
         """Actualiza el estado de membresías vencidas"""
         vencidas = self.repo.get_vencidas()
-        count = 0
-        for membresia in vencidas:
-            self.repo.update(membresia.id, {"estado": EstadoMembresiaEnum.VENCIDA})
-            count += 1
-        return count
\ No newline at end of file
+        actualizadas = self.repo.bulk_update([
+            {"id": membresia.id, "estado": EstadoMembresiaEnum.VENCIDA}
+            for membresia in vencidas
+        ])
+        if actualizadas:
+            # Proceso global: afecta a todos los gimnasios
+            invalidar_reportes(None, *REPORTES_MEMBRESIAS)
+        return actualizadas
+    
+    def _invalidar_reportes(self, usuario_id: int) -> None:
+        """Descarta los reportes en caché del gimnasio del usuario"""
+        filas = self.usuario_repo.select_columns(["gimnasio_id"], id=usuario_id, limit=1)
+        if filas:
+            invalidar_reportes(filas[0].gimnasio_id, *REPORTES_MEMBRESIAS)
\ No newline at end of file
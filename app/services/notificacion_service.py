@@ -1,7 +1,8 @@
 """Service de Notificación"""
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from app.repositories.notificacion import NotificacionRepository
+from app.repositories.notificacion import NotificacionRepository, AsyncNotificacionRepository
 from app.schemas.notificacion import NotificacionCreate, NotificacionUpdate
 from datetime import datetime
 
@@ -39,4 +40,46 @@ class NotificacionService:
     def delete(self, id: int):
         if not self.repo.delete(id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No encontrado")
+        return True
+
+
+class AsyncNotificacionService:
+    """Versión asíncrona de NotificacionService para el router de notificaciones"""
+    
+    def __init__(self, db: AsyncSession):
+        self.repo = AsyncNotificacionRepository(db)
+    
+    async def create(self, data: NotificacionCreate):
+        return await self.repo.create(data.model_dump())
+    
+    async def get_by_id(self, id: int):
+        obj = await self.repo.get_by_id(id)
+        if not obj:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notificación no encontrada")
+        return obj
+    
+    async def get_by_usuario(self, usuario_id: int, skip: int = 0, limit: int = 100):
+        return await self.repo.get_by_usuario(usuario_id, skip=skip, limit=limit)
+    
+    async def get_page_by_usuario(self, usuario_id: int, after: str = None, limit: int = 100):
+        return await self.repo.get_page_by_usuario(usuario_id, after, limit)
+    
+    async def get_no_leidas(self, usuario_id: int):
+        return await self.repo.get_no_leidas(usuario_id)
+    
+    async def marcar_leida(self, id: int):
+        return await self.repo.update(id, {
+            "leida": True,
+            "fecha_lectura": datetime.now()
+        })
+    
+    async def marcar_todas_leidas(self, usuario_id: int):
+        return await self.repo.marcar_todas_leidas(usuario_id)
+    
+    async def update(self, id: int, data: NotificacionUpdate):
+        return await self.repo.update(id, data.model_dump(exclude_unset=True))
+    
+    async def delete(self, id: int):
+        if not await self.repo.delete(id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No encontrado")
         return True
\ No newline at end of file
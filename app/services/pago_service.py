@@ -1,16 +1,21 @@
 """Service de Pago"""
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.database import UnitOfWork
 from app.repositories.pago import PagoRepository
 from app.repositories.factura import FacturaRepository
+from app.repositories.resumen_diario_ingreso import ResumenDiarioIngresoRepository
 from app.schemas.pago import PagoCreate
+from app.services.reporte_service import invalidar_reportes, REPORTES_FINANCIEROS
 from app.core.constants import EstadoFacturaEnum
 from datetime import datetime
 
 class PagoService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = PagoRepository(db)
         self.factura_repo = FacturaRepository(db)
+        self.resumen_repo = ResumenDiarioIngresoRepository(db)
     
     def create(self, data: PagoCreate):
         # Verificar factura
@@ -18,18 +23,25 @@ class PagoService:
         if not factura:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Factura no encontrada")
         
-        pago = self.repo.create(data.model_dump())
-        
-        # Actualizar estado de factura si el pago cubre el total
+        # Total pagado incluyendo este pago (se consulta antes de registrarlo)
         pagos = self.repo.get_by_factura(factura.id)
-        total_pagado = sum(p.monto for p in pagos)
+        total_pagado = sum(p.monto for p in pagos) + data.monto
         
-        if total_pagado >= factura.total:
-            self.factura_repo.update(factura.id, {
-                "estado": EstadoFacturaEnum.PAGADA,
-                "fecha_pago": datetime.now()
-            })
+        # Pago y cambio de estado de la factura en una sola transacción
+        with UnitOfWork(self.db):
+            pago = self.repo.create(data.model_dump())
+            
+            if total_pagado >= factura.total:
+                estado_anterior = factura.estado
+                self.factura_repo.update(factura.id, {
+                    "estado": EstadoFacturaEnum.PAGADA,
+                    "fecha_pago": datetime.now()
+                })
+                self.resumen_repo.cambiar_estado(factura, estado_anterior)
         
+        # Los reportes solo cambian si la factura pasó a pagada
+        if factura.estado == EstadoFacturaEnum.PAGADA:
+            invalidar_reportes(factura.gimnasio_id, *REPORTES_FINANCIEROS)
         return pago
     
     def get_by_id(self, id: int):
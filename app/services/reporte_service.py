@@ -1,8 +1,12 @@
 """Service de Reportes y Análisis"""
-from typing import List, Dict, Any
+import copy
+import functools
+import inspect
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Sequence
+from decimal import Decimal
 from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
 
 from app.repositories.usuario import UsuarioRepository
 from app.repositories.membresia import MembresiaRepository
@@ -11,26 +15,172 @@ from app.repositories.factura import FacturaRepository
 from app.repositories.producto import ProductoRepository
 from app.repositories.clase import ClaseRepository
 from app.repositories.reserva import ReservaRepository
-from app.core.constants import EstadoMembresiaEnum, EstadoFacturaEnum
+from app.repositories.resumen_diario_acceso import ResumenDiarioAccesoRepository
+from app.repositories.resumen_diario_ingreso import ResumenDiarioIngresoRepository
+from app.repositories.gimnasio import GimnasioRepository
+from app.utils.date_utils import como_fecha
+from app.core.cache import TTLCache, MISSING
+from app.core.config import settings
+from app.core.fanout import fan_out
+from app.core.constants import EstadoFacturaEnum, TipoFacturaEnum, RolEnum, ROLES_ADMIN, ROLES_STAFF
+
+# Resultados de reportes por (gimnasio_id, reporte, argumentos); los de cadena usan gimnasio_id None
+report_cache = TTLCache(ttl=settings.REPORT_CACHE_TTL, max_entries=settings.REPORT_CACHE_MAX_ENTRIES)
+
+# Reportes afectados por cada tipo de escritura (para invalidar_reportes)
+REPORTES_MEMBRESIAS = ("reporte_membresias", "dashboard_general")
+REPORTES_ASISTENCIA = ("reporte_asistencia", "dashboard_general")
+REPORTES_FINANCIEROS = ("reporte_financiero", "dashboard_general")
+
+
+def invalidar_reportes(gimnasio_id: Optional[int], *reportes: str) -> int:
+    """
+    Descarta los reportes en caché de un gimnasio.
+    
+    Args:
+        gimnasio_id: ID del gimnasio (None = todos los gimnasios)
+        *reportes: Nombres de los reportes (ninguno = todos)
+        
+    Returns:
+        Número de entradas descartadas
+    """
+    return report_cache.invalidate(
+        lambda key: (gimnasio_id is None or key[0] == gimnasio_id) and (not reportes or key[1] in reportes)
+    )
+
+
+def _cacheable(method):
+    """
+    Cachea el resultado de un reporte por gimnasio y argumentos.
+    
+    Agrega `cached_at` (momento en que se calculó) y acepta `fresh=True`
+    para recalcularlo ignorando la caché. Los reportes sin `gimnasio_id`
+    (cadena) solo se descartan con invalidar_reportes(None) o al vencer el TTL.
+    Cada llamada recibe una copia profunda: modificar la respuesta no altera
+    la entrada cacheada.
+    """
+    nombre = method.__name__
+    firma = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, fresh: bool = False, **kwargs):
+        if not settings.REPORT_CACHE_ENABLED:
+            return method(self, *args, **kwargs)
+        
+        argumentos = firma.bind(self, *args, **kwargs)
+        argumentos.apply_defaults()
+        gimnasio_id = argumentos.arguments.get("gimnasio_id")
+        key = (gimnasio_id, nombre, tuple(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in argumentos.arguments.items() if k not in ("self", "gimnasio_id")
+        ))
+        
+        if not fresh:
+            resultado = report_cache.get(key)
+            if resultado is not MISSING:
+                return copy.deepcopy(resultado)
+        
+        resultado = {**method(self, *args, **kwargs), "cached_at": datetime.now()}
+        report_cache.set(key, resultado)
+        return copy.deepcopy(resultado)
+    
+    return wrapper
+
+
+# Agrupaciones admitidas para series temporales
+GRANULARIDADES = ("day", "week", "month")
+
+CENTAVOS = Decimal("0.01")
+
+
+def _redondear(monto) -> Decimal:
+    """Redondea un monto a centavos conservando Decimal"""
+    return Decimal(monto).quantize(CENTAVOS)
+
+
+def _dividir_rango(fecha_inicio: date, fecha_fin: date):
+    """
+    Parte un rango en días cerrados (se leen de las tablas de resumen) y el
+    día en curso (se lee de los datos crudos).
+    
+    Returns:
+        (rango_resumen, rango_crudo); cada uno es (inicio, fin) o None
+    """
+    hoy = date.today()
+    rango_resumen = (fecha_inicio, min(fecha_fin, hoy - timedelta(days=1))) if fecha_inicio < hoy else None
+    rango_crudo = (max(fecha_inicio, hoy), fecha_fin) if fecha_fin >= hoy else None
+    return rango_resumen, rango_crudo
+
+
+def _particiones(ids: List[int], tamano: int) -> List[List[int]]:
+    """Parte una lista de ids en bloques de a lo sumo `tamano`"""
+    tamano = max(tamano, 1)
+    return [ids[i:i + tamano] for i in range(0, len(ids), tamano)]
+
+
+def _inicio_periodo(dia: date, granularity: str) -> date:
+    """Primer día del período (día, semana ISO o mes) al que pertenece una fecha"""
+    if granularity == "week":
+        return dia - timedelta(days=dia.weekday())
+    if granularity == "month":
+        return dia.replace(day=1)
+    return dia
+
+
+# Columnas numéricas de cada fila del reporte de cadena
+CAMPOS_CADENA = (
+    "usuarios", "usuarios_activos", "clientes",
+    "membresias_activas", "membresias_vencidas", "proximas_vencer_7_dias",
+    "accesos", "usuarios_unicos",
+    "facturas", "facturado", "pagado", "pendiente",
+)
+MONTOS_CADENA = ("facturado", "pagado", "pendiente")
+
+
+def _fila_cadena(gimnasio_id: int, nombre: str) -> Dict[str, Any]:
+    """Fila en cero de un gimnasio (los que no tienen datos en una sección quedan así)"""
+    fila = {"gimnasio_id": gimnasio_id, "nombre": nombre}
+    for campo in CAMPOS_CADENA:
+        fila[campo] = Decimal("0") if campo in MONTOS_CADENA else 0
+    return fila
+
+
+def _cerrar_fila_cadena(fila: Dict[str, Any]) -> Dict[str, Any]:
+    """Redondea los montos y agrega la tasa de cobranza"""
+    facturado = fila["facturado"]
+    return {
+        **fila,
+        **{campo: _redondear(fila[campo]) for campo in MONTOS_CADENA},
+        "tasa_cobranza": round(float(fila["pagado"] / facturado * 100), 2) if facturado > 0 else 0
+    }
 
 
 class ReporteService:
-    """Servicio para generar reportes y análisis del gimnasio"""
+    """
+    Servicio para generar reportes y análisis del gimnasio.
+    
+    Los reportes se cachean por gimnasio durante REPORT_CACHE_TTL segundos; los
+    servicios que escriben accesos, membresías o facturas los invalidan.
+    """
     
     def __init__(self, db: Session):
         self.db = db
-        self.usuario_repo = UsuarioRepository(db)
-        self.membresia_repo = MembresiaRepository(db)
+        self.usuario_repo = UsuarioRepository(db, profile="report")
+        self.membresia_repo = MembresiaRepository(db, profile="report")
         self.acceso_repo = AccesoRepository(db)
         self.factura_repo = FacturaRepository(db)
         self.producto_repo = ProductoRepository(db)
-        self.clase_repo = ClaseRepository(db)
+        self.clase_repo = ClaseRepository(db, profile="report")
         self.reserva_repo = ReservaRepository(db)
+        self.resumen_acceso_repo = ResumenDiarioAccesoRepository(db)
+        self.resumen_ingreso_repo = ResumenDiarioIngresoRepository(db)
+        self.gimnasio_repo = GimnasioRepository(db)
     
     # ========================================
     # REPORTES DE USUARIOS
     # ========================================
     
+    @_cacheable
     def reporte_usuarios(self, gimnasio_id: int) -> Dict[str, Any]:
         """
         Genera reporte general de usuarios.
@@ -41,23 +191,30 @@ class ReporteService:
         Returns:
             Diccionario con estadísticas de usuarios
         """
-        usuarios = self.usuario_repo.get_by_gimnasio(gimnasio_id, skip=0, limit=10000)
+        # Una fila por rol: el costo no depende del número de usuarios
+        por_rol = {fila.rol: fila for fila in self.usuario_repo.resumen_por_rol(gimnasio_id)}
         
-        total = len(usuarios)
-        activos = len([u for u in usuarios if u.activo])
+        def sumar(campo: str, roles=None) -> int:
+            return sum(
+                int(getattr(fila, campo)) for rol, fila in por_rol.items()
+                if roles is None or rol in roles
+            )
+        
+        total = sumar("total")
+        activos = sumar("activos")
         inactivos = total - activos
         
         # Por rol
-        clientes = len([u for u in usuarios if u.es_cliente()])
-        entrenadores = len([u for u in usuarios if u.es_entrenador()])
-        staff = len([u for u in usuarios if u.es_staff()])
-        admins = len([u for u in usuarios if u.es_admin()])
+        clientes = sumar("total", [RolEnum.CLIENTE.value])
+        entrenadores = sumar("total", [RolEnum.ENTRENADOR.value])
+        staff = sumar("total", [r.value for r in ROLES_STAFF])
+        admins = sumar("total", [r.value for r in ROLES_ADMIN])
         
         # Por género
-        hombres = len([u for u in usuarios if u.genero and u.genero.value == 'M'])
-        mujeres = len([u for u in usuarios if u.genero and u.genero.value == 'F'])
-        otros = len([u for u in usuarios if u.genero and u.genero.value == 'OTRO'])
-        sin_genero = len([u for u in usuarios if not u.genero])
+        hombres = sumar("masculino")
+        mujeres = sumar("femenino")
+        otros = sumar("otro")
+        sin_genero = sumar("sin_genero")
         
         return {
             "total_usuarios": total,
@@ -81,6 +238,7 @@ class ReporteService:
     # REPORTES DE MEMBRESÍAS
     # ========================================
     
+    @_cacheable
     def reporte_membresias(self, gimnasio_id: int) -> Dict[str, Any]:
         """
         Genera reporte de membresías.
@@ -91,37 +249,13 @@ class ReporteService:
         Returns:
             Diccionario con estadísticas de membresías
         """
-        from app.models.membresia import Membresia
-        
-        # Total de membresías
-        total = self.db.query(Membresia).join(Membresia.usuario).filter(
-            Membresia.usuario.has(gimnasio_id=gimnasio_id)
-        ).count()
-        
-        # Por estado
-        activas = self.db.query(Membresia).join(Membresia.usuario).filter(
-            and_(
-                Membresia.usuario.has(gimnasio_id=gimnasio_id),
-                Membresia.estado == EstadoMembresiaEnum.ACTIVA
-            )
-        ).count()
-        
-        vencidas = self.db.query(Membresia).join(Membresia.usuario).filter(
-            and_(
-                Membresia.usuario.has(gimnasio_id=gimnasio_id),
-                Membresia.estado == EstadoMembresiaEnum.VENCIDA
-            )
-        ).count()
-        
-        canceladas = self.db.query(Membresia).join(Membresia.usuario).filter(
-            and_(
-                Membresia.usuario.has(gimnasio_id=gimnasio_id),
-                Membresia.estado == EstadoMembresiaEnum.CANCELADA
-            )
-        ).count()
-        
-        # Próximas a vencer (7 días)
-        proximas_vencer = len(self.membresia_repo.get_proximas_vencer(dias=7))
+        # Totales, estados y próximas a vencer (7 días) en una sola pasada
+        resumen = self.membresia_repo.resumen_por_estado(gimnasio_id, dias_proximas_vencer=7)
+        total = int(resumen.total)
+        activas = int(resumen.activas)
+        vencidas = int(resumen.vencidas)
+        canceladas = int(resumen.canceladas)
+        proximas_vencer = int(resumen.proximas_vencer)
         
         return {
             "total_membresias": total,
@@ -138,6 +272,7 @@ class ReporteService:
     # REPORTES DE ASISTENCIA
     # ========================================
     
+    @_cacheable
     def reporte_asistencia(
         self,
         gimnasio_id: int,
@@ -160,41 +295,50 @@ class ReporteService:
         if not fecha_inicio:
             fecha_inicio = fecha_fin - timedelta(days=30)
         
-        from app.models.acceso import Acceso
-        
-        # Total de accesos en el período
-        total_accesos = self.db.query(Acceso).filter(
-            and_(
-                Acceso.gimnasio_id == gimnasio_id,
-                func.date(Acceso.fecha_hora_entrada) >= fecha_inicio,
-                func.date(Acceso.fecha_hora_entrada) <= fecha_fin
-            )
-        ).count()
+        rango_resumen, rango_crudo = _dividir_rango(fecha_inicio, fecha_fin)
+        accesos_por_dia = {}
+        usuarios_por_dia = {}
+        
+        # Días cerrados: una fila por día del resumen diario
+        if rango_resumen:
+            for fila in self.resumen_acceso_repo.por_dia(gimnasio_id, *rango_resumen):
+                dia = como_fecha(fila.fecha)
+                accesos_por_dia[dia] = int(fila.entradas)
+                usuarios_por_dia[dia] = int(fila.usuarios_unicos)
+        
+        # Día en curso: accesos crudos agrupados por día (COUNT y COUNT DISTINCT en SQL)
+        if rango_crudo:
+            for fila in self.acceso_repo.conteo_por_dia(gimnasio_id, *rango_crudo):
+                dia = como_fecha(fila.fecha)
+                accesos_por_dia[dia] = int(fila.total)
+                usuarios_por_dia[dia] = int(fila.usuarios_unicos)
+        
+        # Los únicos del período no se obtienen sumando los de cada día: si hubo
+        # accesos en más de un día hay que contarlos sobre los accesos crudos
+        dias_con_accesos = [dia for dia, total in accesos_por_dia.items() if total]
+        if len(dias_con_accesos) > 1:
+            usuarios_unicos = self.acceso_repo.contar_usuarios_unicos(gimnasio_id, fecha_inicio, fecha_fin)
+        else:
+            usuarios_unicos = sum(usuarios_por_dia.get(dia, 0) for dia in dias_con_accesos)
+        
+        total_accesos = sum(accesos_por_dia.values())
         
         # Promedio diario
         dias_periodo = (fecha_fin - fecha_inicio).days + 1
         promedio_diario = round(total_accesos / dias_periodo, 2) if dias_periodo > 0 else 0
         
-        # Usuarios únicos
-        usuarios_unicos = self.db.query(func.count(func.distinct(Acceso.usuario_id))).filter(
-            and_(
-                Acceso.gimnasio_id == gimnasio_id,
-                func.date(Acceso.fecha_hora_entrada) >= fecha_inicio,
-                func.date(Acceso.fecha_hora_entrada) <= fecha_fin
-            )
-        ).scalar()
+        # Serie completa (días sin accesos incluidos)
+        por_dia = [
+            {
+                "fecha": dia,
+                "total": accesos_por_dia.get(dia, 0),
+                "usuarios_unicos": usuarios_por_dia.get(dia, 0)
+            }
+            for dia in (fecha_inicio + timedelta(days=i) for i in range(max(dias_periodo, 0)))
+        ]
         
         # Día con más asistencia
-        dia_mas_asistencia = self.db.query(
-            func.date(Acceso.fecha_hora_entrada).label('fecha'),
-            func.count(Acceso.id).label('total')
-        ).filter(
-            and_(
-                Acceso.gimnasio_id == gimnasio_id,
-                func.date(Acceso.fecha_hora_entrada) >= fecha_inicio,
-                func.date(Acceso.fecha_hora_entrada) <= fecha_fin
-            )
-        ).group_by(func.date(Acceso.fecha_hora_entrada)).order_by(func.count(Acceso.id).desc()).first()
+        dia_mas_asistencia = max(accesos_por_dia.items(), key=lambda item: item[1], default=None)
         
         return {
             "periodo": {
@@ -206,20 +350,23 @@ class ReporteService:
             "promedio_diario": promedio_diario,
             "usuarios_unicos": usuarios_unicos,
             "dia_mas_concurrido": {
-                "fecha": dia_mas_asistencia.fecha if dia_mas_asistencia else None,
-                "total": dia_mas_asistencia.total if dia_mas_asistencia else 0
-            }
+                "fecha": dia_mas_asistencia[0] if dia_mas_asistencia else None,
+                "total": dia_mas_asistencia[1] if dia_mas_asistencia else 0
+            },
+            "por_dia": por_dia
         }
     
     # ========================================
     # REPORTES FINANCIEROS
     # ========================================
     
+    @_cacheable
     def reporte_financiero(
         self,
         gimnasio_id: int,
         fecha_inicio: date = None,
-        fecha_fin: date = None
+        fecha_fin: date = None,
+        granularity: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Genera reporte financiero.
@@ -228,59 +375,113 @@ class ReporteService:
             gimnasio_id: ID del gimnasio
             fecha_inicio: Fecha de inicio (por defecto: primer día del mes)
             fecha_fin: Fecha de fin (por defecto: hoy)
+            granularity: Agrega una serie temporal por 'day', 'week' o 'month' (opcional)
             
         Returns:
-            Diccionario con estadísticas financieras
+            Diccionario con estadísticas financieras (montos en Decimal)
         """
         if not fecha_fin:
             fecha_fin = date.today()
         if not fecha_inicio:
             fecha_inicio = date(fecha_fin.year, fecha_fin.month, 1)
-        
-        from app.models.factura import Factura
-        
-        # Facturas del período
-        facturas = self.db.query(Factura).filter(
-            and_(
-                Factura.gimnasio_id == gimnasio_id,
-                func.date(Factura.fecha_emision) >= fecha_inicio,
-                func.date(Factura.fecha_emision) <= fecha_fin
-            )
-        ).all()
-        
-        # Totales
-        total_facturado = sum(float(f.total) for f in facturas)
-        total_pagado = sum(float(f.total) for f in facturas if f.estado == EstadoFacturaEnum.PAGADA)
-        total_pendiente = sum(float(f.total) for f in facturas if f.estado == EstadoFacturaEnum.PENDIENTE)
-        
-        # Por tipo
-        membresias = sum(float(f.total) for f in facturas if f.tipo.value == 'MEMBRESIA')
-        productos = sum(float(f.total) for f in facturas if f.tipo.value == 'PRODUCTO')
-        servicios = sum(float(f.total) for f in facturas if f.tipo.value == 'SERVICIO')
-        
-        return {
+        if granularity is not None and granularity not in GRANULARIDADES:
+            raise ValueError(f"granularity debe ser uno de: {', '.join(GRANULARIDADES)}")
+        
+        # Una fila por (estado, tipo): el costo depende de los grupos, no de las facturas.
+        # Los días cerrados salen del resumen diario y el día en curso de las facturas
+        rango_resumen, rango_crudo = _dividir_rango(fecha_inicio, fecha_fin)
+        grupos = []
+        if rango_resumen:
+            grupos += self.resumen_ingreso_repo.resumen_por_estado_tipo(gimnasio_id, *rango_resumen)
+        if rango_crudo:
+            grupos += self.factura_repo.resumen_por_estado_tipo(gimnasio_id, *rango_crudo)
+        
+        total_facturas = sum(g.cantidad for g in grupos)
+        por_estado = {estado.value: Decimal("0") for estado in EstadoFacturaEnum}
+        por_tipo = {tipo.value: Decimal("0") for tipo in TipoFacturaEnum}
+        for g in grupos:
+            por_estado[g.estado.value] += g.total
+            por_tipo[g.tipo.value] += g.total
+        
+        total_facturado = sum(por_estado.values(), Decimal("0"))
+        total_pagado = por_estado[EstadoFacturaEnum.PAGADA.value]
+        total_pendiente = por_estado[EstadoFacturaEnum.PENDIENTE.value]
+        
+        reporte = {
             "periodo": {
                 "fecha_inicio": fecha_inicio,
                 "fecha_fin": fecha_fin
             },
-            "total_facturas": len(facturas),
+            "total_facturas": total_facturas,
             "totales": {
-                "facturado": round(total_facturado, 2),
-                "pagado": round(total_pagado, 2),
-                "pendiente": round(total_pendiente, 2)
+                "facturado": _redondear(total_facturado),
+                "pagado": _redondear(total_pagado),
+                "pendiente": _redondear(total_pendiente)
             },
+            "por_estado": {estado: _redondear(monto) for estado, monto in por_estado.items()},
             "por_tipo": {
-                "membresias": round(membresias, 2),
-                "productos": round(productos, 2),
-                "servicios": round(servicios, 2)
+                "membresias": _redondear(por_tipo[TipoFacturaEnum.MEMBRESIA.value]),
+                "productos": _redondear(por_tipo[TipoFacturaEnum.PRODUCTO.value]),
+                "mixtas": _redondear(por_tipo[TipoFacturaEnum.MIXTA.value])
             },
-            "tasa_cobranza": round((total_pagado / total_facturado * 100), 2) if total_facturado > 0 else 0
+            "tasa_cobranza": round(float(total_pagado / total_facturado * 100), 2) if total_facturado > 0 else 0
         }
+        
+        if granularity:
+            reporte["serie"] = self._serie_financiera(gimnasio_id, fecha_inicio, fecha_fin, granularity)
+        
+        return reporte
+    
+    def _serie_financiera(
+        self,
+        gimnasio_id: int,
+        fecha_inicio: date,
+        fecha_fin: date,
+        granularity: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Serie temporal de facturación por día, semana (lunes) o mes.
+        
+        La base de datos agrupa por día (resumen diario para los días cerrados,
+        facturas para el día en curso) y aquí solo se acumulan esas filas en el
+        período correspondiente.
+        """
+        periodos: Dict[date, Dict[str, Any]] = {}
+        dia = fecha_inicio
+        while dia <= fecha_fin:
+            inicio = _inicio_periodo(dia, granularity)
+            periodos.setdefault(inicio, {
+                "periodo": inicio,
+                "facturas": 0,
+                "facturado": Decimal("0"),
+                "pagado": Decimal("0")
+            })
+            dia += timedelta(days=1)
+        
+        rango_resumen, rango_crudo = _dividir_rango(fecha_inicio, fecha_fin)
+        filas = []
+        if rango_resumen:
+            filas += self.resumen_ingreso_repo.totales_por_dia(gimnasio_id, *rango_resumen)
+        if rango_crudo:
+            filas += self.factura_repo.totales_por_dia(gimnasio_id, *rango_crudo)
+        
+        for fila in filas:
+            dia = como_fecha(fila.fecha)
+            periodo = periodos[_inicio_periodo(dia, granularity)]
+            periodo["facturas"] += fila.cantidad
+            periodo["facturado"] += Decimal(fila.facturado)
+            periodo["pagado"] += Decimal(fila.pagado)
+        
+        return [
+            {**p, "facturado": _redondear(p["facturado"]), "pagado": _redondear(p["pagado"])}
+            for p in periodos.values()
+        ]
     
     # ========================================
     # REPORTES DE CLASES
     # ========================================
     
+    @_cacheable
     def reporte_clases(self, gimnasio_id: int) -> Dict[str, Any]:
         """
         Genera reporte de clases grupales.
@@ -313,6 +514,7 @@ class ReporteService:
     # REPORTES DE PRODUCTOS
     # ========================================
     
+    @_cacheable
     def reporte_inventario(self, gimnasio_id: int) -> Dict[str, Any]:
         """
         Genera reporte de inventario de productos.
@@ -348,6 +550,7 @@ class ReporteService:
     # DASHBOARD GENERAL
     # ========================================
     
+    @_cacheable
     def dashboard_general(self, gimnasio_id: int) -> Dict[str, Any]:
         """
         Genera resumen para dashboard principal.
@@ -358,37 +561,126 @@ class ReporteService:
         Returns:
             Diccionario con métricas principales
         """
-        # Usuarios
-        total_usuarios = self.usuario_repo.count({"gimnasio_id": gimnasio_id})
-        usuarios_activos = self.usuario_repo.get_activos(gimnasio_id, skip=0, limit=10000)
-        
-        # Membresías
-        membresias_activas = self.db.query(func.count()).select_from(
-            self.db.query(self.membresia_repo.model).join(
-                self.membresia_repo.model.usuario
-            ).filter(
-                and_(
-                    self.membresia_repo.model.usuario.has(gimnasio_id=gimnasio_id),
-                    self.membresia_repo.model.estado == EstadoMembresiaEnum.ACTIVA
-                )
-            ).subquery()
-        ).scalar()
-        
-        # Usuarios en gimnasio ahora
-        usuarios_presentes = len(self.acceso_repo.get_usuarios_en_gimnasio(gimnasio_id))
-        
-        # Ingresos del mes
         hoy = date.today()
         primer_dia_mes = date(hoy.year, hoy.month, 1)
-        reporte_fin = self.reporte_financiero(gimnasio_id, primer_dia_mes, hoy)
+        
+        # Fragmentos independientes: cada uno en su propia sesión y en paralelo,
+        # así la latencia en frío es la de la query más lenta y no la suma
+        fragmentos = fan_out({
+            "usuarios": lambda db: UsuarioRepository(db).resumen_por_rol(gimnasio_id),
+            "membresias": lambda db: MembresiaRepository(db).resumen_por_estado(gimnasio_id),
+            "presentes": lambda db: AccesoRepository(db).contar_en_gimnasio(gimnasio_id),
+            # Ingresos del mes (reutiliza la caché del reporte financiero)
+            "financiero": lambda db: ReporteService(db).reporte_financiero(gimnasio_id, primer_dia_mes, hoy),
+        }, db=self.db)
+        
+        por_rol = fragmentos["usuarios"]
         
         return {
             "usuarios": {
-                "total": total_usuarios,
-                "activos": len(usuarios_activos),
-                "presentes_ahora": usuarios_presentes
+                "total": sum(int(fila.total) for fila in por_rol),
+                "activos": sum(int(fila.activos) for fila in por_rol),
+                "presentes_ahora": fragmentos["presentes"]
             },
-            "membresias_activas": membresias_activas,
-            "ingresos_mes": reporte_fin["totales"]["pagado"],
+            "membresias_activas": int(fragmentos["membresias"].activas),
+            "ingresos_mes": fragmentos["financiero"]["totales"]["pagado"],
             "fecha_actualizacion": datetime.now()
-        }
\ No newline at end of file
+        }
+    
+    # ========================================
+    # REPORTES DE CADENA
+    # ========================================
+    
+    @_cacheable
+    def reporte_cadena(
+        self,
+        gimnasio_ids: Optional[Sequence[int]] = None,
+        fecha_inicio: date = None,
+        fecha_fin: date = None
+    ) -> Dict[str, Any]:
+        """
+        Genera el reporte consolidado de varios gimnasios (super_admin).
+        
+        Cada sección es una sola query agrupada por gimnasio en lugar de un
+        reporte por gimnasio. Con muchos gimnasios los ids se parten en bloques
+        de REPORT_CHAIN_PARTITION_SIZE y cada (sección, bloque) es un fragmento
+        del fan-out, así que los bloques se consultan en paralelo.
+        
+        Args:
+            gimnasio_ids: IDs de los gimnasios (por defecto: todos los activos)
+            fecha_inicio: Inicio del período de asistencia e ingresos (por defecto: primer día del mes)
+            fecha_fin: Fin del período (por defecto: hoy)
+        
+        Returns:
+            Diccionario con una fila por gimnasio y los totales de la cadena
+        """
+        if not fecha_fin:
+            fecha_fin = date.today()
+        if not fecha_inicio:
+            fecha_inicio = date(fecha_fin.year, fecha_fin.month, 1)
+        
+        gimnasios = self.gimnasio_repo.get_nombres(list(gimnasio_ids) if gimnasio_ids is not None else None)
+        filas = {g.id: _fila_cadena(g.id, g.nombre) for g in gimnasios}
+        
+        rango_resumen, rango_crudo = _dividir_rango(fecha_inicio, fecha_fin)
+        fragmentos = {}
+        for n, bloque in enumerate(_particiones(list(filas), settings.REPORT_CHAIN_PARTITION_SIZE)):
+            fragmentos[f"usuarios:{n}"] = lambda db, ids=bloque: UsuarioRepository(db).resumen_por_gimnasio(ids)
+            fragmentos[f"membresias:{n}"] = lambda db, ids=bloque: MembresiaRepository(db).resumen_por_gimnasio(ids)
+            # Los únicos del período obligan a leer los accesos del rango (no se
+            # suman entre días), y ese mismo recorrido da las entradas
+            fragmentos[f"asistencia:{n}"] = (
+                lambda db, ids=bloque: AccesoRepository(db).resumen_por_gimnasio(ids, fecha_inicio, fecha_fin)
+            )
+            if rango_resumen:
+                fragmentos[f"ingresos:resumen:{n}"] = (
+                    lambda db, ids=bloque: ResumenDiarioIngresoRepository(db).resumen_por_gimnasio_estado(ids, *rango_resumen)
+                )
+            if rango_crudo:
+                fragmentos[f"ingresos:crudo:{n}"] = (
+                    lambda db, ids=bloque: FacturaRepository(db).resumen_por_gimnasio_estado(ids, *rango_crudo)
+                )
+        
+        secciones = defaultdict(list)
+        for clave, resultado in (fan_out(fragmentos, db=self.db) if fragmentos else {}).items():
+            secciones[clave.split(":")[0]].extend(resultado)
+        
+        for r in secciones["usuarios"]:
+            fila = filas[r.gimnasio_id]
+            fila["usuarios"] = int(r.total)
+            fila["usuarios_activos"] = int(r.activos)
+            fila["clientes"] = int(r.clientes)
+        for r in secciones["membresias"]:
+            fila = filas[r.gimnasio_id]
+            fila["membresias_activas"] = int(r.activas)
+            fila["membresias_vencidas"] = int(r.vencidas)
+            fila["proximas_vencer_7_dias"] = int(r.proximas_vencer)
+        for r in secciones["asistencia"]:
+            fila = filas[r.gimnasio_id]
+            fila["accesos"] = int(r.entradas)
+            fila["usuarios_unicos"] = int(r.usuarios_unicos)
+        for r in secciones["ingresos"]:
+            fila = filas[r.gimnasio_id]
+            fila["facturas"] += int(r.cantidad)
+            fila["facturado"] += Decimal(r.total)
+            if r.estado == EstadoFacturaEnum.PAGADA:
+                fila["pagado"] += Decimal(r.total)
+            elif r.estado == EstadoFacturaEnum.PENDIENTE:
+                fila["pendiente"] += Decimal(r.total)
+        
+        # Los usuarios únicos no se suman entre gimnasios (un cliente puede entrar en varios)
+        totales = {
+            campo: sum((fila[campo] for fila in filas.values()), Decimal("0") if campo in MONTOS_CADENA else 0)
+            for campo in CAMPOS_CADENA if campo != "usuarios_unicos"
+        }
+        
+        return {
+            "periodo": {
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin
+            },
+            "total_gimnasios": len(filas),
+            "gimnasios": [_cerrar_fila_cadena(fila) for fila in filas.values()],
+            "totales": _cerrar_fila_cadena(totales)
+        }
+
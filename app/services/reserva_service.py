@@ -1,7 +1,8 @@
 """Service de Reserva"""
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from app.repositories.reserva import ReservaRepository
+from app.repositories.reserva import ReservaRepository, AsyncReservaRepository
 from app.repositories.clase_horario import ClaseHorarioRepository
 from app.schemas.reserva import ReservaCreate, ReservaUpdate
 
@@ -37,4 +38,35 @@ class ReservaService:
     def delete(self, id: int):
         if not self.repo.delete(id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No encontrado")
+        return True
+
+
+class AsyncReservaService:
+    """Versión asíncrona de ReservaService para el router de reservas"""
+    
+    def __init__(self, db: AsyncSession):
+        self.repo = AsyncReservaRepository(db)
+    
+    async def create(self, data: ReservaCreate):
+        # Verificar si ya tiene reserva
+        if await self.repo.tiene_reserva(data.usuario_id, data.clase_horario_id, data.fecha_reserva):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ya tienes una reserva para esta clase")
+        
+        return await self.repo.create(data.model_dump())
+    
+    async def get_by_id(self, id: int):
+        obj = await self.repo.get_by_id(id)
+        if not obj:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reserva no encontrada")
+        return obj
+    
+    async def get_by_usuario(self, usuario_id: int):
+        return await self.repo.get_by_usuario(usuario_id)
+    
+    async def update(self, id: int, data: ReservaUpdate):
+        return await self.repo.update(id, data.model_dump(exclude_unset=True))
+    
+    async def delete(self, id: int):
+        if not await self.repo.delete(id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No encontrado")
         return True
\ No newline at end of file
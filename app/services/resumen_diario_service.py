@@ -0,0 +1,99 @@
+"""Service de Resúmenes Diarios (accesos e ingresos)"""
+from datetime import date
+from typing import Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.database import UnitOfWork
+from app.repositories.acceso import AccesoRepository
+from app.repositories.factura import FacturaRepository
+from app.repositories.resumen_diario_acceso import ResumenDiarioAccesoRepository
+from app.repositories.resumen_diario_ingreso import ResumenDiarioIngresoRepository
+from app.utils.date_utils import como_fecha
+
+
+class ResumenDiarioService:
+    """
+    Reconstrucción de las tablas de resumen a partir de los datos crudos.
+    
+    El mantenimiento normal es incremental (AccesoService, FacturaService y
+    PagoService); esto sirve para el backfill inicial y para corregir
+    desviaciones (ver scripts/rebuild_resumenes.py).
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.acceso_repo = AccesoRepository(db)
+        self.factura_repo = FacturaRepository(db)
+        self.resumen_acceso_repo = ResumenDiarioAccesoRepository(db)
+        self.resumen_ingreso_repo = ResumenDiarioIngresoRepository(db)
+    
+    def reconstruir_accesos(self, fecha_inicio: date, fecha_fin: date, gimnasio_id: Optional[int] = None) -> int:
+        """
+        Recalcula resumen_diario_accesos para el rango (ambos días incluidos).
+        
+        Returns:
+            Número de filas de resumen generadas
+        """
+        filas: Dict[Tuple[int, date, int], dict] = {}
+        dia_actual = None
+        vistos_hoy = set()
+        
+        # Ordenado por entrada: basta con recordar los usuarios del día en curso
+        for acceso in self.acceso_repo.iter_entradas(fecha_inicio, fecha_fin, gimnasio_id):
+            entrada = acceso.fecha_hora_entrada
+            if entrada.date() != dia_actual:
+                dia_actual = entrada.date()
+                vistos_hoy.clear()
+            
+            clave = (acceso.gimnasio_id, dia_actual, entrada.hour)
+            fila = filas.setdefault(clave, {
+                "gimnasio_id": acceso.gimnasio_id,
+                "fecha": dia_actual,
+                "hora": entrada.hour,
+                "entradas": 0,
+                "usuarios_unicos": 0,
+                "visitas_cerradas": 0,
+                "minutos_estancia": 0,
+            })
+            fila["entradas"] += 1
+            if (acceso.gimnasio_id, acceso.usuario_id) not in vistos_hoy:
+                vistos_hoy.add((acceso.gimnasio_id, acceso.usuario_id))
+                fila["usuarios_unicos"] += 1
+            if acceso.fecha_hora_salida:
+                fila["visitas_cerradas"] += 1
+                # Mismo cálculo que Acceso.duracion_minutos
+                fila["minutos_estancia"] += int((acceso.fecha_hora_salida - entrada).total_seconds() / 60)
+        
+        return self.resumen_acceso_repo.reemplazar_rango(list(filas.values()), fecha_inicio, fecha_fin, gimnasio_id)
+    
+    def reconstruir_ingresos(self, fecha_inicio: date, fecha_fin: date, gimnasio_id: Optional[int] = None) -> int:
+        """
+        Recalcula resumen_diario_ingresos para el rango (ambos días incluidos).
+        
+        Returns:
+            Número de filas de resumen generadas
+        """
+        filas = [
+            {
+                "gimnasio_id": grupo.gimnasio_id,
+                "fecha": como_fecha(grupo.fecha),
+                "tipo": grupo.tipo,
+                "estado": grupo.estado,
+                "cantidad": grupo.cantidad,
+                "total": grupo.total,
+            }
+            for grupo in self.factura_repo.resumen_diario(fecha_inicio, fecha_fin, gimnasio_id)
+        ]
+        return self.resumen_ingreso_repo.reemplazar_rango(filas, fecha_inicio, fecha_fin, gimnasio_id)
+    
+    def reconstruir(self, fecha_inicio: date, fecha_fin: date, gimnasio_id: Optional[int] = None) -> Dict[str, int]:
+        """
+        Recalcula ambos resúmenes en una sola transacción.
+        
+        Returns:
+            Filas generadas por tabla
+        """
+        with UnitOfWork(self.db):
+            accesos = self.reconstruir_accesos(fecha_inicio, fecha_fin, gimnasio_id)
+            ingresos = self.reconstruir_ingresos(fecha_inicio, fecha_fin, gimnasio_id)
+        
+        return {"resumen_diario_accesos": accesos, "resumen_diario_ingresos": ingresos}
@@ -0,0 +1,171 @@
+"""Service de revocación de tokens: logout, cierre forzado de sesiones y sincronización por worker"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logging import get_logger
+from app.core.token_revocation import Revocacion, RevocationList, revocation_list
+from app.repositories.token_revocado import TokenRevocadoRepository
+
+logger = get_logger(__name__)
+
+# Filas por lote al leer el delta de la tabla
+SYNC_BATCH_SIZE = 1000
+
+
+def _timestamp(fecha: datetime) -> float:
+    """Timestamp de una fecha UTC sin zona (como `exp` / `iat` del JWT)"""
+    return fecha.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _revocacion(fila) -> Revocacion:
+    return Revocacion(
+        id=fila.id,
+        jti=fila.jti,
+        usuario_id=fila.usuario_id,
+        revocado_desde=_timestamp(fila.revocado_desde),
+        expira=_timestamp(fila.fecha_expiracion),
+    )
+
+
+class TokenRevocacionService:
+    """
+    Escribe las revocaciones en `tokens_revocados` y las aplica al instante
+    en la copia de este proceso; los demás workers las ven en su siguiente
+    sincronización (TOKEN_REVOCATION_SYNC_INTERVAL).
+    """
+    
+    def __init__(self, db: Session, revocaciones: Optional[RevocationList] = None):
+        self.db = db
+        self.repo = TokenRevocadoRepository(db)
+        self.revocaciones = revocaciones if revocaciones is not None else revocation_list
+    
+    def revocar_token(self, payload: dict, motivo: str = "logout") -> bool:
+        """
+        Revoca un token concreto hasta su expiración.
+        
+        Args:
+            payload: Claims ya verificados del token
+            motivo: Motivo que queda registrado
+        
+        Returns:
+            False si el token no tiene `jti` (emitido antes de existir la revocación)
+        """
+        jti = payload.get("jti")
+        if not jti:
+            return False
+        
+        expira = datetime.utcfromtimestamp(payload["exp"])
+        self.repo.create({
+            "jti": jti,
+            "usuario_id": int(payload["sub"]) if payload.get("sub") else None,
+            "motivo": motivo,
+            "revocado_desde": datetime.utcnow(),
+            "fecha_expiracion": expira,
+        })
+        self.revocaciones.revocar_jti(jti, _timestamp(expira))
+        return True
+    
+    def cerrar_sesiones(self, usuario_id: int, motivo: str = "cierre_forzado") -> None:
+        """
+        Revoca todos los tokens (access y refresh) emitidos hasta ahora para un usuario.
+        
+        La fila vale hasta que expire el refresh token más largo que pudo emitirse.
+        """
+        ahora = datetime.utcnow()
+        expira = ahora + max(
+            timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        self.repo.create({
+            "jti": None,
+            "usuario_id": usuario_id,
+            "motivo": motivo,
+            "revocado_desde": ahora,
+            "fecha_expiracion": expira,
+        })
+        self.revocaciones.revocar_usuario(usuario_id, _timestamp(ahora), _timestamp(expira))
+    
+    def sincronizar(self) -> int:
+        """
+        Aplica las revocaciones escritas desde la última sincronización (por id).
+        
+        Returns:
+            Número de filas nuevas
+        """
+        total = 0
+        while True:
+            filas = self.repo.get_desde(self.revocaciones.cursor, limit=SYNC_BATCH_SIZE)
+            total += self.revocaciones.aplicar(_revocacion(f) for f in filas)
+            if len(filas) < SYNC_BATCH_SIZE:
+                return total
+    
+    def recargar(self) -> int:
+        """
+        Purga las revocaciones vencidas y recarga la tabla completa.
+        
+        Returns:
+            Número de revocaciones vigentes
+        """
+        ahora = datetime.utcnow()
+        self.repo.eliminar_expirados(ahora)
+        filas = [_revocacion(f) for f in self.repo.get_vigentes(ahora)]
+        self.revocaciones.reemplazar(filas, _timestamp(ahora))
+        return len(filas)
+
+
+class SincronizadorRevocaciones:
+    """
+    Hilo que mantiene la copia en memoria de este proceso al día: un delta
+    cada `interval` segundos y una recarga completa cada `full_interval`.
+    """
+    
+    def __init__(self, interval: Optional[float] = None, full_interval: Optional[int] = None):
+        self.interval = interval if interval is not None else settings.TOKEN_REVOCATION_SYNC_INTERVAL
+        self.full_interval = full_interval if full_interval is not None else settings.TOKEN_REVOCATION_FULL_SYNC_INTERVAL
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_full = 0.0
+    
+    def start(self) -> None:
+        """Carga las revocaciones vigentes (bloquea) y arranca el hilo"""
+        try:
+            self.ejecutar(force_full=True)
+        except Exception as e:
+            # Sin base al arrancar: el hilo reintenta en la siguiente vuelta
+            logger.error(f"No se pudieron cargar los tokens revocados: {e}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="token-revocation-sync", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def ejecutar(self, force_full: bool = False) -> None:
+        """Una vuelta de sincronización (completa si toca o si `force_full`)"""
+        db = SessionLocal()
+        try:
+            service = TokenRevocacionService(db)
+            if force_full or time.monotonic() - self._last_full >= self.full_interval:
+                vigentes = service.recargar()
+                self._last_full = time.monotonic()
+                logger.info(f"Tokens revocados recargados: {vigentes} vigentes")
+            else:
+                service.sincronizar()
+        finally:
+            db.close()
+    
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.ejecutar()
+            except Exception as e:
+                # Un error de conexión no debe matar el hilo: se reintenta tras la espera
+                logger.error(f"Error sincronizando tokens revocados: {e}")
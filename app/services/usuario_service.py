@@ -1,16 +1,20 @@
 """Service de Usuario"""
+from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.usuario import UsuarioRepository
 from app.repositories.gimnasio import GimnasioRepository
 from app.repositories.rol import RolRepository
-from app.schemas.usuario import UsuarioCreate, UsuarioUpdate
-from app.core.security import get_password_hash, validate_password_strength
+from app.schemas.usuario import UsuarioCreate, UsuarioUpdate, UsuarioResponse
+from app.core.security import validate_password_strength
+from app.core.password_hasher import password_hasher
+from app.core.auth_context import invalidar_usuario
+from app.services.token_revocacion_service import TokenRevocacionService
 
 class UsuarioService:
     def __init__(self, db: Session):
         self.db = db
-        self.repo = UsuarioRepository(db)
+        self.repo = UsuarioRepository(db, profile="list")
         self.gimnasio_repo = GimnasioRepository(db)
         self.rol_repo = RolRepository(db)
     
@@ -44,12 +48,12 @@ class UsuarioService:
             )
         
         usuario_data = data.model_dump(exclude={"password"})
-        usuario_data["password_hash"] = get_password_hash(data.password)
+        usuario_data["password_hash"] = password_hasher.hash_sync(data.password)
         
         return self.repo.create(usuario_data)
     
     def get_by_id(self, id: int):
-        usuario = self.repo.get_by_id(id)
+        usuario = self.repo.with_profile("detail").get_by_id(id)
         if not usuario:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -58,7 +62,10 @@ class UsuarioService:
         return usuario
     
     def get_all(self, gimnasio_id: int, skip: int = 0, limit: int = 100):
-        return self.repo.get_by_gimnasio(gimnasio_id, skip, limit)
+        """Lista de usuarios como filas con solo las columnas de UsuarioResponse"""
+        return self.repo.select_columns(
+            UsuarioResponse.model_fields, gimnasio_id=gimnasio_id, skip=skip, limit=limit
+        )
     
     def get_clientes(self, gimnasio_id: int, skip: int = 0, limit: int = 100):
         return self.repo.get_clientes(gimnasio_id, skip, limit)
@@ -69,7 +76,10 @@ class UsuarioService:
     def update(self, id: int, data: UsuarioUpdate):
         usuario = self.get_by_id(id)
         update_data = data.model_dump(exclude_unset=True)
-        return self.repo.update(id, update_data)
+        usuario = self.repo.update(id, update_data)
+        # Una desactivación debe cortar el acceso ya, no al vencer la caché de estado
+        invalidar_usuario(id)
+        return usuario
     
     def delete(self, id: int):
         if not self.repo.delete(id):
@@ -77,4 +87,22 @@ class UsuarioService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Usuario no encontrado"
             )
+        invalidar_usuario(id)
+        return True
+    
+    def cerrar_sesiones(self, id: int, gimnasio_id: Optional[int] = None):
+        """
+        Revoca todos los tokens emitidos para el usuario (cierre forzado).
+        
+        Args:
+            id: ID del usuario
+            gimnasio_id: Si se indica, el usuario debe pertenecer a ese gimnasio
+        """
+        usuario = self.repo.get_by_id(id)
+        if not usuario or (gimnasio_id is not None and usuario.gimnasio_id != gimnasio_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuario no encontrado"
+            )
+        TokenRevocacionService(self.db).cerrar_sesiones(id)
         return True
\ No newline at end of file
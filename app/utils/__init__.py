@@ -31,7 +31,11 @@ from app.utils.file_handler import (
 from app.utils.pagination import (
     Paginator,
     paginar,
-    PaginationParams
+    paginar_cursor,
+    PaginationParams,
+    CursorParams,
+    encode_cursor,
+    decode_cursor
 )
 
 from app.utils.pdf_generator import (
@@ -73,7 +77,11 @@ __all__ = [
     # Pagination
     "Paginator",
     "paginar",
+    "paginar_cursor",
     "PaginationParams",
+    "CursorParams",
+    "encode_cursor",
+    "decode_cursor",
     # PDF Generator
     "PDFGenerator",
     "generar_pdf_factura",
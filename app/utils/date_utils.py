@@ -66,4 +66,10 @@ def agregar_dias_habiles(fecha: date, dias: int) -> date:
         if not es_fin_semana(fecha_actual):
             dias_agregados += 1
     
-    return fecha_actual
\ No newline at end of file
+    return fecha_actual
+
+def como_fecha(valor) -> date:
+    """Convierte el resultado de DATE() en SQL a date (MySQL devuelve date, SQLite str)"""
+    if isinstance(valor, datetime):
+        return valor.date()
+    return valor if isinstance(valor, date) else date.fromisoformat(str(valor))
\ No newline at end of file
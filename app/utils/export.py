@@ -0,0 +1,146 @@
+"""Exportación de filas a CSV / XLSX en streaming"""
+import csv
+import io
+import tempfile
+from datetime import date
+from enum import Enum
+from typing import Any, Iterable, Iterator, Literal, Sequence
+
+from fastapi.responses import StreamingResponse
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+ExportFormat = Literal["csv", "xlsx"]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Filas acumuladas en el buffer antes de enviar un chunk CSV
+CSV_ROWS_PER_CHUNK = 500
+
+# Tamaño de los chunks al enviar el archivo XLSX
+XLSX_CHUNK_SIZE = 64 * 1024
+
+
+def _valor_celda(value: Any) -> Any:
+    """Convierte enums a su valor; el resto se escribe tal cual"""
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def iter_csv(columnas: Sequence[str], filas: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """
+    Genera un CSV por chunks a medida que se leen las filas.
+
+    Empieza con BOM para que Excel detecte UTF-8.
+
+    Args:
+        columnas: Encabezados
+        filas: Filas (tuplas o Row) en el orden de las columnas
+
+    Yields:
+        Bytes del CSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columnas)
+    pendientes = 0
+
+    yield "\ufeff".encode("utf-8")
+    for fila in filas:
+        writer.writerow([_valor_celda(valor) for valor in fila])
+        pendientes += 1
+        if pendientes >= CSV_ROWS_PER_CHUNK:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pendientes = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_xlsx(columnas: Sequence[str], filas: Iterable[Sequence[Any]], hoja: str = "Datos") -> Iterator[bytes]:
+    """
+    Genera un XLSX con un workbook de solo escritura.
+
+    openpyxl vuelca cada fila a un archivo temporal al agregarla, así que la
+    memoria no crece con el número de filas; al terminar, el libro se
+    comprime en otro archivo temporal que se envía por chunks.
+
+    Args:
+        columnas: Encabezados
+        filas: Filas (tuplas o Row) en el orden de las columnas
+        hoja: Título de la hoja
+
+    Yields:
+        Bytes del XLSX
+    """
+    _require_openpyxl()
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=hoja)
+    sheet.append(list(columnas))
+    for fila in filas:
+        sheet.append([_valor_xlsx(valor) for valor in fila])
+
+    with tempfile.TemporaryFile() as archivo:
+        workbook.save(archivo)
+        archivo.seek(0)
+        while chunk := archivo.read(XLSX_CHUNK_SIZE):
+            yield chunk
+
+
+def _require_openpyxl() -> None:
+    """Falla con un mensaje claro si openpyxl no está instalado"""
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError(
+            "openpyxl no está instalado. Instala con: pip install openpyxl"
+        )
+
+
+def _valor_xlsx(value: Any) -> Any:
+    """Valor de celda XLSX: sin caracteres de control que el formato no admite"""
+    value = _valor_celda(value)
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+
+def export_response(
+    columnas: Sequence[str],
+    filas: Iterable[Sequence[Any]],
+    formato: ExportFormat,
+    nombre: str
+) -> StreamingResponse:
+    """
+    Respuesta que descarga las filas como CSV o XLSX sin materializarlas.
+
+    Args:
+        columnas: Encabezados
+        filas: Iterador de filas (idealmente un cursor con `yield_per`)
+        formato: 'csv' o 'xlsx'
+        nombre: Nombre base del archivo (sin extensión)
+
+    Returns:
+        StreamingResponse con Content-Disposition de descarga
+    """
+    if formato == "xlsx":
+        # Antes de empezar la respuesta: a mitad del stream ya no se puede devolver un error
+        _require_openpyxl()
+        contenido = iter_xlsx(columnas, filas, hoja=nombre[:31])
+    else:
+        contenido = iter_csv(columnas, filas)
+
+    filename = f"{nombre}_{date.today().isoformat()}.{formato}"
+    return StreamingResponse(
+        contenido,
+        media_type=MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
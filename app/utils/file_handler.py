@@ -2,7 +2,7 @@
 import os
 import uuid
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Iterable
 from datetime import datetime
 from fastapi import UploadFile
 
@@ -74,10 +74,31 @@ class FileHandler:
         if not self.validar_tamano(len(contenido)):
             raise ValueError(f"Archivo muy grande. Máximo: {MAX_FILE_SIZE / 1024 / 1024} MB")
         
-        # Generar nombre único
-        nombre_unico = self.generar_nombre_unico(file.filename, prefijo)
+        # Generar nombre único y ruta completa
+        ruta = self.nueva_ruta(file.filename, subdirectorio, prefijo)
+        
+        # Guardar archivo
+        with open(ruta["full_path"], 'wb') as f:
+            f.write(contenido)
+        
+        return {
+            **ruta,
+            "original_filename": file.filename,
+            "size": len(contenido),
+            "content_type": file.content_type
+        }
+    
+    def nueva_ruta(self, filename: str, subdirectorio: str = "", prefijo: str = "") -> dict:
+        """
+        Reserva un nombre único dentro de uploads (crea el subdirectorio).
+        
+        Útil cuando el archivo lo escribe otra función (p. ej. el generador de PDFs).
+        
+        Returns:
+            Dict con filename, path (relativa a uploads) y full_path
+        """
+        nombre_unico = self.generar_nombre_unico(filename, prefijo)
         
-        # Crear ruta completa
         if subdirectorio:
             directorio_completo = os.path.join(self.upload_dir, subdirectorio)
             os.makedirs(directorio_completo, exist_ok=True)
@@ -87,23 +108,50 @@ class FileHandler:
             ruta_completa = os.path.join(self.upload_dir, nombre_unico)
             ruta_relativa = nombre_unico
         
-        # Guardar archivo
-        with open(ruta_completa, 'wb') as f:
-            f.write(contenido)
+        return {"filename": nombre_unico, "path": ruta_relativa, "full_path": ruta_completa}
+    
+    def guardar_chunks(
+        self,
+        chunks: Iterable[bytes],
+        filename: str,
+        subdirectorio: str = "",
+        prefijo: str = ""
+    ) -> dict:
+        """
+        Guarda un archivo generado por partes (sin tenerlo completo en memoria).
         
-        return {
-            "filename": nombre_unico,
-            "original_filename": file.filename,
-            "path": ruta_relativa,
-            "full_path": ruta_completa,
-            "size": len(contenido),
-            "content_type": file.content_type
-        }
+        Si la generación falla, el archivo parcial se elimina.
+        
+        Args:
+            chunks: Contenido por partes
+            filename: Nombre original (define la extensión)
+            subdirectorio: Subdirectorio dentro de uploads
+            prefijo: Prefijo para el nombre del archivo
+            
+        Returns:
+            Dict con filename, path, full_path y size
+        """
+        ruta = self.nueva_ruta(filename, subdirectorio, prefijo)
+        size = 0
+        try:
+            with open(ruta["full_path"], 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            self.eliminar_archivo(ruta["path"])
+            raise
+        
+        return {**ruta, "size": size}
+    
+    def ruta_completa(self, ruta: str) -> str:
+        """Ruta en disco de un archivo guardado (ruta relativa a uploads)"""
+        return os.path.join(self.upload_dir, ruta)
     
     def eliminar_archivo(self, ruta: str) -> bool:
         """Elimina un archivo"""
         try:
-            ruta_completa = os.path.join(self.upload_dir, ruta)
+            ruta_completa = self.ruta_completa(ruta)
             if os.path.exists(ruta_completa):
                 os.remove(ruta_completa)
                 return True
@@ -1,8 +1,16 @@
 """Utilidades de paginación"""
-from typing import List, Generic, TypeVar, Optional
-from pydantic import BaseModel
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Generic, TypeVar, Optional, Tuple
+from pydantic import BaseModel, Field
 from math import ceil
 
+from app.core.config import settings
+from app.domain.exceptions.validation_exceptions import InvalidDataException
+
 T = TypeVar('T')
 
 class PaginationParams(BaseModel):
@@ -23,15 +31,34 @@ class PaginationParams(BaseModel):
     class Config:
         from_attributes = True
 
+class CursorParams(BaseModel):
+    """
+    Parámetros de paginación por cursor (keyset).
+    
+    `after` es el token opaco devuelto como `next_cursor` en la página
+    anterior; si se omite se obtiene la primera página.
+    """
+    after: Optional[str] = None
+    page_size: int = Field(20, ge=1, le=settings.MAX_PAGE_SIZE)
+    
+    class Config:
+        from_attributes = True
+
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Respuesta paginada genérica"""
+    """
+    Respuesta paginada genérica.
+    
+    En modo cursor `total` y `total_pages` son None (no se cuenta la tabla)
+    y la siguiente página se pide con `next_cursor`.
+    """
     items: List[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: int = 1
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -87,4 +114,84 @@ def paginar(
         Respuesta paginada
     """
     paginator = Paginator(items, total, page, page_size)
-    return paginator.to_response()
\ No newline at end of file
+    return paginator.to_response()
+
+
+# ============================================
+# PAGINACIÓN POR CURSOR (KEYSET)
+# ============================================
+
+def encode_cursor(sort_value: Any, id: int) -> str:
+    """
+    Codifica la posición (clave de orden, id) del último item en un token opaco.
+    
+    Args:
+        sort_value: Valor de la columna de ordenamiento del último item
+        id: ID del último item (desempate)
+        
+    Returns:
+        Token base64 url-safe
+    """
+    if isinstance(sort_value, datetime):
+        payload = ["dt", sort_value.isoformat(), id]
+    elif isinstance(sort_value, date):
+        payload = ["d", sort_value.isoformat(), id]
+    elif isinstance(sort_value, Decimal):
+        payload = ["dec", str(sort_value), id]
+    else:
+        payload = ["v", sort_value, id]
+    
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str) -> Tuple[Any, int]:
+    """
+    Decodifica un token generado por encode_cursor.
+    
+    Args:
+        token: Token opaco recibido en `after`
+        
+    Returns:
+        Tupla (valor de orden, id)
+        
+    Raises:
+        InvalidDataException: Si el token está malformado
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        tipo, valor, id = json.loads(raw)
+        if tipo == "dt":
+            valor = datetime.fromisoformat(valor)
+        elif tipo == "d":
+            valor = date.fromisoformat(valor)
+        elif tipo == "dec":
+            valor = Decimal(valor)
+        return valor, int(id)
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidDataException("after", "cursor de paginación inválido")
+
+def paginar_cursor(
+    items: List[T],
+    page_size: int,
+    next_cursor: Optional[str] = None,
+    after: Optional[str] = None
+) -> PaginatedResponse[T]:
+    """
+    Función helper para construir una respuesta paginada por cursor.
+    
+    Args:
+        items: Items de la página actual
+        page_size: Items por página
+        next_cursor: Cursor de la siguiente página (None si es la última)
+        after: Cursor con el que se pidió esta página
+        
+    Returns:
+        Respuesta paginada con next_cursor
+    """
+    return PaginatedResponse(
+        items=items,
+        page_size=page_size,
+        has_next=next_cursor is not None,
+        has_prev=after is not None,
+        next_cursor=next_cursor
+    )
\ No newline at end of file
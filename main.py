@@ -9,8 +9,12 @@ from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.password_hasher import password_hasher, PasswordHasherSaturado
 from app.api.v1.router import api_router
 from app.domain.exceptions.base import DomainException
+from app.middleware.logging_middleware import SQLLoggingMiddleware
+from app.services.job_worker import JobWorker
+from app.services.token_revocacion_service import SincronizadorRevocaciones
 
 # Importar todos los modelos para que SQLAlchemy los registre
 from app.models import *
@@ -28,10 +32,28 @@ async def lifespan(app: FastAPI):
     # Crear tablas si no existen (en producción usar Alembic)
     # Base.metadata.create_all(bind=engine)
     
+    # Procesos de bcrypt (se crean ahora y no en el primer login)
+    password_hasher.start()
+    
+    # Copia en memoria de los tokens revocados, sincronizada con la tabla
+    revocaciones = SincronizadorRevocaciones() if settings.TOKEN_REVOCATION_ENABLED else None
+    if revocaciones:
+        revocaciones.start()
+    
+    # Worker de jobs de reportes en este proceso (JOB_WORKERS=0 para usar solo scripts/worker.py)
+    job_worker = JobWorker() if settings.JOB_WORKERS > 0 else None
+    if job_worker:
+        job_worker.start()
+    
     yield
     
     # Shutdown
     print("👋 Cerrando aplicación...")
+    if job_worker:
+        job_worker.stop(timeout=settings.JOB_POLL_INTERVAL * 5)
+    if revocaciones:
+        revocaciones.stop(timeout=settings.TOKEN_REVOCATION_SYNC_INTERVAL * 2)
+    password_hasher.shutdown()
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -53,6 +75,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Conteo de queries SQL por request (X-DB-Queries / X-DB-Time y detector de N+1)
+if settings.SQL_STATS_ENABLED:
+    app.add_middleware(SQLLoggingMiddleware)
+
 # Incluir routers de la API
 app.include_router(api_router, prefix="/api/v1")
 
@@ -66,6 +92,19 @@ async def domain_exception_handler(request: Request, exc: DomainException):
         content=exc.to_dict()
     )
 
+@app.exception_handler(PasswordHasherSaturado)
+async def password_hasher_saturado_handler(request: Request, exc: PasswordHasherSaturado):
+    """El pool de bcrypt está al límite: el cliente reintenta en unos segundos"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "error": "SERVICE_UNAVAILABLE",
+            "message": "Demasiadas solicitudes de autenticación, intenta de nuevo en unos segundos",
+            "details": {}
+        },
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)}
+    )
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Maneja errores de validación de Pydantic"""
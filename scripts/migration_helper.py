@@ -8,6 +8,8 @@ sys.path.insert(0, str(ROOT_DIR))
 import subprocess
 from datetime import datetime
 
+ALEMBIC_INI = str(ROOT_DIR / "alembic" / "alembic.ini")
+
 def create_migration(message: str):
     """
     Genera una nueva migración.
@@ -19,7 +21,7 @@ def create_migration(message: str):
     
     try:
         subprocess.run(
-            ["alembic", "revision", "--autogenerate", "-m", message],
+            ["alembic", "-c", ALEMBIC_INI, "revision", "--autogenerate", "-m", message],
             check=True
         )
         print("✅ Migración generada exitosamente")
@@ -32,7 +34,7 @@ def apply_migrations():
     print("🔄 Aplicando migraciones...")
     
     try:
-        subprocess.run(["alembic", "upgrade", "head"], check=True)
+        subprocess.run(["alembic", "-c", ALEMBIC_INI, "upgrade", "head"], check=True)
         print("✅ Migraciones aplicadas exitosamente")
     except subprocess.CalledProcessError as e:
         print(f"❌ Error al aplicar migraciones: {e}")
@@ -50,7 +52,7 @@ def rollback_migration(steps: int = 1):
     revision = f"-{steps}"
     
     try:
-        subprocess.run(["alembic", "downgrade", revision], check=True)
+        subprocess.run(["alembic", "-c", ALEMBIC_INI, "downgrade", revision], check=True)
         print("✅ Migración revertida exitosamente")
     except subprocess.CalledProcessError as e:
         print(f"❌ Error al revertir migración: {e}")
@@ -59,7 +61,7 @@ def rollback_migration(steps: int = 1):
 def show_current_revision():
     """Muestra la revisión actual de la base de datos"""
     try:
-        subprocess.run(["alembic", "current"], check=True)
+        subprocess.run(["alembic", "-c", ALEMBIC_INI, "current"], check=True)
     except subprocess.CalledProcessError as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
@@ -67,7 +69,7 @@ def show_current_revision():
 def show_history():
     """Muestra el historial de migraciones"""
     try:
-        subprocess.run(["alembic", "history", "--verbose"], check=True)
+        subprocess.run(["alembic", "-c", ALEMBIC_INI, "history", "--verbose"], check=True)
     except subprocess.CalledProcessError as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
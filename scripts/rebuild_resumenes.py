@@ -0,0 +1,65 @@
+"""Script para reconstruir las tablas de resumen diario (backfill)"""
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from datetime import date, timedelta
+
+from app.core.database import SessionLocal
+from app.services.resumen_diario_service import ResumenDiarioService
+
+def rebuild(fecha_inicio: date, fecha_fin: date, gimnasio_id: int = None, dias_por_lote: int = 31):
+    """
+    Recalcula resumen_diario_accesos y resumen_diario_ingresos a partir de
+    accesos y facturas, por lotes de días (cada lote en su propia transacción).
+    
+    Args:
+        fecha_inicio: Primer día a reconstruir
+        fecha_fin: Último día a reconstruir
+        gimnasio_id: Solo este gimnasio (None = todos)
+        dias_por_lote: Días por transacción
+    """
+    db = SessionLocal()
+    service = ResumenDiarioService(db)
+    alcance = f"gimnasio {gimnasio_id}" if gimnasio_id else "todos los gimnasios"
+    print(f"🔨 Reconstruyendo resúmenes del {fecha_inicio} al {fecha_fin} ({alcance})...")
+    
+    try:
+        inicio = fecha_inicio
+        while inicio <= fecha_fin:
+            fin = min(inicio + timedelta(days=dias_por_lote - 1), fecha_fin)
+            filas = service.reconstruir(inicio, fin, gimnasio_id)
+            print(f"   - {inicio} → {fin}: {filas['resumen_diario_accesos']} filas de accesos, "
+                  f"{filas['resumen_diario_ingresos']} filas de ingresos")
+            inicio = fin + timedelta(days=1)
+        print("✅ Resúmenes reconstruidos")
+    except Exception as e:
+        print(f"❌ Error al reconstruir resúmenes: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Reconstruir tablas de resumen diario")
+    parser.add_argument(
+        "--desde",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=365),
+        help="Primer día (YYYY-MM-DD, por defecto hace un año)"
+    )
+    parser.add_argument(
+        "--hasta",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="Último día (YYYY-MM-DD, por defecto hoy)"
+    )
+    parser.add_argument("--gimnasio", type=int, default=None, help="ID del gimnasio (por defecto todos)")
+    parser.add_argument("--dias-por-lote", type=int, default=31, help="Días por transacción")
+    
+    args = parser.parse_args()
+    
+    rebuild(args.desde, args.hasta, args.gimnasio, args.dias_por_lote)
@@ -0,0 +1,44 @@
+"""Script para procesar los jobs de reportes fuera del proceso de la API"""
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.job_worker import JobWorker
+
+def run(concurrency: int, poll_interval: float, once: bool = False):
+    """
+    Procesa la cola de jobs (tabla `jobs`).
+    
+    Puede correr junto a los hilos de la API o en lugar de ellos (JOB_WORKERS=0).
+    
+    Args:
+        concurrency: Hilos que generan reportes en paralelo
+        poll_interval: Segundos de espera cuando no hay jobs pendientes
+        once: Procesar los pendientes y salir (cron)
+    """
+    worker = JobWorker(concurrency=concurrency, poll_interval=poll_interval)
+    
+    if once:
+        worker.mantenimiento(force=True)
+        procesados = 0
+        while worker.procesar_siguiente(f"{worker.worker_id}:once"):
+            procesados += 1
+        print(f"✅ {procesados} jobs procesados")
+        return
+    
+    print(f"👷 Worker de jobs con {concurrency} hilos (Ctrl+C para detener)...")
+    worker.run_forever()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Worker de jobs de reportes")
+    parser.add_argument("--concurrency", type=int, default=2, help="Hilos que generan reportes")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Segundos entre consultas a la cola")
+    parser.add_argument("--once", action="store_true", help="Procesar los jobs pendientes y salir")
+    
+    args = parser.parse_args()
+    
+    run(args.concurrency, args.poll_interval, args.once)
@@ -31,6 +31,7 @@ setup(
         "uvicorn[standard]>=0.24.0",
         "sqlalchemy>=2.0.0",
         "pymysql>=1.1.0",
+        "aiomysql>=0.2.0",
         "python-dotenv>=1.0.0",
         "pydantic>=2.0.0",
         "pydantic-settings>=2.0.0",